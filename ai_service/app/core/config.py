@@ -25,12 +25,52 @@ class Settings(BaseSettings):
     
     # AI Models
     GLINER_MODEL_NAME: str = "urchade/gliner_small-v2.1"
+    GLINER_CHUNK_WORDS: int = int(os.getenv("GLINER_CHUNK_WORDS", "250"))  # words per GLiNER pass (model window ~384 tokens)
+    GLINER_BATCH_SIZE: int = int(os.getenv("GLINER_BATCH_SIZE", "8"))
+    GLINER_BACKEND: str = os.getenv("GLINER_BACKEND", "torch")  # torch, onnx or onnx-int8 (CPU laptops)
+    GLINER_ONNX_CACHE_DIR: str = os.getenv("GLINER_ONNX_CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", "..", "models", "gliner_onnx"))
     WHISPER_MODEL_SIZE: str = os.getenv("WHISPER_MODEL_SIZE", "large-v2")  # base/small/medium/large-v2
+    WHISPER_DEFAULT_LANGUAGE: str = os.getenv("WHISPER_DEFAULT_LANGUAGE", "en")  # alignment model warmed at startup ("" = none)
+    ALIGN_MODEL_CACHE_SIZE: int = int(os.getenv("ALIGN_MODEL_CACHE_SIZE", "2"))  # wav2vec2 models kept in memory
     SUMMARIZATION_MODEL: str = "knkarthick/MEETING_SUMMARY"
+    SUMMARIZATION_CHUNK_TOKENS: int = int(os.getenv("SUMMARIZATION_CHUNK_TOKENS", "900"))  # map chunk size (BART window is 1024)
+    SUMMARIZATION_BATCH_SIZE: int = int(os.getenv("SUMMARIZATION_BATCH_SIZE", "4"))
     
     # Gemini Config
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     GEMINI_MODEL: str = "gemini-2.5-flash-lite"
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "256"))  # cached Gemini responses (LRU)
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "300"))  # seconds - transcript-driven hints
+    LLM_RESEARCH_CACHE_TTL: float = float(os.getenv("LLM_RESEARCH_CACHE_TTL", "3600"))  # battlecards / entity insights
+    GEMINI_RPM: int = int(os.getenv("GEMINI_RPM", "15"))  # client-side quota (requests / minute)
+    GEMINI_TPM: int = int(os.getenv("GEMINI_TPM", "250000"))  # client-side quota (tokens / minute)
+    OLLAMA_RPM: int = int(os.getenv("OLLAMA_RPM", "30"))
+    OLLAMA_TPM: int = int(os.getenv("OLLAMA_TPM", "0"))  # 0 = unlimited
+    LLM_PERIODIC_MAX_WAIT: float = float(os.getenv("LLM_PERIODIC_MAX_WAIT", "10"))  # periodic calls skip a cycle after this
+    
+    # Web research cache (DuckDuckGo + crawl results)
+    WEB_RESEARCH_CACHE_PATH: str = os.getenv("WEB_RESEARCH_CACHE_PATH", os.path.join(os.path.dirname(__file__), "..", "..", "web_research_cache.db"))
+    WEB_RESEARCH_CACHE_TTL: float = float(os.getenv("WEB_RESEARCH_CACHE_TTL", "86400"))  # seconds fresh
+    WEB_RESEARCH_STALE_TTL: float = float(os.getenv("WEB_RESEARCH_STALE_TTL", "604800"))  # further seconds served while refreshing
+    WEB_RESEARCH_CACHE_SIZE: int = int(os.getenv("WEB_RESEARCH_CACHE_SIZE", "1000"))  # entries (LRU)
+    CRAWL_TIMEOUT: float = float(os.getenv("CRAWL_TIMEOUT", "8"))  # seconds per page
+    CRAWL_DEADLINE: float = float(os.getenv("CRAWL_DEADLINE", "10"))  # seconds for a whole deep crawl
+    CRAWL_MAX_BYTES: int = int(os.getenv("CRAWL_MAX_BYTES", "2000000"))  # bodies cut off beyond this
+    CRAWL_PER_HOST: int = int(os.getenv("CRAWL_PER_HOST", "2"))  # concurrent connections per host
+    CRAWL_MAX_CONNECTIONS: int = int(os.getenv("CRAWL_MAX_CONNECTIONS", "20"))
+    CRAWL_EXTRACT_WORKERS: int = int(os.getenv("CRAWL_EXTRACT_WORKERS", "2"))  # trafilatura processes
+    
+    # Known competitors (comma-separated) - detected live, battlecards pre-warmed
+    COMPETITORS: str = os.getenv(
+        "COMPETITORS",
+        "aws,amazon,salesforce,datadog,microsoft,hubspot,slack,google,oracle,sap,zendesk,"
+        "freshworks,zoho,monday,asana,jira,atlassian"
+    )
+    COMPETITOR_CATALOG_PATH: str = os.getenv("COMPETITOR_CATALOG_PATH", "")  # JSON catalog with aliases (overrides COMPETITORS)
+    BATTLECARD_PREWARM: bool = os.getenv("BATTLECARD_PREWARM", "true").lower() == "true"
+    BATTLECARD_PREWARM_HOURS: str = os.getenv("BATTLECARD_PREWARM_HOURS", "1-6")  # local hours for refreshes (start-end)
+    BATTLECARD_PREWARM_DAYTIME_LIMIT: int = int(os.getenv("BATTLECARD_PREWARM_DAYTIME_LIMIT", "2"))  # missing cards built per check outside the hours (0 = wait)
+    BATTLECARD_REFRESH_AGE: float = float(os.getenv("BATTLECARD_REFRESH_AGE", "86400"))  # seconds before a card is refreshed
     
     # HuggingFace Token (for pyannote speaker diarization)
     HF_TOKEN: str = os.getenv("HF_TOKEN", "")
@@ -38,6 +78,10 @@ class Settings(BaseSettings):
     # Demo Mode
     DEMO_SIMULATION_MODE: bool = os.getenv("DEMO_SIMULATION_MODE", "false").lower() == "true"
 
+    @property
+    def competitor_list(self) -> list:
+        return [c.strip().lower() for c in self.COMPETITORS.split(",") if c.strip()]
+
     class Config:
         case_sensitive = True
 
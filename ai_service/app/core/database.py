@@ -4,6 +4,7 @@ SQLite Database for Session Persistence and Starred Hints.
 Tables:
 - sessions: Store meeting transcripts, summaries, and metadata
 - starred_hints: Store salesman-flagged hints for CRM sync
+- prewarmed_battlecards: Versioned battlecards built ahead of calls
 """
 
 import aiosqlite
@@ -121,6 +122,16 @@ class Database:
                 uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (session_id) REFERENCES sessions(id)
             );
+            
+            CREATE TABLE IF NOT EXISTS prewarmed_battlecards (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                competitor_key TEXT NOT NULL,
+                competitor TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                battlecard TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (competitor_key, version)
+            );
         """)
         await self._connection.commit()
     
@@ -218,6 +229,31 @@ class Database:
     
     # ==================== BATTLECARD OPERATIONS ====================
     
+    async def save_session_results(
+        self,
+        session_id: int,
+        battlecards: List[Dict[str, Any]],
+        entities: List[Dict[str, Any]],
+        lead: Optional[Dict[str, Any]] = None
+    ):
+        """Save a finished session's battlecards, entities and lead in one transaction."""
+        import json
+        await self._connection.executemany(
+            "INSERT INTO battlecards (session_id, competitor, points) VALUES (?, ?, ?)",
+            [(session_id, bc.get('competitor', 'Unknown'), json.dumps(bc.get('counter_points', [])))
+             for bc in battlecards]
+        )
+        await self._connection.executemany(
+            "INSERT INTO entities (session_id, text, label, score) VALUES (?, ?, ?, ?)",
+            [(session_id, e.get('text', ''), e.get('label', ''), e.get('score', 0)) for e in entities]
+        )
+        if lead:
+            await self._connection.execute(
+                "INSERT INTO leads (session_id, name, email, phone, company) VALUES (?, ?, ?, ?, ?)",
+                (session_id, lead.get('name'), lead.get('email'), lead.get('phone'), lead.get('company'))
+            )
+        await self._connection.commit()
+    
     async def save_battlecard(self, session_id: int, competitor: str, points: List[str]) -> int:
         """Save a battlecard for a session."""
         import json
@@ -243,6 +279,49 @@ class Database:
             result.append(d)
         return result
 
+    
+    async def save_prewarmed_battlecard(
+        self,
+        competitor_key: str,
+        battlecard: Dict[str, Any],
+        keep_versions: int = 3
+    ) -> int:
+        """Store a new version of a pre-warmed battlecard; returns its version."""
+        import json
+        cursor = await self._connection.execute(
+            "SELECT COALESCE(MAX(version), 0) FROM prewarmed_battlecards WHERE competitor_key = ?",
+            (competitor_key,)
+        )
+        version = (await cursor.fetchone())[0] + 1
+        await self._connection.execute(
+            "INSERT INTO prewarmed_battlecards (competitor_key, competitor, version, battlecard) VALUES (?, ?, ?, ?)",
+            (competitor_key, battlecard.get('competitor', competitor_key), version, json.dumps(battlecard))
+        )
+        # Keep the last few versions for comparison / rollback
+        await self._connection.execute(
+            "DELETE FROM prewarmed_battlecards WHERE competitor_key = ? AND version <= ?",
+            (competitor_key, version - keep_versions)
+        )
+        await self._connection.commit()
+        return version
+    
+    async def get_latest_prewarmed_battlecards(self) -> List[Dict[str, Any]]:
+        """Latest version of every pre-warmed battlecard."""
+        import json
+        cursor = await self._connection.execute("""
+            SELECT p.* FROM prewarmed_battlecards p
+            JOIN (SELECT competitor_key, MAX(version) AS version
+                  FROM prewarmed_battlecards GROUP BY competitor_key) latest
+            ON p.competitor_key = latest.competitor_key AND p.version = latest.version
+        """)
+        rows = await cursor.fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            d["battlecard"] = json.loads(d["battlecard"])
+            result.append(d)
+        return result
+
 
 # Global database instance
 _db: Optional[Database] = None
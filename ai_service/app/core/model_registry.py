@@ -0,0 +1,198 @@
+"""
+Process-wide Model Registry.
+
+Loads each heavy model service (WhisperX, GLiNER, BART, Gemini client) once per
+process and hands out reference-counted handles to live sessions and the
+workflow processor, so starting a session no longer reloads anything.
+
+Usage:
+    registry = get_model_registry()
+    transcriber = registry.acquire(TRANSCRIPTION)   # loads on first use
+    ...
+    registry.release(TRANSCRIPTION)                  # unloads when refcount hits 0
+"""
+
+import gc
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Well-known model names
+TRANSCRIPTION = "transcription"
+SUMMARIZATION = "summarization"
+EXTRACTION = "extraction"
+GEMINI = "gemini"
+
+
+def _default_factory(name: str) -> Callable[[], Any]:
+    """Resolve the loader for a well-known model name (imported lazily)."""
+    if name == TRANSCRIPTION:
+        from app.modules.transcription.service import TranscriptionService
+        return TranscriptionService
+    if name == SUMMARIZATION:
+        from app.modules.summarization.service import SummarizationService
+        return SummarizationService
+    if name == EXTRACTION:
+        from app.modules.extraction.gliner_service import GLiNERService
+        return GLiNERService
+    if name == GEMINI:
+        from app.modules.intelligence.gemini_service import GeminiService
+        return GeminiService
+    raise KeyError(f"No default factory registered for model '{name}'")
+
+
+def _rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (None if psutil is missing)."""
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def _gpu_mb() -> Optional[float]:
+    """CUDA memory allocated by torch in MB (None if unavailable)."""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return torch.cuda.memory_allocated() / (1024 * 1024)
+    except Exception:
+        pass
+    return None
+
+
+@dataclass
+class ModelEntry:
+    """A loaded model and its bookkeeping."""
+    name: str
+    instance: Any
+    refcount: int = 0
+    load_seconds: float = 0.0
+    rss_mb: Optional[float] = None  # RSS growth observed while loading
+    gpu_mb: Optional[float] = None  # CUDA allocation growth while loading
+    loaded_at: float = field(default_factory=time.time)
+
+
+class ModelRegistry:
+    """
+    Thread-safe, reference-counted store of loaded model services.
+
+    Each name is loaded at most once; concurrent acquirers of the same name
+    wait for the first load instead of starting a second one. Memory figures
+    are deltas measured around the load and are approximate when several
+    models load at the same time.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def acquire(self, name: str, factory: Optional[Callable[[], Any]] = None) -> Any:
+        """Get a handle to a model, loading it on first use."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry:
+                entry.refcount += 1
+                return entry.instance
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            # Another thread may have finished loading while we waited
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry:
+                    entry.refcount += 1
+                    return entry.instance
+
+            factory = factory or _default_factory(name)
+            print(f"[ModelRegistry] Loading '{name}'...")
+
+            rss_before, gpu_before = _rss_mb(), _gpu_mb()
+            start = time.perf_counter()
+            instance = factory()
+            elapsed = time.perf_counter() - start
+            rss_after, gpu_after = _rss_mb(), _gpu_mb()
+
+            entry = ModelEntry(
+                name=name,
+                instance=instance,
+                refcount=1,
+                load_seconds=elapsed,
+                rss_mb=(rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+                gpu_mb=(gpu_after - gpu_before) if gpu_before is not None and gpu_after is not None else None
+            )
+            with self._lock:
+                self._entries[name] = entry
+
+            print(f"[ModelRegistry] '{name}' loaded in {elapsed:.1f}s"
+                  + (f" (+{entry.rss_mb:.0f} MB RSS)" if entry.rss_mb is not None else ""))
+            return instance
+
+    def release(self, name: str):
+        """Drop one handle; the model is unloaded when no handles remain."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if not entry:
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            del self._entries[name]
+
+        print(f"[ModelRegistry] Unloading '{name}' (no remaining handles)")
+        del entry
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+    def is_loaded(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model load time, memory and handle count."""
+        with self._lock:
+            models = {
+                name: {
+                    "refcount": e.refcount,
+                    "load_seconds": round(e.load_seconds, 2),
+                    "rss_mb": round(e.rss_mb, 1) if e.rss_mb is not None else None,
+                    "gpu_mb": round(e.gpu_mb, 1) if e.gpu_mb is not None else None,
+                    "loaded_at": e.loaded_at
+                }
+                for name, e in self._entries.items()
+            }
+
+        rss = _rss_mb()
+        return {
+            "models": models,
+            "process_rss_mb": round(rss, 1) if rss is not None else None
+        }
+
+
+# Global registry instance
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create the process-wide model registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
@@ -15,6 +15,9 @@ async def lifespan(app: FastAPI):
     """
     # ===== STARTUP =====
     print("[Server] Starting up...")
+    if settings.BATTLECARD_PREWARM:
+        from app.modules.intelligence.battlecard_prewarm import get_battlecard_prewarmer
+        get_battlecard_prewarmer().start()
     yield
     
     # ===== SHUTDOWN =====
@@ -29,6 +32,29 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"[Server] Session cleanup error: {e}")
     
+    # 1b. Let in-flight finalization jobs (stop-session) finish persisting
+    try:
+        from app.modules.workflow.jobs import get_job_manager
+        jobs = get_job_manager()
+        for job in jobs.active("stop_session"):  # pre-warm jobs are cancelled below
+            print(f"[Server] Waiting for job {job.kind} {job.id}...")
+            await jobs.wait(job.id, timeout=30.0)
+    except Exception as e:
+        print(f"[Server] Job cleanup error: {e}")
+    
+    # 1c. Stop the battlecard pre-warm scheduler and cancel its running job, then
+    #     close the research crawler's connection pool and extraction processes
+    try:
+        from app.modules.intelligence.battlecard_prewarm import get_battlecard_prewarmer
+        await get_battlecard_prewarmer().stop()
+    except Exception as e:
+        print(f"[Server] Prewarm cleanup error: {e}")
+    try:
+        from app.modules.intelligence.crawler import close_crawler
+        await close_crawler()
+    except Exception as e:
+        print(f"[Server] Crawler cleanup error: {e}")
+    
     # 2. Close database connection
     try:
         from app.core.database import close_database
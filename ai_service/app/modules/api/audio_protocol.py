@@ -0,0 +1,287 @@
+"""
+Framed binary audio protocol for /audio-stream.
+
+Each WebSocket binary message is one frame: a fixed 28-byte header followed by
+the encoded payload. Clients downsample to 16 kHz mono before encoding, so the
+server never resamples or spawns ffmpeg, and frames are small enough (~1 s) to
+be sent continuously instead of as 10 s WAV files.
+
+Header (little-endian, struct "<4sBBBBIIdI"):
+    magic        4s   b"MMAF"
+    version      u8   PROTOCOL_VERSION
+    codec        u8   CODEC_PCM16 / CODEC_FLAC / CODEC_OPUS
+    flags        u8   FLAG_END_OF_SEGMENT | FLAG_START_OF_STREAM
+    channels     u8   always 1 for now
+    seq          u32  per-connection frame counter (gaps = lost frames)
+    sample_rate  u32  rate of the encoded audio (16000 from our clients)
+    timestamp    f64  client wall clock of the first sample
+    num_samples  u32  samples in the decoded payload
+
+Messages that do not start with the magic (e.g. a RIFF/WAV file from an older
+client) are handled by the legacy path in the endpoint.
+
+FLAC and Opus (in Ogg) go through soundfile/libsndfile; when the local build
+lacks a codec, encode_frame() falls back to PCM16 and says so in the header.
+"""
+
+import io
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+
+MAGIC = b"MMAF"
+PROTOCOL_VERSION = 1
+
+HEADER = struct.Struct("<4sBBBBIIdI")
+
+CODEC_PCM16 = 0
+CODEC_FLAC = 1
+CODEC_OPUS = 2
+CODEC_NAMES = {"pcm16": CODEC_PCM16, "flac": CODEC_FLAC, "opus": CODEC_OPUS}
+
+FLAG_END_OF_SEGMENT = 0x01  # last frame of a speech segment - transcribe now
+FLAG_START_OF_STREAM = 0x02  # first frame after (re)connect - reset sequence tracking
+
+
+class ProtocolError(ValueError):
+    """Raised for malformed or unsupported frames."""
+
+
+@dataclass
+class AudioFrame:
+    """A decoded protocol frame."""
+    seq: int
+    sample_rate: int
+    timestamp: float
+    flags: int
+    codec: int
+    audio: np.ndarray  # mono float32
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def end_of_segment(self) -> bool:
+        return bool(self.flags & FLAG_END_OF_SEGMENT)
+
+
+def is_framed(data: bytes) -> bool:
+    """True if a message uses this protocol (vs. a legacy WAV upload)."""
+    return len(data) >= HEADER.size and data[:4] == MAGIC
+
+
+def _sf_supports(codec: int) -> bool:
+    if sf is None:
+        return False
+    formats = sf.available_formats()
+    if codec == CODEC_FLAC:
+        return "FLAC" in formats
+    if codec == CODEC_OPUS:
+        return "OGG" in formats and "OPUS" in sf.available_subtypes("OGG")
+    return False
+
+
+def available_codecs() -> List[str]:
+    """Codec names this process can encode / decode."""
+    return ["pcm16"] + [name for name, c in CODEC_NAMES.items() if c != CODEC_PCM16 and _sf_supports(c)]
+
+
+def _encode_payload(audio: np.ndarray, sample_rate: int, codec: int) -> bytes:
+    if codec == CODEC_PCM16:
+        return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+    buf = io.BytesIO()
+    if codec == CODEC_FLAC:
+        sf.write(buf, audio, sample_rate, format="FLAC", subtype="PCM_16")
+    else:
+        sf.write(buf, audio, sample_rate, format="OGG", subtype="OPUS")
+    return buf.getvalue()
+
+
+def _decode_payload(payload: bytes, codec: int) -> np.ndarray:
+    if codec == CODEC_PCM16:
+        return np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+    if codec not in (CODEC_FLAC, CODEC_OPUS):
+        raise ProtocolError(f"Unknown codec {codec}")
+    if not _sf_supports(codec):
+        raise ProtocolError(f"Codec {codec} not supported by this soundfile build")
+
+    audio, _ = sf.read(io.BytesIO(payload), dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def encode_frame(
+    audio: np.ndarray,
+    seq: int,
+    timestamp: float,
+    sample_rate: int = 16000,
+    codec: str = "pcm16",
+    flags: int = 0
+) -> bytes:
+    """Encode mono float32 audio into one protocol frame."""
+    codec_id = CODEC_NAMES.get(codec)
+    if codec_id is None:
+        raise ProtocolError(f"Unknown codec '{codec}' (expected one of {list(CODEC_NAMES)})")
+    if codec_id != CODEC_PCM16 and not _sf_supports(codec_id):
+        codec_id = CODEC_PCM16
+
+    audio = np.ascontiguousarray(np.asarray(audio, dtype=np.float32).reshape(-1))
+    payload = _encode_payload(audio, sample_rate, codec_id)
+    header = HEADER.pack(
+        MAGIC, PROTOCOL_VERSION, codec_id, flags, 1,
+        seq & 0xFFFFFFFF, sample_rate, timestamp, len(audio)
+    )
+    return header + payload
+
+
+def decode_frame(data: bytes) -> AudioFrame:
+    """Parse and decode one protocol frame."""
+    if not is_framed(data):
+        raise ProtocolError("Missing frame magic")
+
+    magic, version, codec, flags, channels, seq, sample_rate, timestamp, num_samples = HEADER.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    if channels != 1:
+        raise ProtocolError(f"Unsupported channel count {channels}")
+    if not sample_rate:
+        raise ProtocolError("Sample rate must be non-zero")
+
+    audio = _decode_payload(memoryview(data)[HEADER.size:].tobytes(), codec)
+    # Lossy codecs may pad the last packet; trust the header's length
+    if num_samples and len(audio) > num_samples:
+        audio = audio[:num_samples]
+
+    return AudioFrame(
+        seq=seq,
+        sample_rate=sample_rate,
+        timestamp=timestamp,
+        flags=flags,
+        codec=codec,
+        audio=audio
+    )
+
+
+class StreamAssembler:
+    """
+    Server-side reassembly of frames into transcription-sized chunks.
+
+    A chunk is released when a frame carries FLAG_END_OF_SEGMENT (client VAD
+    cut), or when max_seconds of audio has accumulated (fixed chunking).
+    Client timestamps are mapped onto the server clock using the offset
+    measured at the first frame, so chunks from several clients order
+    correctly in the transcription queue.
+
+    Sequence gaps count as lost frames only when seq jumps forward by less
+    than half the u32 space; a frame behind the expected seq (duplicate, or
+    a client restart without FLAG_START_OF_STREAM) resyncs the counter.
+
+    Args:
+        max_seconds: release a chunk once this much audio is buffered
+        min_seconds: chunks shorter than this are dropped (clicks, blips)
+    """
+
+    def __init__(self, max_seconds: float = 10.0, min_seconds: float = 0.3):
+        self.max_seconds = max_seconds
+        self.min_seconds = min_seconds
+
+        self._frames: List[np.ndarray] = []
+        self._samples = 0
+        self._sample_rate: Optional[int] = None
+        self._start_ts: Optional[float] = None
+        self._clock_offset: Optional[float] = None
+        self._next_seq: Optional[int] = None
+
+        # Stats
+        self.frames_received = 0
+        self.frames_lost = 0
+        self.resyncs = 0
+        self.bytes_received = 0
+
+    def add(self, frame: AudioFrame, received_at: float, wire_bytes: int = 0) -> List[Tuple[float, np.ndarray, int]]:
+        """
+        Add a frame; returns released chunks as (server_timestamp, audio, sample_rate).
+        """
+        self.frames_received += 1
+        self.bytes_received += wire_bytes
+        released: List[Tuple[float, np.ndarray, int]] = []
+
+        if frame.flags & FLAG_START_OF_STREAM:
+            self._next_seq = None
+        if self._next_seq is not None and frame.seq != self._next_seq:
+            gap = (frame.seq - self._next_seq) & 0xFFFFFFFF
+            if gap < 0x80000000:
+                self.frames_lost += gap
+            else:
+                self.resyncs += 1  # behind: duplicate or restarted client
+        self._next_seq = (frame.seq + 1) & 0xFFFFFFFF
+
+        if self._clock_offset is None:
+            self._clock_offset = received_at - (frame.timestamp + frame.duration)
+
+        # A rate change starts a new chunk
+        if self._sample_rate is not None and frame.sample_rate != self._sample_rate:
+            released.extend(self.flush())
+
+        if len(frame.audio):
+            if self._start_ts is None:
+                self._start_ts = frame.timestamp + self._clock_offset
+            self._sample_rate = frame.sample_rate
+            self._frames.append(frame.audio)
+            self._samples += len(frame.audio)
+
+        if frame.end_of_segment or (self._sample_rate and self._samples >= self.max_seconds * self._sample_rate):
+            released.extend(self.flush())
+        return released
+
+    def flush(self) -> List[Tuple[float, np.ndarray, int]]:
+        """Release whatever is buffered (end of segment / disconnect)."""
+        if not self._frames:
+            return []
+        audio = np.concatenate(self._frames)
+        chunk = (self._start_ts, audio, self._sample_rate)
+        self._frames, self._samples, self._start_ts = [], 0, None
+        if len(audio) < self.min_seconds * chunk[2]:
+            return []
+        return [chunk]
+
+
+if __name__ == "__main__":
+    # Round trip and wire size per codec for 1 s of speech-like audio
+    sr = 16000
+    t = np.arange(sr) / sr
+    audio = (0.1 * sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 20))).astype(np.float32)
+    legacy_wav_bytes = 44 + 48000 * 2  # old client: 16-bit WAV at 48 kHz
+
+    print(f"Available codecs: {available_codecs()}")
+    print(f"legacy wav@48k: {legacy_wav_bytes} bytes/s")
+    for name in available_codecs():
+        frame = encode_frame(audio, seq=7, timestamp=123.5, codec=name, flags=FLAG_END_OF_SEGMENT)
+        decoded = decode_frame(frame)
+        assert decoded.seq == 7 and decoded.end_of_segment and len(decoded.audio) == len(audio)
+        err = float(np.sqrt(np.mean((decoded.audio - audio) ** 2)))
+        print(f"{name:>6}: {len(frame)} bytes/s ({legacy_wav_bytes / len(frame):.1f}x smaller), rms error {err:.4f}")
+
+    assembler = StreamAssembler(max_seconds=2.0)
+    chunks = []
+    for seq in (0, 1, 3):  # frame 2 lost
+        chunks += assembler.add(decode_frame(encode_frame(audio, seq, 100.0 + seq)), received_at=1000.0 + seq)
+    print(f"Assembler: {len(chunks)} chunk(s), {assembler.frames_lost} frame(s) lost")
+    assert assembler.frames_lost == 1
+
+    # Restart behind the expected seq resyncs; wrap-around 0xFFFFFFFF -> 1 loses one frame;
+    # a duplicate and a restart at 0 resync without counting losses
+    for seq in (0xFFFFFFFF, 1, 1, 0, 1):
+        assembler.add(decode_frame(encode_frame(audio, seq, 200.0)), received_at=2000.0)
+    assert assembler.frames_lost == 2 and assembler.resyncs == 3, (assembler.frames_lost, assembler.resyncs)
@@ -75,7 +75,8 @@ async def process_audio(file: UploadFile = File(...)):
 #
 # Live meeting monitoring is now handled by LOCAL CAPTURE:
 #   - POST /start-session (starts screen/audio capture)
-#   - POST /stop-session (stops capture, creates lead)
+#   - POST /stop-session (stops capture, creates lead as a background job)
+#   - GET /jobs/{job_id} (background job status / result)
 #   - GET /session-status (current session state)
 #   - WS /session-stream (real-time hints/transcript)
 # =============================================================
@@ -86,11 +87,13 @@ async def process_audio(file: UploadFile = File(...)):
 from app.modules.workflow.live_session import (
     get_active_session,
     start_new_session,
-    stop_current_session,
+    detach_active_session,
+    stop_session as stop_live_session,
     force_reset_session,
     SessionConfig,
     SessionStatus
 )
+from app.modules.workflow.jobs import get_job_manager
 
 # Store WebSocket connections for broadcasting
 session_websockets = set()
@@ -98,12 +101,14 @@ session_websockets = set()
 
 class SessionConfigRequest(BaseModel):
     """Configuration for starting a new session."""
-    insight_interval: float = 5.0
+    insight_interval: float = 5.0  # minimum seconds between Gemini analyses (event-driven)
     screen_interval: float = 2.0
     enable_vision: bool = True
     enable_transcription: bool = True
     enable_final_sync: bool = True
     capture_mode: str = "local"  # "local" or "remote"
+    transcription_overflow: str = "drop_oldest"  # "drop_oldest", "drop_newest" or "merge"
+    streaming_transcription: bool = False  # rolling-window partial transcripts (local mode)
     remote_overlay_url: Optional[str] = None  # e.g., "http://10.119.65.XX:8888" for teammate's machine
 
 
@@ -145,7 +150,9 @@ async def start_session(config: Optional[SessionConfigRequest] = None):
                 enable_vision=config.enable_vision,
                 enable_transcription=config.enable_transcription,
                 enable_final_sync=config.enable_final_sync,
-                capture_mode=config.capture_mode  # "local" or "remote"
+                capture_mode=config.capture_mode,  # "local" or "remote"
+                streaming_transcription=config.streaming_transcription,
+                transcription_overflow=config.transcription_overflow
             )
         
         # Start session
@@ -208,19 +215,53 @@ async def start_session(config: Optional[SessionConfigRequest] = None):
             except Exception as e:
                 print(f"[API] Broadcast battlecard error: {e}")
         
+        def broadcast_partial_transcript(partial):
+            try:
+                asyncio.run_coroutine_threadsafe(_broadcast({
+                    "type": "transcript_partial",
+                    "committed": partial.get("committed", ""),
+                    "tentative": partial.get("tentative", "")
+                }), loop)
+            except Exception as e:
+                print(f"[API] Broadcast partial transcript error: {e}")
+        
         def broadcast_face_sentiment(data):
             try:
                 asyncio.run_coroutine_threadsafe(_broadcast(data), loop)
             except Exception as e:
                 print(f"[API] Broadcast face sentiment error: {e}")
         
+        def broadcast_hint_partial(partial):
+            try:
+                asyncio.run_coroutine_threadsafe(_broadcast({
+                    "type": "hint_partial",
+                    "index": partial["index"],
+                    "hint": partial["hint"]
+                }), loop)
+            except Exception as e:
+                print(f"[API] Broadcast hint partial error: {e}")
+        
+        def broadcast_battlecard_partial(partial):
+            try:
+                asyncio.run_coroutine_threadsafe(_broadcast({
+                    "type": "battlecard_partial",
+                    "competitor": partial["competitor"],
+                    "index": partial["index"],
+                    "point": partial["point"]
+                }), loop)
+            except Exception as e:
+                print(f"[API] Broadcast battlecard partial error: {e}")
+        
         session.set_callbacks(
             on_hints_update=broadcast_hints,
             on_transcript_update=broadcast_transcript,
             on_status_change=broadcast_status,
             on_entities_update=broadcast_entities,
             on_battlecard=broadcast_battlecard,
-            on_face_sentiment=broadcast_face_sentiment
+            on_face_sentiment=broadcast_face_sentiment,
+            on_partial_transcript=broadcast_partial_transcript,
+            on_hint_partial=broadcast_hint_partial,
+            on_battlecard_partial=broadcast_battlecard_partial
         )
         
         return {
@@ -243,160 +284,178 @@ async def stop_session():
     """
     Stop the current stealth assistant session.
     
-    Finalizes transcription, creates lead, and returns results.
-    Persists all data to SQLite database.
+    Returns immediately with a job ID. Finalization (summary, lead creation,
+    SQLite persistence, sentiment, Odoo sync) runs as a background job:
+    poll GET /jobs/{job_id} or listen for "job" events on /session-stream.
+    """
+    session = detach_active_session()
+    if session is None:
+        return {
+            "status": "not_running",
+            "message": "No active session to stop"
+        }
+    
+    job = get_job_manager().submit("stop_session", lambda job: _finalize_session_job(job, session))
+    return {
+        "status": "processing",
+        "message": "Session stopping, finalization running in background",
+        "job_id": job.id
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status (and result, once completed) of a background job."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+async def _finalize_session_job(job, session) -> dict:
+    """Background job: stop the session, then persist and sync its results."""
+    await job.set_stage("finalizing")
+    result = await stop_live_session(session)
+    
+    await job.set_stage("persisting")
+    result["db_session_id"] = await _persist_session_result(result, job)
+    return result
+
+
+_sentiment_analyzer = None
+
+
+def _post_call_metrics(transcript: str) -> dict:
+    """VADER sentiment + engagement heuristics (CPU-bound, run in a thread)."""
+    global _sentiment_analyzer
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    if _sentiment_analyzer is None:
+        _sentiment_analyzer = SentimentIntensityAnalyzer()
+    
+    sentiment = _sentiment_analyzer.polarity_scores(transcript)
+    
+    # Calculate engagement metrics from transcript analysis
+    words = len(transcript.split())
+    sentences = transcript.count('.') + transcript.count('?') + transcript.count('!')
+    
+    # Basic engagement heuristics
+    return {
+        "sentiment": int((sentiment['compound'] + 1) * 50),  # compound (-1 to 1) to 0-100 scale
+        "attention": min(100, 60 + (words // 50)),  # More words = higher attention
+        "interaction": min(100, 50 + (sentences * 2)),  # More sentences = more interaction
+        "speaking": min(100, 40 + (words // 30)),
+        "clarity": min(100, 70 + (10 if sentiment['compound'] > 0 else -10)),
+        "participation": min(100, 55 + (sentences * 3))
+    }
+
+
+async def _persist_session_result(result: dict, job=None) -> Optional[int]:
+    """
+    Persist a finished session to SQLite and sync the lead to Odoo.
+    
+    Returns the database session ID (None if persistence failed).
     """
+    if result.get("error") or result.get("status") == "not_running":
+        return None
+    
+    session_id = None
     try:
-        result = await stop_current_session()
+        from app.core.database import get_database
+        import json
         
-        if result is None:
-            return {
-                "status": "not_running",
-                "message": "No active session to stop"
-            }
+        db = await get_database()
+        
+        # Create session record
+        session_id = await db.create_session(
+            title=result.get('lead', {}).get('lead_name', 'Meeting Session')
+        )
+        
+        # Update session with transcript and summary
+        await db.update_session(
+            session_id,
+            transcript=result.get('transcript', ''),
+            summary=result.get('lead', {}).get('summary', ''),
+            entities=json.dumps(result.get('entities', [])),
+            status='completed'
+        )
+        
+        # Save battlecards, entities and lead info (one transaction)
+        meeting_json = result.get('lead', {}).get('meeting_json', {})
+        battlecards = meeting_json.get('battlecards', [])
+        entities = meeting_json.get('entities') or [
+            e if isinstance(e, dict) else {"text": str(e)} for e in result.get('entities', [])
+        ]
+        lead_info = meeting_json.get('lead', {})
+        await db.save_session_results(session_id, battlecards, entities, lead_info)
         
-        # ===== PERSIST TO DATABASE =====
+        # ===== POST-CALL SENTIMENT ANALYSIS =====
         try:
-            from app.core.database import get_database
-            import json
-            
-            db = await get_database()
-            
-            # Create session record
-            session_id = await db.create_session(
-                title=result.get('lead', {}).get('lead_name', 'Meeting Session')
-            )
-            
-            # Update session with transcript and summary
-            await db.update_session(
-                session_id,
-                transcript=result.get('transcript', ''),
-                summary=result.get('lead', {}).get('summary', ''),
-                entities=json.dumps(result.get('entities', [])),
-                status='completed'
-            )
-            
-            # Save battlecards
-            meeting_json = result.get('lead', {}).get('meeting_json', {})
-            battlecards = meeting_json.get('battlecards', [])
-            for bc in battlecards:
-                await db.save_battlecard(
-                    session_id,
-                    bc.get('competitor', 'Unknown'),
-                    bc.get('counter_points', [])
-                )
-            
-            # Save entities to separate table
-            entities = result.get('entities', [])
-            for entity in entities:
-                await db._connection.execute(
-                    "INSERT INTO entities (session_id, text, label, score) VALUES (?, ?, ?, ?)",
-                    (session_id, entity.get('text', ''), entity.get('label', ''), entity.get('score', 0))
-                )
-            await db._connection.commit()
-            
-            # Save lead info
-            lead_info = result.get('lead', {}).get('meeting_json', {}).get('lead', {})
-            if lead_info:
+            transcript = result.get('transcript', '')
+            if transcript:
+                metrics = await asyncio.to_thread(_post_call_metrics, transcript)
+                sentiment_score = metrics["sentiment"]
+                
+                # Save engagement metrics
                 await db._connection.execute(
-                    "INSERT INTO leads (session_id, name, email, phone, company) VALUES (?, ?, ?, ?, ?)",
-                    (session_id, lead_info.get('name'), lead_info.get('email'), 
-                     lead_info.get('phone'), lead_info.get('company'))
+                    """INSERT INTO engagement_metrics 
+                       (session_id, attention, interaction, sentiment, speaking, participation, clarity)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (session_id, metrics["attention"], metrics["interaction"], sentiment_score,
+                     metrics["speaking"], metrics["participation"], metrics["clarity"])
                 )
                 await db._connection.commit()
-            
-            # ===== POST-CALL SENTIMENT ANALYSIS =====
-            try:
-                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
                 
-                transcript = result.get('transcript', '')
-                if transcript:
-                    analyzer = SentimentIntensityAnalyzer()
-                    sentiment = analyzer.polarity_scores(transcript)
+                print(f"[API] Post-call sentiment score: {sentiment_score}/100")
+                
+                # ===== SYNC TO ODOO CRM =====
+                # Lead stage is determined by sentiment score:
+                # >= 50 = Qualified, < 50 = Lost
+                try:
+                    from app.modules.odoo_client.client import OdooClient
+                    from app.modules.core.domain import LeadCandidate
+                    
+                    if job:
+                        await job.set_stage("crm_sync")
+                    odoo = OdooClient()
+                    
+                    lead_data = LeadCandidate(
+                        name=lead_info.get('name', 'Meeting Lead'),
+                        email=lead_info.get('email', ''),
+                        phone=lead_info.get('phone', ''),
+                        company=lead_info.get('company', ''),
+                        notes=result.get('lead', {}).get('summary', ''),
+                        source_summary=transcript[:500] if transcript else ''
+                    )
                     
-                    # Convert compound score (-1 to 1) to 0-100 scale
-                    sentiment_score = int((sentiment['compound'] + 1) * 50)
+                    starred_hints = result.get('starred_hints', [])
                     
-                    # Calculate engagement metrics from transcript analysis
-                    words = len(transcript.split())
-                    sentences = transcript.count('.') + transcript.count('?') + transcript.count('!')
+                    # Create lead with sentiment-based stage (blocking XML-RPC - off the loop)
+                    odoo_lead_id = await asyncio.to_thread(odoo.create_lead, lead_data, starred_hints, sentiment_score)
                     
-                    # Basic engagement heuristics
-                    attention = min(100, 60 + (words // 50))  # More words = higher attention
-                    interaction = min(100, 50 + (sentences * 2))  # More sentences = more interaction
-                    speaking = min(100, 40 + (words // 30))
-                    clarity = min(100, 70 + (10 if sentiment['compound'] > 0 else -10))
-                    participation = min(100, 55 + (sentences * 3))
+                    stage = "Qualified" if sentiment_score >= 50 else "Lost"
+                    print(f"[API] Created Odoo Lead ID: {odoo_lead_id} | Stage: {stage} | Sentiment: {sentiment_score}/100")
                     
-                    # Save engagement metrics
+                    # Save Odoo lead ID to database
                     await db._connection.execute(
-                        """INSERT INTO engagement_metrics 
-                           (session_id, attention, interaction, sentiment, speaking, participation, clarity)
-                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                        (session_id, attention, interaction, sentiment_score, speaking, participation, clarity)
+                        "UPDATE sessions SET odoo_lead_id = ? WHERE id = ?",
+                        (odoo_lead_id, session_id)
                     )
                     await db._connection.commit()
                     
-                    print(f"[API] Post-call sentiment score: {sentiment_score}/100")
-                    
-                    # ===== SYNC TO ODOO CRM =====
-                    # Lead stage is determined by sentiment score:
-                    # >= 50 = Qualified, < 50 = Lost
-                    try:
-                        from app.modules.odoo_client.client import OdooClient
-                        from app.modules.core.domain import LeadCandidate
-                        
-                        lead_info = result.get('lead', {}).get('meeting_json', {}).get('lead', {})
-                        odoo = OdooClient()
-                        
-                        lead_data = LeadCandidate(
-                            name=lead_info.get('name', 'Meeting Lead'),
-                            email=lead_info.get('email', ''),
-                            phone=lead_info.get('phone', ''),
-                            company=lead_info.get('company', ''),
-                            notes=result.get('lead', {}).get('summary', ''),
-                            source_summary=transcript[:500] if transcript else ''
-                        )
-                        
-                        starred_hints = result.get('starred_hints', [])
-                        
-                        # Create lead with sentiment-based stage
-                        odoo_lead_id = odoo.create_lead(lead_data, starred_hints, sentiment_score)
-                        
-                        stage = "Qualified" if sentiment_score >= 50 else "Lost"
-                        print(f"[API] Created Odoo Lead ID: {odoo_lead_id} | Stage: {stage} | Sentiment: {sentiment_score}/100")
-                        
-                        # Save Odoo lead ID to database
-                        await db._connection.execute(
-                            "UPDATE sessions SET odoo_lead_id = ? WHERE id = ?",
-                            (odoo_lead_id, session_id)
-                        )
-                        await db._connection.commit()
-                        
-                    except Exception as odoo_error:
-                        print(f"[API] Warning: Odoo sync failed: {odoo_error}")
-                    
-            except Exception as sent_error:
-                print(f"[API] Warning: Sentiment analysis failed: {sent_error}")
-            
-            print(f"[API] Session {session_id} saved to database with {len(battlecards)} battlecards")
-            
-        except Exception as db_error:
-            print(f"[API] Warning: Failed to save to database: {db_error}")
-            import traceback
-            traceback.print_exc()
-        # ===== END DATABASE PERSIST =====
+                except Exception as odoo_error:
+                    print(f"[API] Warning: Odoo sync failed: {odoo_error}")
+                
+        except Exception as sent_error:
+            print(f"[API] Warning: Sentiment analysis failed: {sent_error}")
         
-        return {
-            "status": "completed",
-            "message": "Session stopped and processed",
-            "result": result
-        }
+        print(f"[API] Session {session_id} saved to database with {len(battlecards)} battlecards")
         
-    except Exception as e:
+    except Exception as db_error:
+        print(f"[API] Warning: Failed to save to database: {db_error}")
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    return session_id
 
 
 @router.post("/reset-session")
@@ -478,44 +537,37 @@ async def get_battlecard(request: BattlecardRequest):
     enhanced with web research for negative competitor analysis.
     """
     try:
+        from app.modules.intelligence.battlecard_prewarm import get_battlecard_prewarmer
         from app.modules.intelligence.gemini_service import GeminiService
-        from app.modules.intelligence.web_insight_service import WebInsightService
+        from app.modules.intelligence.web_insight_service import get_web_insight_service
         
-        # 1. Generate battlecard with Gemini
-        gemini = GeminiService()
-        battlecard = await gemini.get_battlecard(
-            competitor_name=request.competitor_name,
-            context=request.context
-        )
+        session = get_active_session()
         
-        # 2. Get web insights for competitor (use existing service)
-        try:
-            web_service = WebInsightService()
-            web_insights = {"negative_findings": [], "sources": []}
-            
-            # Stream insights from web_insight_service
-            async for update in web_service.get_negative_insights_stream(request.competitor_name):
-                if update.get("type") == "fast" and update.get("data"):
-                    data = update["data"]
-                    web_insights["negative_findings"].append(data.get("summary", ""))
-                    web_insights["sources"] = data.get("sources", [])
-                    web_insights["verdict"] = data.get("verdict", "")
-                    web_insights["negative_score"] = data.get("negative_score", 0)
-                elif update.get("type") == "deep" and update.get("data"):
-                    data = update["data"]
-                    if data.get("evidence"):
-                        web_insights["negative_findings"].extend(data["evidence"])
-                    web_insights["verdict"] = data.get("verdict", web_insights.get("verdict", ""))
-            
-            battlecard["web_research"] = web_insights
-            print(f"[API] Web insight: {web_insights.get('verdict', 'N/A')} for {request.competitor_name}")
+        # Known competitors: pre-warmed card, no Gemini / web latency
+        battlecard = get_battlecard_prewarmer().get(request.competitor_name)
+        if battlecard is not None:
+            print(f"[API] Serving pre-warmed battlecard v{battlecard['prewarmed']['version']} for {request.competitor_name}")
+        else:
+            # 1. Generate battlecard with Gemini (counter-points stream to the overlay)
+            gemini = GeminiService()
+            battlecard = await gemini.get_battlecard(
+                competitor_name=request.competitor_name,
+                context=request.context,
+                on_point=session._point_streamer(request.competitor_name) if session else None
+            )
             
-        except Exception as e:
-            print(f"[API] Web insight error: {e}")
-            battlecard["web_research"] = {"negative_findings": [], "sources": []}
+            # 2. Get web insights for competitor (use existing service)
+            try:
+                web_insights = await get_web_insight_service().get_battlecard_research(request.competitor_name)
+                
+                battlecard["web_research"] = web_insights
+                print(f"[API] Web insight: {web_insights.get('verdict', 'N/A')} for {request.competitor_name}")
+                
+            except Exception as e:
+                print(f"[API] Web insight error: {e}")
+                battlecard["web_research"] = {"negative_findings": [], "sources": []}
         
         # Save to session if active
-        session = get_active_session()
         if session:
             session.state.battlecards.append(battlecard)
             
@@ -534,6 +586,24 @@ async def get_battlecard(request: BattlecardRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/battlecards/prewarmed")
+async def get_prewarmed_battlecards():
+    """Pre-warmed battlecard store: competitors ready, versions and ages."""
+    from app.modules.intelligence.battlecard_prewarm import get_battlecard_prewarmer
+    return get_battlecard_prewarmer().stats()
+
+
+@router.post("/battlecards/prewarm")
+async def prewarm_battlecards():
+    """Rebuild every configured competitor's battlecard now (background job)."""
+    from app.modules.intelligence.battlecard_prewarm import get_battlecard_prewarmer
+    prewarmer = get_battlecard_prewarmer()
+    job = prewarmer.submit(prewarmer.competitors)
+    if job is None:
+        raise HTTPException(status_code=409, detail="A pre-warm job is already running")
+    return {"status": "accepted", "job_id": job.id}
+
+
 @router.get("/session-status")
 async def get_session_status():
     """
@@ -558,10 +628,22 @@ async def get_session_status():
             "audio_chunks_processed": session.state.audio_chunks_processed,
             "gemini_calls": session.state.gemini_calls
         },
+        "transcription": session.transcription_metrics(),
         "battlecards": session.state.battlecards
     }
 
 
+@router.get("/models")
+async def get_models_status():
+    """
+    Report the models loaded in this process.
+    
+    Includes per-model load time, memory growth at load and handle count.
+    """
+    from app.core.model_registry import get_model_registry
+    return get_model_registry().stats()
+
+
 @router.websocket("/session-stream")
 async def session_stream(websocket: WebSocket):
     """
@@ -569,9 +651,14 @@ async def session_stream(websocket: WebSocket):
     
     Broadcasts:
     - hints: Quick hints from Gemini
+    - hint_partial: One hint as soon as it has streamed in ({index, hint})
+    - battlecard: Completed battlecard (with web research)
+    - battlecard_partial: One counter-point as it streams in ({competitor, index, point})
     - transcript: New transcript segments
+    - transcript_partial: Committed/tentative text (streaming mode, ~1s)
     - status: Session status changes
     - entities: Detected entities
+    - job: Background job status changes (e.g. stop-session finalization)
     """
     await websocket.accept()
     session_websockets.add(websocket)
@@ -642,85 +729,84 @@ async def _broadcast(message: dict):
         session_websockets.discard(ws)
 
 
+async def _broadcast_job(job):
+    """Push background job progress / completion to session-stream clients."""
+    await _broadcast({"type": "job", **job.to_dict(include_result=False)})
+
+
+get_job_manager().add_listener(_broadcast_job)
+
+
 @router.websocket("/audio-stream")
 async def audio_stream(websocket: WebSocket):
     """
     WebSocket endpoint for receiving audio from remote clients.
     
-    Clients capture audio locally and stream WAV data here.
-    The backend transcribes and processes it.
+    Clients send small framed messages (see audio_protocol: 16 kHz PCM16,
+    FLAC or Opus with a seq/timestamp header), which are reassembled into
+    chunks at segment boundaries. Whole WAV files (older clients) and raw
+    16 kHz PCM are still accepted. Everything is decoded in memory and queued
+    for the session's transcription worker.
     """
     await websocket.accept()
     print("[API] Audio stream client connected")
     
+    import time
+    from app.modules.api.audio_protocol import StreamAssembler, ProtocolError, decode_frame, is_framed
+    from app.modules.transcription.audio import load_audio, WHISPER_SAMPLE_RATE
+    from app.modules.transcription.worker import TranscriptionJob
+    
+    source = f"remote-{id(websocket):x}"
+    assembler = StreamAssembler(max_seconds=10.0)
+    
+    def submit_chunks(chunks):
+        if not chunks:
+            return
+        session = get_active_session()
+        if not session or not session.transcription_worker:
+            print("[API] No active session for audio")
+            return
+        for timestamp, audio, sample_rate in chunks:
+            # Queue for the session's single transcription worker
+            session.transcription_worker.submit(TranscriptionJob(
+                timestamp=timestamp,
+                audio=audio,
+                sample_rate=sample_rate,
+                source=source
+            ))
+    
     try:
-        import tempfile
-        import os
-        import asyncio
-        import threading
-        
-        def process_audio_in_background(wav_path: str):
-            """Process audio in background thread to not block WebSocket."""
-            try:
-                session = get_active_session()
-                if session:
-                    # Transcribe
-                    segments = session.transcriber.transcribe_with_speakers(wav_path)
-                    
-                    if segments:
-                        # Add to session state
-                        session.state.transcript_segments.extend(segments)
-                        session.state.audio_chunks_processed += 1
-                        
-                        # Format and broadcast
-                        formatted = session.transcriber.format_transcript_with_speakers(segments)
-                        if session._on_transcript_update:
-                            session._on_transcript_update(formatted)
-                        
-                        print(f"[API] Transcribed: {formatted[:50]}...")
-                    else:
-                        print("[API] No speech detected in audio chunk")
-                else:
-                    print("[API] No active session for audio")
-            except Exception as e:
-                print(f"[API] Background transcription error: {e}")
-            finally:
-                # Cleanup
-                if os.path.exists(wav_path):
-                    try:
-                        os.remove(wav_path)
-                    except:
-                        pass
-        
         while True:
             try:
-                # Receive binary WAV data with timeout
+                # Receive binary audio data with timeout
                 data = await asyncio.wait_for(websocket.receive_bytes(), timeout=120)
                 
                 if not data:
                     continue
                 
-                print(f"[API] Received audio chunk: {len(data)} bytes")
+                received_at = time.time()
+                if is_framed(data):
+                    try:
+                        frame = decode_frame(data)
+                    except ProtocolError as e:
+                        print(f"[API] Dropping bad audio frame: {e}")
+                        continue
+                    chunks = assembler.add(frame, received_at, len(data))
+                    if not chunks:
+                        continue
+                else:
+                    # Legacy: one WAV file (or raw 16 kHz PCM) per message
+                    print(f"[API] Received audio chunk: {len(data)} bytes")
+                    audio = load_audio(data)
+                    chunks = [(received_at - len(audio) / WHISPER_SAMPLE_RATE, audio, WHISPER_SAMPLE_RATE)]
                 
-                # Send ACK immediately to keep connection alive
+                # ACK each completed chunk to keep connection alive
                 try:
                     await websocket.send_text("ACK")
                 except:
                     pass
                 
-                # Save to temp file
-                fd, wav_path = tempfile.mkstemp(suffix=".wav")
-                os.close(fd)
-                
-                with open(wav_path, 'wb') as f:
-                    f.write(data)
-                
-                # Process in background thread (don't block WebSocket)
-                threading.Thread(
-                    target=process_audio_in_background, 
-                    args=(wav_path,), 
-                    daemon=True
-                ).start()
+                submit_chunks(chunks)
                 
             except asyncio.TimeoutError:
                 # Send ping to check if client is still alive
@@ -741,6 +827,11 @@ async def audio_stream(websocket: WebSocket):
     except Exception as e:
         print(f"[API] Audio stream connection error: {e}")
     finally:
+        # Transcribe the tail of an unfinished segment
+        submit_chunks(assembler.flush())
+        if assembler.frames_received:
+            print(f"[API] Audio stream stats: {assembler.frames_received} frames, "
+                  f"{assembler.bytes_received / 1024:.0f} KB, {assembler.frames_lost} lost, {assembler.resyncs} resyncs")
         print("[API] Audio stream client removed")
 
 
@@ -1344,27 +1435,36 @@ async def analyze_document(doc_id: int, prompt: Optional[str] = None):
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
         
-        # Generate 3 key insights for overlay display
+        def insight_hint(insight: str) -> dict:
+            return {
+                "type": "hint",
+                "data": {
+                    "text": insight,
+                    "hint_type": "document_insight",
+                    "source": filename,
+                    "starred": False
+                }
+            }
+        
+        # Generate 3 key insights for overlay display; each is broadcast to
+        # the overlay as soon as its line has streamed in
+        sends = []
+        
+        def broadcast_insight(index: int, insight: str):
+            sends.append(asyncio.create_task(_broadcast(insight_hint(insight))))
+        
         text_content = result.get("text_content", "") or result.get("summary", "")
-        insights = await ollama.generate_key_insights(text_content, 3)
+        insights = await ollama.generate_key_insights(text_content, 3, on_insight=broadcast_insight)
         result["key_insights"] = insights
         
         print(f"[API] Document analysis complete for: {filename}")
         print(f"[API] Generated insights: {insights}")
         
-        # Broadcast insights to overlay via WebSocket
+        # Broadcast the remaining (fallback) insights
         try:
-            for insight in insights:
-                hint_data = {
-                    "type": "hint",
-                    "data": {
-                        "text": insight,
-                        "hint_type": "document_insight",
-                        "source": filename,
-                        "starred": False
-                    }
-                }
-                await broadcast_to_session(hint_data)
+            for insight in insights[len(sends):]:
+                sends.append(asyncio.create_task(_broadcast(insight_hint(insight))))
+            await asyncio.gather(*sends)
         except Exception as ws_error:
             print(f"[API] WebSocket broadcast error: {ws_error}")
         
@@ -12,6 +12,8 @@ class ExtractedEntity(BaseModel):
     text: str
     label: str
     score: float
+    start: Optional[int] = None  # character offsets in the source text
+    end: Optional[int] = None
 
 class LeadCandidate(BaseModel):
     """A processed lead ready to be sent to Odoo."""
@@ -0,0 +1,104 @@
+"""
+Sentence-aware text chunking for span models (GLiNER).
+
+GLiNER scores at most ~384 word tokens per pass and silently truncates the
+rest, so long transcripts are split into overlapping chunks on sentence
+boundaries, run in batches, and the resulting spans are mapped back to
+offsets in the original text and merged.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from app.modules.core.domain import ExtractedEntity
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\S+")
+
+
+@dataclass
+class TextChunk:
+    """A slice of the source text."""
+    start: int  # offset of text[0] in the source
+    text: str
+    words: int
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    spans, pos = [], 0
+    for m in _SENTENCE_END.finditer(text):
+        spans.append((pos, m.start()))
+        pos = m.end()
+    if pos < len(text):
+        spans.append((pos, len(text)))
+    return [(s, e) for s, e in spans if text[s:e].strip()]
+
+
+def _split_long(text: str, start: int, end: int, max_words: int, overlap_words: int) -> List[Tuple[int, int]]:
+    """Window an over-long sentence (unpunctuated ASR output) by words."""
+    words = [(start + m.start(), start + m.end()) for m in _WORD.finditer(text[start:end])]
+    step = max(1, max_words - overlap_words)
+    return [
+        (words[i][0], words[min(i + max_words, len(words)) - 1][1])
+        for i in range(0, len(words), step)
+        if i == 0 or i + overlap_words < len(words)
+    ]
+
+
+def chunk_text(text: str, max_words: int = 250, overlap_sentences: int = 1) -> List[TextChunk]:
+    """
+    Split text into chunks of at most max_words, breaking between sentences.
+
+    Consecutive chunks share their last / first `overlap_sentences` sentences,
+    so an entity near a boundary is always seen with context in one of them.
+    """
+    if not text.strip():
+        return []
+
+    sentences: List[Tuple[int, int]] = []
+    for s, e in _sentence_spans(text):
+        if len(_WORD.findall(text[s:e])) > max_words:
+            sentences.extend(_split_long(text, s, e, max_words, overlap_words=max_words // 10))
+        else:
+            sentences.append((s, e))
+
+    counts = [len(_WORD.findall(text[s:e])) for s, e in sentences]
+    chunks: List[TextChunk] = []
+    i = 0
+    while i < len(sentences):
+        j, words = i, 0
+        while j < len(sentences) and (j == i or words + counts[j] <= max_words):
+            words += counts[j]
+            j += 1
+
+        start, end = sentences[i][0], sentences[j - 1][1]
+        chunks.append(TextChunk(start=start, text=text[start:end], words=words))
+        if j >= len(sentences):
+            break
+        # Step back for overlap, but always make progress
+        i = max(i + 1, j - overlap_sentences)
+    return chunks
+
+
+def merge_spans(entities: Sequence[ExtractedEntity]) -> List[ExtractedEntity]:
+    """
+    Resolve duplicates and overlaps from overlapping chunks (flat NER):
+    the highest-scoring span wins, and the result is ordered by position.
+    Entities without offsets are de-duplicated by (label, text).
+    """
+    located = sorted((e for e in entities if e.start is not None and e.end is not None), key=lambda e: -e.score)
+    kept: List[ExtractedEntity] = []
+    for e in located:
+        if all(e.end <= k.start or e.start >= k.end for k in kept):
+            kept.append(e)
+
+    seen = set()
+    for e in sorted((e for e in entities if e.start is None or e.end is None), key=lambda e: -e.score):
+        key = (e.label, e.text.casefold())
+        if key not in seen:
+            seen.add(key)
+            kept.append(e)
+
+    return sorted(kept, key=lambda e: e.start if e.start is not None else float("inf"))
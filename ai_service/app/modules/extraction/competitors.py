@@ -0,0 +1,285 @@
+"""
+Competitor Catalog - Aho-Corasick matching of competitor names and aliases.
+
+detect_competitors() compared every entity with every known competitor and
+get_battlecard() scanned BATTLECARD_DB, both with two-way substring tests:
+"sap" matched inside "asap", "sales" matched "salesforce", and the cost grew
+with entities x competitors. All names and aliases are now compiled into one
+Aho-Corasick automaton; a scan is linear in the text length (plus matches),
+whatever the catalog size, and only whole-word matches count.
+
+Some competitor names are everyday words ("slack in the budget", "see you
+Monday"). Entries marked ambiguous are only detected through an explicit
+alias ("monday.com") or a capitalized GLiNER organization/product entity,
+never from the bare word in raw transcript text.
+
+The catalog comes from COMPETITOR_CATALOG_PATH (JSON) when set, otherwise
+from the COMPETITORS setting plus a few built-in aliases:
+
+    {"competitors": [
+        {"name": "AWS", "aliases": ["Amazon Web Services"],
+         "battlecard": {"counter_points": [...], "quick_response": "..."}},
+        {"name": "Slack", "aliases": ["Slack Connect"], "ambiguous": true}
+    ]}
+
+Usage:
+    catalog = get_competitor_catalog()
+    catalog.find("we moved off Amazon Web Services last year")  # [CompetitorMatch(...)]
+    catalog.mentions(transcript)                                # find() minus ambiguous bare words
+    catalog.lookup("AWS Lambda").key                           # "aws"
+"""
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Extra names for the default COMPETITORS list
+DEFAULT_ALIASES = {
+    "aws": ["amazon web services"],
+    "google": ["google cloud", "gcp"],
+    "microsoft": ["azure", "msft"],
+    "salesforce": ["sfdc"],
+    "monday": ["monday.com"],
+}
+
+# Default competitors whose name is also a common word
+DEFAULT_AMBIGUOUS = {"google", "slack", "monday", "oracle", "asana", "sap"}
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher (Aho-Corasick automaton).
+
+    add() patterns, build() once, then iter_matches() reports every
+    occurrence of every pattern in a single pass over the text.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]  # (pattern length, value) ending at node
+        self._built = False
+
+    def add(self, pattern: str, value: Any):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self):
+        """Compute failure links (BFS) and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """(start, end, value) for every pattern occurrence in text."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i - length + 1, i + 1, value
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+
+@dataclass
+class CompetitorEntry:
+    """One competitor: display name, aliases and optional static battlecard."""
+    name: str
+    aliases: List[str] = field(default_factory=list)
+    battlecard: Optional[Dict[str, Any]] = None
+    ambiguous: bool = False  # name is a common word - needs an alias or a capitalized entity
+
+    @property
+    def key(self) -> str:
+        return self.name.strip().lower()
+
+
+@dataclass
+class CompetitorMatch:
+    """A competitor mention found in text."""
+    competitor: CompetitorEntry
+    text: str  # surface form as it appears in the text
+    start: int
+    end: int
+    alias: bool = False  # matched an explicit alias, not the name itself
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class CompetitorCatalog:
+    """Competitor names + aliases compiled into one word-boundary-aware matcher."""
+
+    def __init__(self, entries: List[CompetitorEntry]):
+        self.entries: Dict[str, CompetitorEntry] = {}
+        self._matcher = AhoCorasick()
+        for entry in entries:
+            self.entries[entry.key] = entry
+            self._matcher.add(entry.key, (entry, False))
+            for pattern in {a.strip().lower() for a in entry.aliases} - {entry.key, ""}:
+                self._matcher.add(pattern, (entry, True))
+        self._matcher.build()
+
+    @classmethod
+    def from_settings(cls) -> "CompetitorCatalog":
+        """COMPETITOR_CATALOG_PATH if set, else COMPETITORS + DEFAULT_ALIASES."""
+        if settings.COMPETITOR_CATALOG_PATH:
+            return cls.from_file(settings.COMPETITOR_CATALOG_PATH)
+        return cls([
+            CompetitorEntry(name, DEFAULT_ALIASES.get(name, []), ambiguous=name in DEFAULT_AMBIGUOUS)
+            for name in settings.competitor_list
+        ])
+
+    @classmethod
+    def from_file(cls, path: str) -> "CompetitorCatalog":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        items = data.get("competitors", []) if isinstance(data, dict) else data
+        entries = [
+            CompetitorEntry(item["name"], item.get("aliases", []), item.get("battlecard"), bool(item.get("ambiguous")))
+            for item in items if item.get("name")
+        ]
+        print(f"[Competitors] Loaded {len(entries)} competitors from {path}")
+        return cls(entries)
+
+    def find(self, text: str) -> List[CompetitorMatch]:
+        """
+        Whole-word competitor mentions in text, left to right; overlapping
+        matches resolve to the longest ("amazon web services", not "amazon").
+        """
+        folded = text.lower()
+        if len(folded) != len(text):  # rare Unicode case changes length - fold per character
+            folded = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+        candidates = []
+        for start, end, value in self._matcher.iter_matches(folded):
+            if start > 0 and _is_word_char(folded[start - 1]):
+                continue
+            if end < len(folded) and _is_word_char(folded[end]):
+                continue
+            candidates.append((start, end, value))
+
+        matches: List[CompetitorMatch] = []
+        last_end = 0
+        for start, end, (entry, alias) in sorted(candidates, key=lambda m: (m[0], m[0] - m[1])):
+            if start >= last_end:
+                matches.append(CompetitorMatch(entry, text[start:end], start, end, alias))
+                last_end = end
+        return matches
+
+    def mentions(self, text: str) -> List[CompetitorMatch]:
+        """find() for raw transcript text: ambiguous entries only count via an alias."""
+        return [m for m in self.find(text) if m.alias or not m.competitor.ambiguous]
+
+    def match_entity(self, name: str) -> Optional[CompetitorEntry]:
+        """
+        The competitor an extracted entity refers to; ambiguous names must be
+        capitalized as written ("Slack", not "slack") unless matched by alias.
+        """
+        matches = [
+            m for m in self.find(name)
+            if m.alias or not m.competitor.ambiguous or m.text[:1].isupper()
+        ]
+        return max(matches, key=lambda m: m.end - m.start).competitor if matches else None
+
+    def key_of(self, name: str) -> str:
+        """Catalog key for a competitor name (lowercased name if not in the catalog)."""
+        entry = self.lookup(name)
+        return entry.key if entry is not None else name.strip().lower()
+
+    def lookup(self, name: str) -> Optional[CompetitorEntry]:
+        """The competitor a name refers to ("AWS Lambda" -> aws), or None."""
+        entry = self.entries.get(name.strip().lower())
+        if entry is not None:
+            return entry
+        matches = self.find(name)
+        return max(matches, key=lambda m: m.end - m.start).competitor if matches else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+# Global catalog
+_catalog: Optional[CompetitorCatalog] = None
+
+
+def get_competitor_catalog() -> CompetitorCatalog:
+    """Get or load the competitor catalog."""
+    global _catalog
+    if _catalog is None:
+        _catalog = CompetitorCatalog.from_settings()
+    return _catalog
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    catalog = CompetitorCatalog.from_settings()
+    text = ("We need this ASAP. Right now we're on Amazon Web Services and SAP, "
+            "the sales team lives in Salesforce, and ops swapped Datadog for nothing.")
+    found = [(m.competitor.key, m.text) for m in catalog.find(text)]
+    print(f"Found: {found}")
+    assert found == [("aws", "Amazon Web Services"), ("sap", "SAP"), ("salesforce", "Salesforce"), ("datadog", "Datadog")]
+    assert catalog.lookup("AWS Lambda").key == "aws" and catalog.lookup("sales") is None
+    assert catalog.lookup("asap") is None
+
+    # Everyday words: no raw-text hits, but aliases and capitalized entities still count
+    chatter = "See you Monday, I'll google the pricing and ping you on slack. There is some slack in the budget."
+    assert catalog.mentions(chatter) == []
+    assert [m.competitor.key for m in catalog.mentions("we track sprints on monday.com and Google Cloud")] == \
+           ["monday", "google"]
+    assert catalog.match_entity("Slack") is not None and catalog.match_entity("slack") is None
+    assert catalog.key_of("Salesforce") == catalog.key_of("salesforce") == "salesforce"
+
+    # Scale: thousands of names, one pass over a long transcript
+    rng = random.Random(3)
+    syllables = ["ka", "lo", "mi", "tes", "ra", "vo", "nex", "quo", "zen", "dar", "pil", "sun"]
+    names = sorted({"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(6000)})
+    big = CompetitorCatalog([CompetitorEntry(n, [f"{n} cloud"]) for n in names])
+    words = [rng.choice(names) if rng.random() < 0.02 else rng.choice(["the", "deal", "pricing", "team", "renewal"])
+             for _ in range(20000)]
+    transcript = " ".join(words)
+
+    start = time.perf_counter()
+    hits = big.find(transcript)
+    t_scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lowered = transcript.lower().split()
+    naive = [w for w in lowered if any(n in w or w in n for n in names[:500])]  # old nested loop, 500 names only
+    t_naive = time.perf_counter() - start
+    print(f"{len(big)} competitors ({len(big._matcher)} automaton states): "
+          f"scan of {len(transcript)} chars -> {len(hits)} mentions in {t_scan * 1000:.1f} ms; "
+          f"nested substring loop over just 500 names: {t_naive * 1000:.0f} ms ({len(naive)} hits, with false positives)")
@@ -0,0 +1,231 @@
+"""
+ONNX Runtime backend for GLiNER.
+
+CPU-only laptops spend most of each insight tick in fp32 PyTorch. This exports
+the GLiNER model once to ONNX (optionally with dynamic int8 weight
+quantization), caches it under settings.GLINER_ONNX_CACHE_DIR, and loads it
+through GLiNER's own ONNX wrapper, so predict_entities() and friends keep
+working unchanged.
+
+Backends (settings.GLINER_BACKEND):
+- "torch":      GLiNER.from_pretrained (default)
+- "onnx":       fp32 ONNX Runtime
+- "onnx-int8":  dynamic int8 quantized ONNX Runtime
+
+Run this module directly for a parity check and latency benchmark; it exits
+with an AssertionError when an ONNX backend drifts from torch beyond the
+check_parity() tolerances:
+    python -m app.modules.extraction.gliner_onnx
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+
+ONNX_MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Tolerances for ONNX / int8 against torch
+MIN_PARITY_F1 = 0.9
+MAX_SCORE_DELTA = 0.15
+
+
+def cache_dir_for(model_name: str, cache_root: Optional[str] = None) -> str:
+    """Local export directory for one model id."""
+    root = cache_root or settings.GLINER_ONNX_CACHE_DIR
+    return os.path.abspath(os.path.join(root, model_name.replace("/", "--")))
+
+
+def export_onnx(model_name: str, cache_dir: str, quantize: bool = True) -> str:
+    """
+    Export a GLiNER checkpoint to ONNX (and an int8 copy) in cache_dir.
+
+    The tokenizer and config are saved alongside so the export can be loaded
+    offline with GLiNER.from_pretrained(cache_dir, load_onnx_model=True).
+    """
+    import torch
+    from gliner import GLiNER
+
+    os.makedirs(cache_dir, exist_ok=True)
+    onnx_path = os.path.join(cache_dir, ONNX_MODEL_FILE)
+    print(f"[GLiNER-ONNX] Exporting {model_name} -> {onnx_path}")
+
+    model = GLiNER.from_pretrained(model_name, load_tokenizer=True)
+    model.eval()
+    model.save_pretrained(cache_dir)
+
+    # Trace with a representative input; all sequence / span axes are dynamic
+    text = "ONNX is an open-source format designed to enable the interoperability of AI models."
+    labels = ["format", "model", "tool", "person"]
+    inputs, _ = model.prepare_model_inputs([text], labels)
+
+    input_names = ["input_ids", "attention_mask", "words_mask", "text_lengths"]
+    dynamic_axes = {
+        "input_ids": {0: "batch_size", 1: "sequence_length"},
+        "attention_mask": {0: "batch_size", 1: "sequence_length"},
+        "words_mask": {0: "batch_size", 1: "sequence_length"},
+        "text_lengths": {0: "batch_size", 1: "value"},
+    }
+    if model.config.span_mode == "token_level":
+        dynamic_axes["logits"] = {0: "position", 1: "batch_size", 2: "sequence_length", 3: "num_classes"}
+    else:
+        input_names += ["span_idx", "span_mask"]
+        dynamic_axes.update({
+            "span_idx": {0: "batch_size", 1: "num_spans", 2: "idx"},
+            "span_mask": {0: "batch_size", 1: "num_spans"},
+            "logits": {0: "batch_size", 1: "sequence_length", 2: "num_spans", 3: "num_classes"},
+        })
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model.model,
+            tuple(inputs[name] for name in input_names),
+            f=onnx_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantized_path = os.path.join(cache_dir, QUANTIZED_MODEL_FILE)
+        quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QUInt8)
+        print(f"[GLiNER-ONNX] Quantized -> {quantized_path} "
+              f"({os.path.getsize(onnx_path) / 1e6:.0f} MB -> {os.path.getsize(quantized_path) / 1e6:.0f} MB)")
+
+    return onnx_path
+
+
+def load_gliner(model_name: str, backend: str = "torch", cache_root: Optional[str] = None):
+    """
+    Load GLiNER with the requested backend, exporting the ONNX files on first use.
+
+    Raises ValueError for an unknown backend; export / runtime errors propagate
+    so the caller can fall back to torch.
+    """
+    from gliner import GLiNER
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown GLiNER backend '{backend}' (expected one of {BACKENDS})")
+    if backend == "torch":
+        return GLiNER.from_pretrained(model_name)
+
+    quantized = backend == "onnx-int8"
+    filename = QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE
+    cache_dir = cache_dir_for(model_name, cache_root)
+    if not os.path.exists(os.path.join(cache_dir, filename)):
+        export_onnx(model_name, cache_dir, quantize=quantized)
+
+    return GLiNER.from_pretrained(
+        cache_dir,
+        load_onnx_model=True,
+        load_tokenizer=True,
+        onnx_model_file=filename
+    )
+
+
+def entity_parity(
+    reference: List[Dict[Any, float]],
+    found: List[Dict[Any, float]]
+) -> Dict[str, float]:
+    """
+    F1 of (text, label) keys per text against the reference, and the max
+    score delta over keys both found.
+    """
+    tp = fp = fn = 0
+    max_delta = 0.0
+    for ref, got in zip(reference, found):
+        tp += len(ref.keys() & got.keys())
+        fp += len(got.keys() - ref.keys())
+        fn += len(ref.keys() - got.keys())
+        for key in ref.keys() & got.keys():
+            max_delta = max(max_delta, abs(ref[key] - got[key]))
+    return {
+        "parity_f1": round(2 * tp / (2 * tp + fp + fn), 3) if tp + fp + fn else 1.0,
+        "max_score_delta": round(max_delta, 3)
+    }
+
+
+def check_parity(
+    report: Dict[str, Dict[str, Any]],
+    min_f1: float = MIN_PARITY_F1,
+    max_score_delta: float = MAX_SCORE_DELTA
+):
+    """Raise AssertionError naming every backend outside the tolerances."""
+    failures = [
+        f"{backend}: F1={r['parity_f1']:.3f} (min {min_f1}), "
+        f"score delta={r['max_score_delta']:.3f} (max {max_score_delta})"
+        for backend, r in report.items()
+        if r["parity_f1"] < min_f1 or r["max_score_delta"] > max_score_delta
+    ]
+    assert not failures, "GLiNER backend parity failed - " + "; ".join(failures)
+
+
+def compare_backends(
+    model_name: str,
+    texts: List[str],
+    labels: List[str],
+    backends: List[str],
+    runs: int = 5
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Entity parity against torch plus mean latency per backend.
+
+    Parity is the F1 of (text, label) pairs against the torch output; the
+    max score delta is taken over entities both backends found.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    reference: Optional[List[Dict[str, float]]] = None
+
+    for backend in ["torch"] + [b for b in backends if b != "torch"]:
+        model = load_gliner(model_name, backend)
+        predictions = [model.predict_entities(t, labels) for t in texts]  # warm-up + parity sample
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            for t in texts:
+                model.predict_entities(t, labels)
+        latency_ms = (time.perf_counter() - start) * 1000 / (runs * len(texts))
+
+        found = [{(e["text"], e["label"]): e["score"] for e in p} for p in predictions]
+        if reference is None:
+            reference = found
+        results[backend] = {"latency_ms": round(latency_ms, 1), **entity_parity(reference, found)}
+    return results
+
+
+if __name__ == "__main__":
+    # Parity math and tolerances (no models needed)
+    ref = [{("AWS", "organization"): 0.91, ("John Doe", "person"): 0.88}]
+    assert entity_parity(ref, ref) == {"parity_f1": 1.0, "max_score_delta": 0.0}
+    drifted = [{("AWS", "organization"): 0.80, ("Doe", "person"): 0.6}]
+    assert entity_parity(ref, drifted) == {"parity_f1": 0.5, "max_score_delta": 0.11}
+    check_parity({"onnx": {"parity_f1": 0.95, "max_score_delta": 0.05}})
+    try:
+        check_parity({"onnx-int8": {"parity_f1": 0.5, "max_score_delta": 0.11}})
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("check_parity accepted F1=0.5")
+
+    texts = [
+        "I met with John Doe from AWS yesterday. We discussed their Datadog setup and Salesforce integration.",
+        "Sarah from Acme Corp in Berlin wants a demo of the analytics product before March 3rd.",
+        "Please email michael.chen@globex.com or call +1 415 555 0100 about the HubSpot migration service.",
+    ]
+    labels = ["person", "email", "phone number", "organization", "location", "date", "product", "service"]
+
+    print(f"Benchmarking {settings.GLINER_MODEL_NAME} on CPU...")
+    report = compare_backends(settings.GLINER_MODEL_NAME, texts, labels, ["onnx", "onnx-int8"])
+    base = report["torch"]["latency_ms"]
+    for backend, r in report.items():
+        print(f"  {backend:>9}: {r['latency_ms']:7.1f} ms/text ({base / r['latency_ms']:.2f}x)  "
+              f"parity F1={r['parity_f1']:.3f}  max score delta={r['max_score_delta']:.3f}")
+
+    check_parity(report)
+    print("Parity: OK")
@@ -1,9 +1,14 @@
 from typing import List, Dict, Optional
-from gliner import GLiNER
 from app.modules.core.domain import EntityExtractor, ExtractedEntity
+from app.modules.extraction.chunking import chunk_text, merge_spans
+from app.modules.extraction.competitors import (
+    DEFAULT_ALIASES, CompetitorCatalog, CompetitorEntry, get_competitor_catalog
+)
+from app.modules.extraction.gliner_onnx import load_gliner
 from app.core.config import settings
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import random
+import time
 
 
 class GLiNERService(EntityExtractor):
@@ -13,10 +18,21 @@ class GLiNERService(EntityExtractor):
     """
     
     def __init__(self):
-        print(f"Loading GLiNER model: {settings.GLINER_MODEL_NAME}...")
-        self.model = GLiNER.from_pretrained(settings.GLINER_MODEL_NAME)
+        print(f"Loading GLiNER model: {settings.GLINER_MODEL_NAME} ({settings.GLINER_BACKEND})...")
+        self.backend = settings.GLINER_BACKEND
+        try:
+            self.model = load_gliner(settings.GLINER_MODEL_NAME, self.backend)
+        except Exception as e:
+            if self.backend == "torch":
+                raise
+            print(f"[GLiNER] {self.backend} backend unavailable ({e}) - falling back to torch")
+            self.backend = "torch"
+            self.model = load_gliner(settings.GLINER_MODEL_NAME, "torch")
         self.labels = ["person", "email", "phone number", "organization", "location", "date", "product", "service"]
         self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.chunk_words = settings.GLINER_CHUNK_WORDS
+        self.batch_size = settings.GLINER_BATCH_SIZE
+        self.last_extract_stats: Dict = {}
         print("GLiNER model loaded.")
         
         # Rule-based hint templates by entity type
@@ -110,19 +126,67 @@ class GLiNERService(EntityExtractor):
                 "quick_response": "Slack is popular, but we offer deeper business tool integration."
             }
         }
+        
+        # Competitor catalog (Aho-Corasick, whole words) and battlecard matcher:
+        # templates above, overridden by battlecards from the catalog file
+        self.competitors = get_competitor_catalog()
+        cards = {k: CompetitorEntry(k, DEFAULT_ALIASES.get(k, []), v) for k, v in self.BATTLECARD_DB.items()}
+        cards.update({e.key: e for e in self.competitors.entries.values() if e.battlecard})
+        self._battlecards = CompetitorCatalog(list(cards.values()))
 
     def extract(self, text: str) -> List[ExtractedEntity]:
-        """Extract entities from text using GLiNER."""
-        entities = self.model.predict_entities(text, self.labels)
+        """
+        Extract entities from text using GLiNER.
+        
+        Text longer than the model window is split into overlapping,
+        sentence-aligned chunks that are scored in batches; spans are mapped
+        back to offsets in `text` and merged.
+        """
+        chunks = chunk_text(text, max_words=self.chunk_words)
+        if not chunks:
+            return []
         
+        start = time.perf_counter()
         extracted = []
-        for e in entities:
-            extracted.append(ExtractedEntity(
-                text=e["text"],
-                label=e["label"],
-                score=e["score"]
-            ))
-        return extracted
+        for i in range(0, len(chunks), self.batch_size):
+            batch = chunks[i:i + self.batch_size]
+            for chunk, entities in zip(batch, self._predict_batch([c.text for c in batch])):
+                for e in entities:
+                    extracted.append(ExtractedEntity(
+                        text=e["text"],
+                        label=e["label"],
+                        score=e["score"],
+                        start=chunk.start + e["start"] if e.get("start") is not None else None,
+                        end=chunk.start + e["end"] if e.get("end") is not None else None
+                    ))
+        elapsed = time.perf_counter() - start
+        
+        merged = merge_spans(extracted) if len(chunks) > 1 else extracted
+        words = sum(c.words for c in chunks)
+        self.last_extract_stats = {
+            "chunks": len(chunks),
+            "words": words,
+            "seconds": round(elapsed, 3),
+            "words_per_second": round(words / elapsed, 1) if elapsed > 0 else 0.0,
+            "entities": len(merged)
+        }
+        if len(chunks) > 1:
+            print(f"[GLiNER] {len(chunks)} chunks / {words} words in {elapsed:.2f}s "
+                  f"({self.last_extract_stats['words_per_second']:.0f} words/s), {len(merged)} entities")
+        return merged
+    
+    def _predict_batch(self, texts: List[str]) -> List[List[Dict]]:
+        """Score several texts in one forward pass where the GLiNER version allows it."""
+        if len(texts) == 1:
+            return [self.model.predict_entities(texts[0], self.labels)]
+        try:
+            if hasattr(self.model, "inference"):
+                return self.model.inference(texts, self.labels, batch_size=self.batch_size)
+            if hasattr(self.model, "batch_predict_entities"):
+                return self.model.batch_predict_entities(texts, self.labels)
+        except TypeError:
+            pass
+        return [self.model.predict_entities(t, self.labels) for t in texts]
     
     def analyze_sentiment(self, text: str) -> Dict:
         """Analyze sentiment using VADER."""
@@ -213,16 +277,14 @@ class GLiNERService(EntityExtractor):
                 "quick_response": "One-liner response"
             }
         """
-        key = competitor_name.lower().strip()
-        
-        # Check for exact or partial match
-        for db_key, data in self.BATTLECARD_DB.items():
-            if db_key in key or key in db_key:
-                return {
-                    "competitor": competitor_name,
-                    "counter_points": data["counter_points"],
-                    "quick_response": data["quick_response"]
-                }
+        # Whole-word match on name or alias ("AWS Lambda" -> aws, but not "sap" in "asap")
+        entry = self._battlecards.lookup(competitor_name)
+        if entry is not None:
+            return {
+                "competitor": competitor_name,
+                "counter_points": entry.battlecard["counter_points"],
+                "quick_response": entry.battlecard["quick_response"]
+            }
         
         # Generic battlecard for unknown competitors
         return {
@@ -235,28 +297,27 @@ class GLiNERService(EntityExtractor):
             "quick_response": f"Let's discuss how we compare to {competitor_name} specifically for your needs."
         }
     
-    def detect_competitors(self, entities: List[ExtractedEntity]) -> List[str]:
+    def detect_competitors(self, entities: List[ExtractedEntity], text: str = "") -> List[str]:
         """
-        Detect known competitors from entity list.
+        Detect known competitors from entity list, and optionally by scanning
+        raw transcript text (catches mentions the model did not tag).
+        Competitors whose name is a common word ("slack", "monday") need a
+        capitalized entity or an explicit alias.
         
-        Returns list of competitor names found.
+        Returns list of competitor names found (one per competitor).
         """
-        known_competitors = [
-            "aws", "amazon", "salesforce", "datadog", "microsoft", 
-            "hubspot", "slack", "google", "oracle", "sap", "zendesk",
-            "freshworks", "zoho", "monday", "asana", "jira", "atlassian"
-        ]
-        
-        detected = []
+        detected: Dict[str, str] = {}  # catalog key -> name as mentioned
         for entity in entities:
             if entity.label in ["organization", "product", "service"]:
-                name_lower = entity.text.lower()
-                for comp in known_competitors:
-                    if comp in name_lower or name_lower in comp:
-                        detected.append(entity.text)
-                        break
+                entry = self.competitors.match_entity(entity.text)
+                if entry is not None:
+                    detected.setdefault(entry.key, entity.text)
+        
+        if text:
+            for match in self.competitors.mentions(text):
+                detected.setdefault(match.competitor.key, match.text)
         
-        return detected
+        return list(detected.values())
 
 
 if __name__ == "__main__":
@@ -271,6 +332,12 @@ if __name__ == "__main__":
     for r in entities:
         print(f"  {r.label} -> {r.text} ({r.score:.2f})")
     
+    # Long transcript: entities past the model window must survive
+    long_text = " ".join(["We reviewed the quarterly roadmap and the onboarding plan."] * 120) + " " + text
+    late = service.extract(long_text)
+    print("\n--- Long transcript ---")
+    print(f"  {len(late)} entities, stats: {service.last_extract_stats}")
+    
     # Test hint generation
     print("\n--- Hints ---")
     hints = service.generate_hints(entities, text)
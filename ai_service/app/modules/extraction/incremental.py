@@ -0,0 +1,185 @@
+"""
+Incremental Entity Extraction.
+
+The insight loop used to re-run GLiNER on the last 3000 characters of the
+transcript every cycle, re-scoring mostly unchanged text. This tracks which
+transcript segments were already processed, runs the extractor only on new
+ones (plus a short overlap of preceding text for context), and folds the
+results into a de-duplicated session entity index.
+
+Usage:
+    tracker = IncrementalEntityExtractor(gliner_service)
+    new_entities = tracker.update(state.transcript_segments)   # only new text
+    tracker.index.entities(limit=20)                           # session view
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.modules.core.domain import EntityExtractor, ExtractedEntity
+
+
+def normalize_entity(text: str) -> str:
+    """Case/whitespace/punctuation-insensitive key for de-duplication."""
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s&@.+-]", "", text.casefold())).strip(" .")
+
+
+@dataclass
+class IndexedEntity:
+    """One distinct entity seen during the session."""
+    text: str  # surface form with the best score
+    label: str
+    count: int
+    first_seen: float
+    last_seen: float
+    best_score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "label": self.label,
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "score": round(self.best_score, 3)
+        }
+
+
+class EntityIndex:
+    """De-duplicated entities keyed by (label, normalized text)."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], IndexedEntity] = {}
+        self._lock = threading.Lock()
+
+    def merge(self, entities: List[ExtractedEntity], seen_at: Optional[float] = None):
+        seen_at = seen_at if seen_at is not None else time.time()
+        with self._lock:
+            for e in entities:
+                norm = normalize_entity(e.text)
+                if not norm:
+                    continue
+                key = (e.label, norm)
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = IndexedEntity(
+                        text=e.text.strip(),
+                        label=e.label,
+                        count=1,
+                        first_seen=seen_at,
+                        last_seen=seen_at,
+                        best_score=e.score
+                    )
+                    continue
+                entry.count += 1
+                entry.first_seen = min(entry.first_seen, seen_at)
+                entry.last_seen = max(entry.last_seen, seen_at)
+                if e.score > entry.best_score:
+                    entry.best_score = e.score
+                    entry.text = e.text.strip()
+
+    def entities(self, limit: Optional[int] = None, min_score: float = 0.0) -> List[IndexedEntity]:
+        """Most recently mentioned first, then most frequent."""
+        with self._lock:
+            items = [e for e in self._entries.values() if e.best_score >= min_score]
+        items.sort(key=lambda e: (e.last_seen, e.count), reverse=True)
+        return items[:limit] if limit else items
+
+    def as_extracted(self, limit: Optional[int] = None) -> List[ExtractedEntity]:
+        """Index entries as ExtractedEntity (for hint / competitor helpers)."""
+        return [ExtractedEntity(text=e.text, label=e.label, score=e.best_score) for e in self.entities(limit)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IncrementalEntityExtractor:
+    """
+    Runs an EntityExtractor over transcript segments it has not seen yet.
+
+    Args:
+        extractor: any EntityExtractor (GLiNERService)
+        context_chars: preceding transcript text prepended for context;
+                       entities found entirely inside it are ignored, since
+                       they were counted when that text was new
+    """
+
+    def __init__(self, extractor: EntityExtractor, context_chars: int = 200):
+        self.extractor = extractor
+        self.context_chars = context_chars
+        self.index = EntityIndex()
+
+        self._processed: set = set()  # id() of segments already extracted
+        self._lock = threading.Lock()
+
+        # Stats
+        self.calls = 0
+        self.chars_processed = 0
+        self.extract_seconds = 0.0
+
+    @staticmethod
+    def _text(seg: Any) -> str:
+        return (seg.get("text", "") if isinstance(seg, dict) else str(seg)).strip()
+
+    def update(self, segments: List[Any]) -> List[ExtractedEntity]:
+        """
+        Extract entities from unprocessed segments and merge them into the index.
+
+        Segments may be inserted out of order (late chunks), so every run of
+        consecutive new segments is extracted with the text before it as context.
+
+        Returns the entities found in the new text.
+        """
+        with self._lock:
+            segments = list(segments)
+            runs: List[Tuple[int, int]] = []  # [start, end) indices of new segments
+            for i, seg in enumerate(segments):
+                if id(seg) in self._processed:
+                    continue
+                if runs and runs[-1][1] == i:
+                    runs[-1] = (runs[-1][0], i + 1)
+                else:
+                    runs.append((i, i + 1))
+
+            found: List[ExtractedEntity] = []
+            for start, end in runs:
+                found.extend(self._extract_run(segments, start, end))
+                self._processed.update(id(seg) for seg in segments[start:end])
+            return found
+
+    def _extract_run(self, segments: List[Any], start: int, end: int) -> List[ExtractedEntity]:
+        new_text = " ".join(t for t in (self._text(s) for s in segments[start:end]) if t)
+        if not new_text:
+            return []
+
+        context = ""
+        if self.context_chars and start > 0:
+            context = " ".join(self._text(s) for s in segments[max(0, start - 3):start])[-self.context_chars:]
+        text = f"{context} {new_text}" if context else new_text
+        boundary = len(text) - len(new_text)
+
+        t = time.perf_counter()
+        entities = self.extractor.extract(text)
+        self.extract_seconds += time.perf_counter() - t
+        self.calls += 1
+        self.chars_processed += len(text)
+
+        # Drop entities wholly inside the context (already counted)
+        entities = [e for e in entities if e.end is None or e.end > boundary]
+
+        first = segments[start]
+        seen_at = first.get("timestamp") if isinstance(first, dict) else None
+        self.index.merge(entities, seen_at)
+        return entities
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "chars_processed": self.chars_processed,
+            "extract_seconds": round(self.extract_seconds, 2),
+            "segments_processed": len(self._processed),
+            "unique_entities": len(self.index)
+        }
@@ -0,0 +1,250 @@
+"""
+Battlecard Pre-warming - battlecards for known competitors, built ahead of calls.
+
+Competitors in the catalog (COMPETITORS setting) are detected live, but their
+battlecards were only generated on demand, mid-call, after 3-10 s of
+Gemini + DuckDuckGo + crawl latency. A background scheduler now builds a
+battlecard (with web research) for every configured competitor:
+
+- missing cards are built as soon as the server starts, but outside the
+  window only BATTLECARD_PREWARM_DAYTIME_LIMIT per check (every 10 min),
+  so a cold start during business hours doesn't compete with live
+  sessions for the Gemini quota and crawler
+- cards older than BATTLECARD_REFRESH_AGE are rebuilt during the
+  BATTLECARD_PREWARM_HOURS window (off-hours)
+
+Builds always redo the web research (and rewrite the research cache),
+since a card due for refresh would find its research just as old. Each
+build is stored as a new version in the prewarmed_battlecards table
+(the last few are kept) and in memory, so a live detection is served
+instantly. Builds run as "battlecard_prewarm" background jobs.
+
+Usage:
+    prewarmer = get_battlecard_prewarmer()
+    prewarmer.start()                    # server startup
+    card = prewarmer.get("Salesforce")   # None if not pre-warmed
+"""
+
+import asyncio
+import copy
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.modules.extraction.competitors import get_competitor_catalog
+from app.modules.intelligence.rate_limiter import PRIORITY_PERIODIC, RateLimitDeferred
+from app.modules.workflow.jobs import Job, get_job_manager
+
+
+def parse_hours(window: str) -> Tuple[int, int]:
+    """"1-6" -> (1, 6): local hours [start, end); may wrap midnight ("22-5")."""
+    start, _, end = window.partition("-")
+    return int(start) % 24, int(end or start) % 24
+
+
+class BattlecardPrewarmer:
+    """
+    Builds, refreshes and serves battlecards for a fixed competitor list.
+
+    Args:
+        competitors: lowercase competitor names
+        refresh_age: seconds before a stored card is rebuilt
+        hours: local-time window for refreshes, e.g. "1-6"
+        check_interval: seconds between schedule checks
+        daytime_limit: missing cards built per check outside the window (0 = wait for it)
+    """
+
+    def __init__(
+        self,
+        competitors: List[str],
+        refresh_age: float = 86400.0,
+        hours: str = "1-6",
+        check_interval: float = 600.0,
+        daytime_limit: int = 2
+    ):
+        self.competitors = competitors
+        self.refresh_age = refresh_age
+        self.hours = parse_hours(hours)
+        self.check_interval = check_interval
+        self.daytime_limit = max(0, daytime_limit)
+
+        self._cards: Dict[str, Dict[str, Any]] = {}  # competitor -> {battlecard, version, refreshed_at}
+        self._gemini = None
+        self._task: Optional[asyncio.Task] = None
+        self._job: Optional[Job] = None
+
+        # Stats
+        self.served = 0
+        self.built = 0
+        self.failed = 0
+
+    # ---------- serving ----------
+
+    def match(self, name: str) -> Optional[str]:
+        """The configured competitor a detected name refers to ("AWS Lambda" -> "aws")."""
+        entry = get_competitor_catalog().lookup(name)
+        return entry.key if entry is not None and entry.key in self._cards else None
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """A copy of the latest pre-warmed battlecard for name, or None."""
+        competitor = self.match(name)
+        if competitor is None:
+            return None
+        entry = self._cards[competitor]
+        battlecard = copy.deepcopy(entry["battlecard"])
+        battlecard["competitor"] = name
+        battlecard["prewarmed"] = {"version": entry["version"], "refreshed_at": entry["refreshed_at"]}
+        self.served += 1
+        return battlecard
+
+    # ---------- building ----------
+
+    async def load(self):
+        """Load the latest stored version of every card."""
+        db = await get_database()
+        for row in await db.get_latest_prewarmed_battlecards():
+            refreshed_at = datetime.fromisoformat(str(row["created_at"])).replace(tzinfo=timezone.utc).timestamp()
+            self._cards[row["competitor_key"]] = {
+                "battlecard": row["battlecard"],
+                "version": row["version"],
+                "refreshed_at": refreshed_at
+            }
+        print(f"[Prewarm] Loaded {len(self._cards)} pre-warmed battlecards")
+
+    def _in_window(self) -> bool:
+        start, end = self.hours
+        hour = datetime.now().hour
+        return start <= hour < end if start <= end else hour >= start or hour < end
+
+    def due(self) -> List[str]:
+        """Competitors to build now: all missing + stale ones off-hours, a few missing ones otherwise."""
+        now = time.time()
+        missing = [c for c in self.competitors if c not in self._cards]
+        if not self._in_window():
+            return missing[:self.daytime_limit]
+        stale = [c for c in self.competitors
+                 if c in self._cards and now - self._cards[c]["refreshed_at"] > self.refresh_age]
+        return missing + stale
+
+    async def build(self, competitor: str) -> bool:
+        """Generate, research and store one battlecard; False if skipped."""
+        from app.modules.intelligence.gemini_service import GeminiService
+        from app.modules.intelligence.web_insight_service import get_web_insight_service
+
+        if self._gemini is None:
+            self._gemini = GeminiService()
+
+        battlecard = await self._gemini.get_battlecard(competitor_name=competitor, priority=PRIORITY_PERIODIC)
+        if battlecard.get("fallback"):
+            return False
+        try:
+            # Live research: a scheduled refresh would otherwise get the (equally old) cached entry
+            battlecard["web_research"] = await get_web_insight_service().get_battlecard_research(
+                competitor, refresh=True
+            )
+        except Exception as e:
+            print(f"[Prewarm] Web research error for {competitor}: {e}")
+            battlecard["web_research"] = {"negative_findings": [], "sources": []}
+
+        db = await get_database()
+        version = await db.save_prewarmed_battlecard(competitor, battlecard)
+        self._cards[competitor] = {"battlecard": battlecard, "version": version, "refreshed_at": time.time()}
+        self.built += 1
+        print(f"[Prewarm] {competitor} v{version} ready")
+        return True
+
+    async def refresh(self, job: Job, competitors: List[str]) -> Dict[str, Any]:
+        """Job body: build each competitor's card in turn."""
+        built, skipped = [], []
+        for i, competitor in enumerate(competitors, 1):
+            await job.set_stage(f"{competitor} ({i}/{len(competitors)})")
+            try:
+                ok = await self.build(competitor)
+            except RateLimitDeferred:
+                ok = False  # quota busy (live session) - next check retries
+            except Exception as e:
+                print(f"[Prewarm] {competitor} failed: {e}")
+                self.failed += 1
+                ok = False
+            (built if ok else skipped).append(competitor)
+        return {"built": built, "skipped": skipped}
+
+    def submit(self, competitors: Optional[List[str]] = None) -> Optional[Job]:
+        """Start a pre-warm job (None if one is already running or nothing is due)."""
+        if self._job is not None and not self._job.done:
+            return None
+        competitors = self.due() if competitors is None else competitors
+        if not competitors:
+            return None
+        self._job = get_job_manager().submit("battlecard_prewarm", lambda job: self.refresh(job, competitors))
+        return self._job
+
+    # ---------- scheduling ----------
+
+    async def _run(self):
+        from app.modules.intelligence.gemini_service import GeminiService
+
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"[Prewarm] Could not load stored battlecards: {e}")
+        if self._gemini is None:
+            self._gemini = GeminiService()
+        if not self._gemini.model:
+            print("[Prewarm] Gemini not configured - serving stored cards only")
+            return
+        while True:
+            self.submit()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            print(f"[Prewarm] Scheduler started for {len(self.competitors)} competitors "
+                  f"(refresh window {self.hours[0]}:00-{self.hours[1]}:00)")
+
+    async def stop(self):
+        """Stop the scheduler and cancel a running pre-warm job (before the DB / crawler close)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._job is not None and not self._job.done:
+            await get_job_manager().cancel(self._job.id)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "competitors": len(self.competitors),
+            "ready": len(self._cards),
+            "served": self.served,
+            "built": self.built,
+            "failed": self.failed,
+            "running_job": self._job.id if self._job is not None and not self._job.done else None,
+            "cards": {
+                c: {"version": e["version"], "age_hours": round((now - e["refreshed_at"]) / 3600, 1)}
+                for c, e in sorted(self._cards.items())
+            }
+        }
+
+
+# Global prewarmer
+_prewarmer: Optional[BattlecardPrewarmer] = None
+
+
+def get_battlecard_prewarmer() -> BattlecardPrewarmer:
+    """Get or create the battlecard prewarmer for the competitor catalog."""
+    global _prewarmer
+    if _prewarmer is None:
+        _prewarmer = BattlecardPrewarmer(
+            list(get_competitor_catalog().entries),
+            refresh_age=settings.BATTLECARD_REFRESH_AGE,
+            hours=settings.BATTLECARD_PREWARM_HOURS,
+            daytime_limit=settings.BATTLECARD_PREWARM_DAYTIME_LIMIT
+        )
+    return _prewarmer
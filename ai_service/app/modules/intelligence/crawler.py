@@ -0,0 +1,350 @@
+"""
+Async Web Crawler - pooled HTTP client for deep research.
+
+WebInsightService fetched each page with trafilatura.fetch_url() inside
+asyncio.to_thread: one thread and one fresh connection per URL, no overall
+time budget and no cap on response size. Pages are now fetched on the event
+loop through one shared aiohttp session:
+
+- connection pool with a per-host cap (keep-alive reuse across calls)
+- crawl() takes a total deadline; pages not done by then are dropped
+- bodies larger than max_bytes are cut off (the prefix is still extracted)
+- conditional requests: ETag / Last-Modified are remembered per URL and a
+  304 reuses the previously extracted text
+- text extraction (trafilatura, CPU-bound) runs in a process pool, started
+  lazily with "spawn" - forking the server after torch / model threads exist
+  can deadlock the children
+
+Usage:
+    crawler = get_crawler()
+    results = await crawler.crawl(["https://..."], deadline=10)
+    texts = [r.text for r in results]
+"""
+
+import asyncio
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from app.core.config import settings
+
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+
+
+def extract_main_text(html: str) -> str:
+    """Main article text of a page (runs in the extraction process pool)."""
+    if trafilatura is None or not html:
+        return ""
+    # Keep target_language='en' as it happens after fetch
+    return trafilatura.extract(html, include_comments=False, favor_precision=True, target_language='en') or ""
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of fetching and extracting one URL."""
+    url: str
+    status: int = 0  # HTTP status (0: not fetched)
+    text: str = ""  # extracted main text
+    not_modified: bool = False  # 304 - text reused from the previous fetch
+    truncated: bool = False  # body exceeded max_bytes
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+class AsyncCrawler:
+    """
+    Pooled aiohttp fetcher + process-pool extractor.
+
+    Args:
+        per_host: concurrent connections per host
+        max_connections: total pooled connections
+        timeout: per-request timeout (s)
+        max_bytes: response bodies are cut off after this many bytes
+        extract_workers: extraction processes
+        extract: picklable html -> text function (default: trafilatura)
+        validator_cache_size: URLs whose ETag / Last-Modified are remembered
+    """
+
+    USER_AGENT = "Mozilla/5.0 (compatible; MeetingMonitor/1.0; +research)"
+
+    def __init__(
+        self,
+        per_host: int = 2,
+        max_connections: int = 20,
+        timeout: float = 8.0,
+        max_bytes: int = 2_000_000,
+        extract_workers: int = 2,
+        extract: Callable[[str], str] = extract_main_text,
+        validator_cache_size: int = 256
+    ):
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.extract_workers = extract_workers
+        self.extract = extract
+        self.validator_cache_size = validator_cache_size
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # url -> (etag, last_modified, extracted text)
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], str]]" = OrderedDict()
+
+        # Stats
+        self.fetched = 0
+        self.not_modified = 0
+        self.truncated = 0
+        self.failed = 0
+        self.deadline_dropped = 0
+        self.bytes_downloaded = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": self.USER_AGENT, "Accept": "text/html,application/xhtml+xml"}
+            )
+        return self._session
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.extract_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _extract(self, html: str) -> str:
+        """Run self.extract in the process pool (skipped without trafilatura)."""
+        if self.extract is extract_main_text and trafilatura is None:
+            return ""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.extract, html)
+
+    async def _fetch(self, url: str, timeout: float) -> CrawlResult:
+        """GET one URL (conditionally, if seen before) and extract its text."""
+        start = time.monotonic()
+        result = CrawlResult(url=url)
+        headers = {}
+        known = self._validators.get(url)
+        if known:
+            etag, last_modified, _ = known
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        try:
+            async with self._get_session().get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                allow_redirects=True
+            ) as response:
+                result.status = response.status
+                if response.status == 304 and known:
+                    self._validators.move_to_end(url)
+                    result.text = known[2]
+                    result.not_modified = True
+                    self.not_modified += 1
+                    return result
+                if response.status != 200:
+                    result.error = f"HTTP {response.status}"
+                    return result
+                content_type = response.headers.get("Content-Type", "")
+                if content_type and "html" not in content_type and "xml" not in content_type:
+                    result.error = f"Skipped content type {content_type}"
+                    return result
+                if (response.content_length or 0) > self.max_bytes:
+                    result.truncated = True  # still read the first max_bytes
+
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                    if len(body) >= self.max_bytes:
+                        del body[self.max_bytes:]
+                        result.truncated = True
+                        break
+                self.bytes_downloaded += len(body)
+                html = body.decode(response.charset or "utf-8", errors="replace")
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+            result.text = await self._extract(html)
+            self.fetched += 1
+            if result.truncated:
+                self.truncated += 1
+            if etag or last_modified:
+                self._validators[url] = (etag, last_modified, result.text)
+                self._validators.move_to_end(url)
+                while len(self._validators) > self.validator_cache_size:
+                    self._validators.popitem(last=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            self.failed += 1
+            print(f"[Crawler] {url}: {result.error}")
+        finally:
+            result.elapsed = round(time.monotonic() - start, 3)
+        return result
+
+    async def crawl(self, urls: List[str], deadline: Optional[float] = None) -> List[CrawlResult]:
+        """
+        Fetch and extract urls concurrently, all within `deadline` seconds.
+
+        Results are in input order; pages still running at the deadline are
+        cancelled and returned with error="deadline".
+        """
+        if not urls:
+            return []
+        deadline = deadline or self.timeout
+        end = time.monotonic() + deadline
+        tasks = [asyncio.create_task(self._fetch(url, self.timeout)) for url in urls]
+        done, pending = await asyncio.wait(tasks, timeout=max(0.0, end - time.monotonic()))
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            self.deadline_dropped += len(pending)
+
+        results = []
+        for url, task in zip(urls, tasks):
+            if task in done:
+                results.append(task.result())
+            else:
+                results.append(CrawlResult(url=url, error="deadline", elapsed=round(deadline, 3)))
+        return results
+
+    async def close(self):
+        """Close pooled connections and the extraction processes."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fetched": self.fetched,
+            "not_modified": self.not_modified,
+            "truncated": self.truncated,
+            "failed": self.failed,
+            "deadline_dropped": self.deadline_dropped,
+            "bytes_downloaded": self.bytes_downloaded,
+            "validators": len(self._validators)
+        }
+
+
+# Global crawler (one connection pool / process pool per server)
+_crawler: Optional[AsyncCrawler] = None
+
+
+def get_crawler() -> AsyncCrawler:
+    """Get or create the shared crawler."""
+    global _crawler
+    if _crawler is None:
+        _crawler = AsyncCrawler(
+            per_host=settings.CRAWL_PER_HOST,
+            max_connections=settings.CRAWL_MAX_CONNECTIONS,
+            timeout=settings.CRAWL_TIMEOUT,
+            max_bytes=settings.CRAWL_MAX_BYTES,
+            extract_workers=settings.CRAWL_EXTRACT_WORKERS
+        )
+    return _crawler
+
+
+async def close_crawler():
+    """Release the shared crawler's connections and processes (server shutdown)."""
+    global _crawler
+    if _crawler is not None:
+        await _crawler.close()
+        _crawler = None
+
+
+if __name__ == "__main__":
+    # Self-check against a local stand-in server (no internet needed)
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    ARTICLE = (
+        "<html><head><title>Datadog review</title></head><body><article><h1>Datadog review</h1>"
+        + "".join(f"<p>Paragraph {i}: the pricing is expensive and the billing is hard to predict "
+                  f"for teams that scale hosts up and down during the month.</p>" for i in range(8))
+        + "</article></body></html>"
+    ).encode()
+    active = {"now": 0, "peak": 0}
+    counter_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with counter_lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            try:
+                if self.path.startswith("/slow"):
+                    time.sleep(3)
+                if self.path == "/article" and self.headers.get("If-None-Match") == '"v1"':
+                    self.send_response(304)
+                    self.send_header("ETag", '"v1"')
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = ARTICLE * 20 if self.path == "/huge" else ARTICLE
+                time.sleep(0.2)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with counter_lock:
+                    active["now"] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    async def main():
+        crawler = AsyncCrawler(per_host=2, timeout=5.0, max_bytes=len(ARTICLE) * 2)
+        try:
+            results = await crawler.crawl([f"{base}/article"] + [f"{base}/page{i}" for i in range(5)] + [f"{base}/huge"])
+            assert all(r.status == 200 and "expensive" in r.text for r in results), results
+            assert results[-1].truncated
+            assert active["peak"] <= 2, f"per-host cap exceeded: {active['peak']}"
+            print(f"First crawl: {len(results)} pages, peak {active['peak']} concurrent, "
+                  f"{max(r.elapsed for r in results):.2f}s slowest")
+
+            again = await crawler.crawl([f"{base}/article"])
+            assert again[0].not_modified and again[0].text == results[0].text
+
+            start = time.monotonic()
+            late = await crawler.crawl([f"{base}/slow", f"{base}/page9"], deadline=1.0)
+            assert late[0].error == "deadline" and late[1].status == 200
+            assert time.monotonic() - start < 1.5
+            print(f"OK {crawler.stats()}")
+        finally:
+            await crawler.close()
+            server.shutdown()
+
+    asyncio.run(main())
@@ -1,5 +1,15 @@
 import google.generativeai as genai
 from app.core.config import settings
+from app.modules.intelligence.response_cache import get_response_cache
+from app.modules.intelligence.rate_limiter import (
+    get_rate_limiter,
+    estimate_tokens,
+    RateLimitDeferred,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_PERIODIC
+)
+from app.modules.intelligence.json_stream import StreamingJSONParser, strip_json_fences
+from typing import Callable, Optional
 import json
 import logging
 
@@ -8,6 +18,8 @@ class GeminiService:
         self.api_key = settings.GEMINI_API_KEY
         self.model_name = settings.GEMINI_MODEL
         self.use_mock = False  # Disabled for production demo - use real Gemini API
+        self.cache = get_response_cache()  # shared across instances
+        self.limiter = get_rate_limiter("gemini")  # shared quota across instances
         
         if self.api_key:
             try:
@@ -21,6 +33,84 @@ class GeminiService:
             print("[Gemini] Warning: GEMINI_API_KEY is not set. Using Mock Insights.")
             self.model = None
 
+    async def _generate_text(
+        self,
+        contents,
+        key_parts: list,
+        ttl: float = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        generate_content_async() through the shared response cache and rate limiter.
+        
+        key_parts identify the request (prompt, image, ...); identical requests
+        within the TTL, or while one is in flight, share a single API call.
+        Periodic calls raise RateLimitDeferred instead of waiting more than
+        LLM_PERIODIC_MAX_WAIT for quota.
+        
+        With on_text the answer is streamed and on_text receives each chunk as
+        it arrives; a cached or coalesced answer is passed in one piece.
+        """
+        key = self.cache.make_key(self.model_name, *key_parts)
+        streamed = False
+        
+        async def call():
+            nonlocal streamed
+            prompt_text = contents if isinstance(contents, str) else " ".join(c for c in contents if isinstance(c, str))
+            estimated = estimate_tokens(prompt_text) + 300  # + typical JSON answer
+            max_wait = settings.LLM_PERIODIC_MAX_WAIT if priority >= PRIORITY_PERIODIC else None
+            if not await self.limiter.acquire(estimated, priority, max_wait):
+                raise RateLimitDeferred(f"No Gemini quota within {max_wait}s")
+            try:
+                if on_text is None:
+                    response = await self.model.generate_content_async(contents)
+                    text = response.text
+                else:
+                    response = await self.model.generate_content_async(contents, stream=True)
+                    parts = []
+                    async for chunk in response:
+                        try:
+                            piece = chunk.text
+                        except ValueError:  # chunk without text parts (e.g. finish reason only)
+                            continue
+                        parts.append(piece)
+                        streamed = True
+                        on_text(piece)
+                    text = "".join(parts)
+            except Exception as e:
+                if "429" in str(e):
+                    self.limiter.note_rate_limited()
+                raise
+            usage = getattr(response, "usage_metadata", None)
+            self.limiter.record(getattr(usage, "total_token_count", 0) or estimated, estimated)
+            return text
+        
+        text = await self.cache.get_or_compute(key, call, ttl)
+        if on_text is not None and not streamed:
+            on_text(text)
+        return text
+
+    @staticmethod
+    def _stream_items(key: str, on_item: Optional[Callable[[int, str], None]], limit: int = None):
+        """
+        on_text callback that parses the streamed JSON answer and calls
+        on_item(index, value) for each completed string element of array `key`.
+        """
+        if on_item is None:
+            return None
+        parser = StreamingJSONParser()
+        count = 0
+        
+        def on_text(piece: str):
+            nonlocal count
+            for k, value in parser.feed(piece):
+                if k == key and isinstance(value, str) and (limit is None or count < limit):
+                    on_item(count, value)
+                    count += 1
+        
+        return on_text
+
     # MOCK DATA STORE
     MOCK_DB = {
         "microsoft azure": {
@@ -104,9 +194,9 @@ class GeminiService:
         """
 
         try:
-            response = await self.model.generate_content_async(prompt)
+            response_text = await self._generate_text(prompt, [prompt], settings.LLM_RESEARCH_CACHE_TTL)
             # Simple cleanup to ensure we get JSON if model adds backticks
-            text = response.text.strip()
+            text = response_text.strip()
             if text.startswith("```json"):
                 text = text[7:]
             if text.endswith("```"):
@@ -181,9 +271,14 @@ GUIDELINES FOR HINTS:
             image = Image.open(io.BytesIO(image_data))
             
             # Generate content with image + text
-            response = await self.model.generate_content_async([prompt, image])
+            response_text = await self._generate_text(
+                [prompt, image],
+                [prompt, screenshot_base64],
+                settings.LLM_CACHE_TTL,
+                PRIORITY_PERIODIC
+            )
             
-            text = response.text.strip()
+            text = response_text.strip()
             # Clean up JSON from markdown formatting
             if text.startswith("```json"):
                 text = text[7:]
@@ -245,7 +340,8 @@ GUIDELINES FOR HINTS:
         self,
         transcript: str,
         entities: list = None,
-        max_hints: int = 3
+        max_hints: int = 3,
+        on_hint: Optional[Callable[[int, str], None]] = None
     ) -> dict:
         """
         Generate smart sales hints from transcript using Gemini AI.
@@ -254,6 +350,8 @@ GUIDELINES FOR HINTS:
             transcript: Recent transcript text
             entities: Optional list of entities already extracted
             max_hints: Maximum number of hints to generate
+            on_hint: Optional callback(index, hint), called as soon as each
+                     hint has streamed in (before the full answer is parsed)
             
         Returns:
             {
@@ -304,18 +402,16 @@ RULES:
 """
         
         try:
-            response = await self.model.generate_content_async(prompt)
-            text = response.text.strip()
-            
-            # Clean up JSON from markdown
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
+            # An unchanged transcript window (no new speech) hits the cache
+            response_text = await self._generate_text(
+                prompt,
+                [prompt],
+                settings.LLM_CACHE_TTL,
+                PRIORITY_PERIODIC,
+                on_text=self._stream_items("quick_hints", on_hint, max_hints)
+            )
             
-            result = json.loads(text.strip())
+            result = json.loads(strip_json_fences(response_text))
             
             # Ensure required fields
             if "quick_hints" not in result:
@@ -329,6 +425,14 @@ RULES:
             print(f"[Gemini] Generated {len(result['quick_hints'])} hints (sentiment: {result.get('sentiment', 'unknown')})")
             return result
             
+        except RateLimitDeferred as e:
+            print(f"[Gemini] Hints deferred: {e}")
+            return {
+                "quick_hints": [],
+                "detected_entities": entities or [],
+                "sentiment": "neutral",
+                "deferred": True
+            }
         except Exception as e:
             print(f"[Gemini] Hint generation error: {e}")
             return {
@@ -341,7 +445,9 @@ RULES:
         self,
         competitor_name: str,
         our_product: str = "our solution",
-        context: str = ""
+        context: str = "",
+        priority: int = PRIORITY_INTERACTIVE,
+        on_point: Optional[Callable[[int, str], None]] = None
     ) -> dict:
         """
         Generate competitive battlecard when a competitor is mentioned.
@@ -350,6 +456,9 @@ RULES:
             competitor_name: Name of the competitor (e.g., "AWS", "Salesforce")
             our_product: Name of our product/feature
             context: Additional context from the conversation
+            priority: PRIORITY_INTERACTIVE (user request) or PRIORITY_PERIODIC (insight loop)
+            on_point: Optional callback(index, counter_point), called as each
+                      counter-point streams in
             
         Returns:
             {
@@ -357,6 +466,7 @@ RULES:
                 "counter_points": ["Point 1", "Point 2", "Point 3"],
                 "quick_response": "One-liner for salesman"
             }
+            Canned cards (no model / API error) are marked "fallback": True.
         """
         if not self.model:
             # Mock battlecard for demo
@@ -367,7 +477,8 @@ RULES:
                     "We offer dedicated support vs their ticket system",
                     "Our solution integrates better with existing tools"
                 ],
-                "quick_response": f"While {competitor_name} is popular, we excel in customer success"
+                "quick_response": f"While {competitor_name} is popular, we excel in customer success",
+                "fallback": True
             }
         
         prompt = f"""You are a competitive intelligence expert helping a salesperson.
@@ -396,18 +507,17 @@ RULES:
 """
         
         try:
-            response = await self.model.generate_content_async(prompt)
-            text = response.text.strip()
+            # Keyed by competitor, not prompt: the triggering context snippet
+            # differs between /battlecard and the insight loop
+            response_text = await self._generate_text(
+                prompt,
+                ["battlecard", competitor_name.strip().casefold(), our_product],
+                settings.LLM_RESEARCH_CACHE_TTL,
+                priority,
+                on_text=self._stream_items("counter_points", on_point)
+            )
             
-            # Clean up JSON from markdown formatting
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            
-            result = json.loads(text.strip())
+            result = json.loads(strip_json_fences(response_text))
             
             # Ensure required fields
             if "counter_points" not in result:
@@ -420,6 +530,8 @@ RULES:
             print(f"[Gemini] Battlecard generated for {competitor_name}")
             return result
             
+        except RateLimitDeferred:
+            raise  # periodic caller retries next cycle
         except Exception as e:
             # Handle Rate Limit (429) specifically
             if "429" in str(e):
@@ -431,14 +543,16 @@ RULES:
                         "Our implementation is 2x faster",
                         "No hidden costs/fees"
                     ],
-                    "quick_response": f"While {competitor_name} is good, we offer better ROI."
+                    "quick_response": f"While {competitor_name} is good, we offer better ROI.",
+                    "fallback": True
                 }
                 
             logging.error(f"Error generating battlecard for {competitor_name}: {e}")
             return {
                 "competitor": competitor_name,
                 "counter_points": [f"We offer unique value vs {competitor_name}"],
-                "quick_response": f"Let me explain how we differ from {competitor_name}"
+                "quick_response": f"Let me explain how we differ from {competitor_name}",
+                "fallback": True
             }
 
 
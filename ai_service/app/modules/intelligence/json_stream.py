@@ -0,0 +1,169 @@
+"""
+Incremental JSON parsing for streamed LLM responses.
+
+Gemini / Ollama answers are one JSON object, possibly wrapped in markdown
+fences. Waiting for the whole completion before json.loads() delays the
+first hint by the full generation time. StreamingJSONParser scans chunks as
+they arrive and reports each array element (e.g. one entry of
+"quick_hints" or "counter_points") and each top-level value the moment its
+closing quote / bracket is seen.
+
+Usage:
+    parser = StreamingJSONParser()
+    async for chunk in response:
+        for key, value in parser.feed(chunk.text):
+            if key == "quick_hints":
+                push(value)
+    result = parser.result()  # full object, or None if it never closed
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+
+def strip_json_fences(text: str) -> str:
+    """Remove ```json ... ``` wrapping around a model answer."""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+class StreamingJSONParser:
+    """
+    Scanner for a single JSON object delivered in arbitrary chunks.
+
+    feed() returns (key, value) events:
+    - (array_key, element) when an element of an array completes (strings,
+      numbers, objects - anything that closes inside the array)
+    - (key, value) when a top-level member's non-array value completes
+
+    Text before the first "{" (markdown fences, preamble) is ignored.
+    """
+
+    def __init__(self):
+        self._buf: List[str] = []  # characters of the object seen so far
+        self._started = False
+        self._done = False
+
+        self._in_string = False
+        self._escape = False
+        self._stack: List[dict] = []  # open containers, innermost last
+        self._token_start: Optional[int] = None  # start of the current string / scalar
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def _emit(self, start: int, end: int, events: List[Tuple[str, Any]]):
+        """A value spanning buf[start:end] just completed inside the innermost container."""
+        frame = self._stack[-1]
+        try:
+            value = json.loads("".join(self._buf[start:end]))
+        except ValueError:
+            return
+        if frame["kind"] == "arr":
+            events.append((frame["key"], value))
+        elif len(self._stack) == 1 and not isinstance(value, list):
+            events.append((frame["member"], value))
+
+    def _close_scalar(self, end: int, events: List[Tuple[str, Any]]):
+        if self._token_start is not None:
+            self._emit(self._token_start, end, events)
+            self._token_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Scan more text; returns the values completed by it."""
+        events: List[Tuple[str, Any]] = []
+        if self._done or not chunk:
+            return events
+
+        if not self._started:
+            brace = chunk.find("{")
+            if brace < 0:
+                return events
+            chunk = chunk[brace:]
+            self._started = True
+
+        for ch in chunk:
+            i = len(self._buf)
+            self._buf.append(ch)
+            frame = self._stack[-1] if self._stack else None
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if frame["kind"] == "obj" and frame["expect_key"]:
+                        frame["member"] = json.loads("".join(self._buf[self._token_start:i + 1]))
+                    else:
+                        self._emit(self._token_start, i + 1, events)
+                    self._token_start = None
+            elif ch == '"':
+                self._in_string = True
+                self._token_start = i
+            elif ch in "{[":
+                key = None
+                if frame is not None:
+                    key = frame["member"] if frame["kind"] == "obj" else frame["key"]
+                self._stack.append({
+                    "kind": "obj" if ch == "{" else "arr",
+                    "key": key,  # member key this container is the value of
+                    "member": None,  # current member key (objects)
+                    "expect_key": ch == "{",
+                    "start": i
+                })
+            elif ch in "}]":
+                self._close_scalar(i, events)
+                closed = self._stack.pop()
+                if not self._stack:
+                    self._done = True
+                    break
+                self._emit(closed["start"], i + 1, events)
+            elif ch == ":":
+                frame["expect_key"] = False
+            elif ch == ",":
+                self._close_scalar(i, events)
+                if frame["kind"] == "obj":
+                    frame["expect_key"] = True
+            elif not ch.isspace() and self._token_start is None:
+                self._token_start = i  # number / true / false / null
+        return events
+
+    def result(self) -> Optional[dict]:
+        """The complete object, or None if it has not closed (or is invalid)."""
+        if not self._done:
+            return None
+        try:
+            return json.loads("".join(self._buf))
+        except ValueError:
+            return None
+
+
+if __name__ == "__main__":
+    answer = (
+        '```json\n{\n  "quick_hints": [\n    "Ask about their Datadog renewal date",\n'
+        '    "Mention the \\"pay per host\\" pricing",\n    "Offer a two-squad pilot"\n  ],\n'
+        '  "sentiment": "positive",\n  "key_topic": "observability costs",\n'
+        '  "scores": [1, 2.5, {"a": [true, null]}],\n  "research_topics": ["Datadog", "New Relic"]\n}\n```'
+    )
+    # Feed in small uneven chunks, as a stream would deliver it
+    parser = StreamingJSONParser()
+    events = []
+    for i in range(0, len(answer), 7):
+        for event in parser.feed(answer[i:i + 7]):
+            events.append(event)
+            print(f"  after {i + 7:3d} chars: {event}")
+
+    expected = json.loads(strip_json_fences(answer))
+    assert parser.result() == expected
+    assert [v for k, v in events if k == "quick_hints"] == expected["quick_hints"]
+    assert ("sentiment", "positive") in events and ("research_topics", "New Relic") in events
+    print("Streaming parse OK")
@@ -5,12 +5,16 @@ Uses the Ollama API with vision models to analyze documents (PDF, PPTX, DOCX).
 Supports OCR through vision model capabilities.
 """
 
+import asyncio
+import json
 import requests
 import base64
 import os
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from pathlib import Path
 
+from app.modules.intelligence.rate_limiter import get_rate_limiter, estimate_tokens, PRIORITY_INTERACTIVE
+
 # PDF processing
 try:
     import fitz  # PyMuPDF
@@ -47,6 +51,73 @@ class OllamaDocumentService:
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.timeout = 120  # Longer timeout for document analysis
+        self.limiter = get_rate_limiter("ollama")
+    
+    async def _post_generate(self, payload: Dict[str, Any], timeout: float) -> requests.Response:
+        """POST /api/generate through the shared Ollama rate limiter, off the event loop."""
+        estimated = estimate_tokens(payload.get("prompt", ""))
+        await self.limiter.acquire(estimated, PRIORITY_INTERACTIVE)
+        response = await asyncio.to_thread(
+            requests.post,
+            f"{self.base_url}/api/generate",
+            json=payload,
+            timeout=timeout
+        )
+        if response.status_code == 200:
+            data = response.json()
+            used = data.get("prompt_eval_count", 0) + data.get("eval_count", 0)
+            self.limiter.record(used or estimated, estimated)
+        elif response.status_code == 429:
+            self.limiter.note_rate_limited()
+        return response
+    
+    async def _stream_generate(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        on_text: Callable[[str], None]
+    ) -> Tuple[int, str]:
+        """
+        POST /api/generate with stream=True through the rate limiter.
+        
+        Ollama answers with one JSON line per generated fragment; on_text is
+        called on the event loop with each fragment as it arrives.
+        Returns (status_code, full_text).
+        """
+        estimated = estimate_tokens(payload.get("prompt", ""))
+        await self.limiter.acquire(estimated, PRIORITY_INTERACTIVE)
+        loop = asyncio.get_running_loop()
+        
+        def run() -> Tuple[int, str, int]:
+            with requests.post(
+                f"{self.base_url}/api/generate",
+                json={**payload, "stream": True},
+                timeout=timeout,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    return response.status_code, "", 0
+                parts = []
+                used = 0
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    piece = data.get("response", "")
+                    if piece:
+                        parts.append(piece)
+                        loop.call_soon_threadsafe(on_text, piece)
+                    if data.get("done"):
+                        used = data.get("prompt_eval_count", 0) + data.get("eval_count", 0)
+                        break
+                return 200, "".join(parts), used
+        
+        status, text, used = await asyncio.to_thread(run)
+        if status == 200:
+            self.limiter.record(used or estimated, estimated)
+        elif status == 429:
+            self.limiter.note_rate_limited()
+        return status, text
     
     async def analyze_document(
         self, 
@@ -207,15 +278,14 @@ class OllamaDocumentService:
     async def _analyze_image(self, image_b64: str, prompt: str) -> str:
         """Analyze an image using Ollama vision model."""
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
+            response = await self._post_generate(
+                {
                     "model": self.model,
                     "prompt": prompt,
                     "images": [image_b64],
                     "stream": False
                 },
-                timeout=self.timeout
+                self.timeout
             )
             
             if response.status_code == 200:
@@ -226,17 +296,24 @@ class OllamaDocumentService:
         except Exception as e:
             return f"Vision analysis error: {str(e)}"
     
-    async def _generate_text(self, prompt: str) -> str:
-        """Generate text using Ollama."""
+    async def _generate_text(self, prompt: str, on_text: Optional[Callable[[str], None]] = None) -> str:
+        """Generate text using Ollama (streamed to on_text when given)."""
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
+            if on_text is not None:
+                status, text = await self._stream_generate(
+                    {"model": self.model, "prompt": prompt},
+                    self.timeout,
+                    on_text
+                )
+                return text if status == 200 else f"API error: {status}"
+            
+            response = await self._post_generate(
+                {
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False
                 },
-                timeout=self.timeout
+                self.timeout
             )
             
             if response.status_code == 200:
@@ -247,11 +324,44 @@ class OllamaDocumentService:
         except Exception as e:
             return f"Generation error: {str(e)}"
     
-    async def generate_key_insights(self, text_content: str, num_insights: int = 3) -> List[str]:
+    async def generate_key_insights(
+        self,
+        text_content: str,
+        num_insights: int = 3,
+        on_insight: Optional[Callable[[int, str], None]] = None
+    ) -> List[str]:
         """
         Generate key actionable insights from document content.
         Returns a list of one-line insights for overlay display.
+        
+        With on_insight the answer is streamed and on_insight(index, insight)
+        is called as soon as each line is complete.
         """
+        insights: List[str] = []
+        lines_seen = 0
+        pending = ""
+        
+        def take_line(line: str):
+            nonlocal lines_seen
+            line = line.strip()
+            # Parse insights - take first num_insights non-empty lines
+            if not line or lines_seen >= num_insights:
+                return
+            lines_seen += 1
+            # Remove common prefixes like "1.", "- ", "• "
+            cleaned = line.lstrip('0123456789.-•) ').strip()
+            if cleaned and len(cleaned) > 5:
+                insights.append(cleaned)
+                if on_insight is not None:
+                    on_insight(len(insights) - 1, cleaned)
+        
+        def on_text(piece: str):
+            nonlocal pending
+            pending += piece
+            *complete, pending = pending.split('\n')
+            for line in complete:
+                take_line(line)
+        
         try:
             prompt = f"""Based on the following document content, extract exactly {num_insights} key insights.
 Each insight should be:
@@ -266,28 +376,24 @@ Document content:
 
 Your {num_insights} insights:"""
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                },
-                timeout=60
-            )
+            if on_insight is not None:
+                status, _ = await self._stream_generate({"model": self.model, "prompt": prompt}, 60, on_text)
+                take_line(pending)  # last line has no trailing newline
+            else:
+                response = await self._post_generate(
+                    {
+                        "model": self.model,
+                        "prompt": prompt,
+                        "stream": False
+                    },
+                    60
+                )
+                status = response.status_code
+                if status == 200:
+                    for line in response.json().get("response", "").split('\n'):
+                        take_line(line)
             
-            if response.status_code == 200:
-                raw_response = response.json().get("response", "")
-                # Parse insights - take first num_insights non-empty lines
-                lines = [line.strip() for line in raw_response.split('\n') if line.strip()]
-                # Clean up any numbering or bullets
-                insights = []
-                for line in lines[:num_insights]:
-                    # Remove common prefixes like "1.", "- ", "• "
-                    cleaned = line.lstrip('0123456789.-•) ').strip()
-                    if cleaned and len(cleaned) > 5:
-                        insights.append(cleaned)
-                
+            if status == 200:
                 # Ensure we have exactly num_insights
                 while len(insights) < num_insights:
                     insights.append("Document analyzed successfully.")
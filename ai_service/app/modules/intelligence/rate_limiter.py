@@ -0,0 +1,297 @@
+"""
+Client-side LLM Rate Limiting - token buckets + priority scheduling.
+
+GeminiService only learned about quota after a 429. Every Gemini / Ollama
+call now acquires from a shared limiter first: one token bucket for requests
+per minute and one for (estimated) tokens per minute. Waiters are served in
+priority order, so a user-triggered battlecard (PRIORITY_INTERACTIVE) jumps
+ahead of queued periodic hints (PRIORITY_PERIODIC), and periodic callers can
+give up after max_wait instead of piling up behind the quota.
+
+adaptive_interval() lets periodic loops stretch their cadence so their
+observed usage stays under a share of the quota, and backs off further after
+a 429.
+
+Usage:
+    limiter = get_rate_limiter("gemini")
+    if await limiter.acquire(estimate_tokens(prompt), PRIORITY_PERIODIC, max_wait=10):
+        response = ...
+        limiter.record(actual_tokens)
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+PRIORITY_INTERACTIVE = 0  # user-triggered (battlecard button, document analysis)
+PRIORITY_PERIODIC = 10  # insight loop hints / vision / research
+
+
+class RateLimitDeferred(Exception):
+    """A low-priority call gave up waiting for quota (skip this cycle)."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Continuous-refill token bucket.
+
+    Args:
+        per_minute: refill rate; <= 0 means unlimited
+        capacity: burst size (defaults to one minute of refill)
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, n: float) -> float:
+        """Seconds until n tokens are available (0 if now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        n = min(n, self.capacity)  # oversized requests wait for a full bucket
+        return 0.0 if self.level >= n else (n - self.level) / self.rate
+
+    def take(self, n: float):
+        """Consume n tokens; the level may go negative (debt repaid by refill)."""
+        if self.unlimited:
+            return
+        self._refill()
+        self.level -= n
+
+
+class RateLimiter:
+    """
+    Requests-per-minute + tokens-per-minute limiter with a priority queue.
+
+    Args:
+        name: provider name for logs
+        requests_per_minute: RPM quota (<= 0: unlimited)
+        tokens_per_minute: TPM quota (<= 0: unlimited)
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float = 0):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+        self._waiters: List[list] = []  # heap of [priority, seq, tokens, future]
+        self._seq = itertools.count()
+        self._pump_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._blocked_until = 0.0  # server said 429 - hold everything until then
+        self._backoff = 1.0  # interval multiplier after 429s, decays on success
+        self._recent: Deque[Tuple[float, int]] = deque()  # (time, tokens) of the last minute
+
+        # Stats
+        self.granted = 0
+        self.deferred = 0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+
+    # ---------- acquisition ----------
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(
+            self.requests.wait_time(1),
+            self.tokens.wait_time(tokens),
+            self._blocked_until - time.monotonic()
+        )
+
+    def _grant(self, tokens: int):
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.granted += 1
+        self._recent.append((time.monotonic(), tokens))
+
+    async def acquire(
+        self,
+        tokens: int = 0,
+        priority: int = PRIORITY_PERIODIC,
+        max_wait: Optional[float] = None
+    ) -> bool:
+        """
+        Wait for quota for one request of ~tokens tokens.
+
+        Returns False if max_wait elapsed first (the caller should skip).
+        """
+        if not self._waiters and self._wait_time(tokens) <= 0:
+            self._grant(tokens)
+            return True
+
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), tokens, future])
+        self._kick()
+        try:
+            if max_wait is None:
+                await future
+            else:
+                await asyncio.wait_for(asyncio.shield(future), max_wait)
+        except asyncio.TimeoutError:
+            if future.cancel():  # still queued - give up the slot
+                self.deferred += 1
+                return False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        finally:
+            self.wait_seconds += time.monotonic() - start
+        return True
+
+    def _kick(self):
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        self._wake.set()
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+
+    async def _pump(self):
+        """Grant queued requests in priority order as the buckets refill."""
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():  # gave up (max_wait) or cancelled
+                heapq.heappop(self._waiters)
+                continue
+            wait = self._wait_time(tokens)
+            if wait <= 0:
+                heapq.heappop(self._waiters)
+                self._grant(tokens)
+                future.set_result(None)
+                continue
+            # Sleep until the head can go, or until a new (maybe higher-priority) waiter arrives
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    # ---------- feedback ----------
+
+    def record(self, actual_tokens: int, estimated_tokens: int = 0):
+        """Correct the token bucket with the provider-reported usage."""
+        delta = actual_tokens - estimated_tokens
+        if delta:
+            self.tokens.take(delta)
+            if self._recent:
+                t, n = self._recent[-1]
+                self._recent[-1] = (t, max(0, n + delta))
+        self._backoff = max(1.0, self._backoff * 0.8)
+
+    def note_rate_limited(self, retry_after: float = 10.0):
+        """The provider returned 429: pause all requests and stretch intervals."""
+        self.rate_limited += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._backoff = min(8.0, self._backoff * 2)
+        print(f"[RateLimit] {self.name}: 429 - pausing {retry_after:.0f}s (backoff x{self._backoff:.1f})")
+
+    # ---------- adaptive cadence ----------
+
+    def utilization(self) -> float:
+        """Share of the per-minute quota used over the last 60 s (max of RPM / TPM)."""
+        cutoff = time.monotonic() - 60.0
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent.popleft()
+        used = 0.0
+        if not self.requests.unlimited:
+            used = len(self._recent) / self.requests.per_minute
+        if not self.tokens.unlimited:
+            used = max(used, sum(n for _, n in self._recent) / self.tokens.per_minute)
+        return used
+
+    def adaptive_interval(
+        self,
+        base_interval: float,
+        current_interval: float,
+        target_share: float = 0.7,
+        max_stretch: float = 8.0
+    ) -> float:
+        """
+        Next interval for a periodic caller.
+
+        Usage scales with 1 / interval, so stretching the current interval by
+        utilization / target_share brings usage back to target_share of quota.
+        Never shorter than base_interval; multiplied by the 429 backoff.
+        """
+        u = self.utilization()
+        interval = max(base_interval, current_interval * u / target_share)
+        return min(interval * self._backoff, base_interval * max_stretch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "granted": self.granted,
+            "deferred": self.deferred,
+            "rate_limited": self.rate_limited,
+            "queued": sum(1 for w in self._waiters if not w[3].done()),
+            "wait_seconds": round(self.wait_seconds, 2),
+            "utilization": round(self.utilization(), 3),
+            "backoff": round(self._backoff, 2)
+        }
+
+
+# Process-wide limiters, one per provider
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """Get or create the shared limiter for a provider ("gemini" or "ollama")."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        if name == "gemini":
+            limiter = RateLimiter(name, settings.GEMINI_RPM, settings.GEMINI_TPM)
+        elif name == "ollama":
+            limiter = RateLimiter(name, settings.OLLAMA_RPM, settings.OLLAMA_TPM)
+        else:
+            raise KeyError(f"No rate limit configured for '{name}'")
+        _limiters[name] = limiter
+    return limiter
+
+
+if __name__ == "__main__":
+    async def main():
+        limiter = RateLimiter("test", requests_per_minute=60)  # 1 request/s after the burst
+        limiter.requests.level = 0  # start with an empty bucket
+        order = []
+
+        async def call(label: str, priority: int, max_wait: Optional[float] = None):
+            if await limiter.acquire(priority=priority, max_wait=max_wait):
+                order.append(label)
+            else:
+                order.append(f"{label}:skipped")
+
+        tasks = [asyncio.create_task(call(f"hint{i}", PRIORITY_PERIODIC)) for i in range(3)]
+        await asyncio.sleep(0.1)
+        tasks.append(asyncio.create_task(call("battlecard", PRIORITY_INTERACTIVE)))
+        tasks.append(asyncio.create_task(call("hint-late", PRIORITY_PERIODIC, max_wait=0.5)))
+        await asyncio.gather(*tasks)
+
+        print(f"Order: {order}")
+        assert order.index("battlecard") <= 1 and "hint-late:skipped" in order
+        print(f"Stats: {limiter.stats()}")
+        print(f"Adaptive interval at {limiter.utilization():.2f} utilization: "
+              f"{limiter.adaptive_interval(5.0, 5.0):.1f}s (base 5.0s)")
+
+    asyncio.run(main())
@@ -0,0 +1,256 @@
+"""
+Web Research Cache - on-disk, TTL + stale-while-revalidate, size-bounded.
+
+WebInsightService ran three DuckDuckGo queries and up to two page crawls
+every time a competitor came up, and the same research was redone in every
+meeting (and by /battlecard and the insight loop separately). Results are
+now stored in a small SQLite file keyed by the normalized entity and the
+queries used:
+
+- fresh (younger than ttl): served straight from disk
+- stale (younger than ttl + stale_ttl): served immediately, and refreshed
+  in the background for the next caller
+- older: treated as a miss
+
+The least recently used entries are evicted beyond max_entries. Concurrent
+misses for one key are coalesced: the first caller claims the key and runs
+the research, later callers join() and await its result.
+
+Usage:
+    cache = get_research_cache()
+    key = cache.make_key("negative_insights", entity, *queries)
+    cached = cache.get(key)          # (value, fresh) or None
+    cache.set(key, value)
+    cache.revalidate(key, compute)   # background refresh, once per key
+    inflight = cache.join(key)       # future of a running miss, or None
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+def normalize(text: str) -> str:
+    """Case- and whitespace-insensitive form of an entity or query."""
+    return " ".join(text.casefold().split())
+
+
+class ResearchCache:
+    """
+    SQLite-backed JSON cache with freshness, staleness and LRU eviction.
+
+    Args:
+        path: SQLite file (":memory:" for a throwaway cache)
+        ttl: seconds an entry is fresh
+        stale_ttl: further seconds a stale entry may still be served
+        max_entries: entries kept before the least recently used are evicted
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400.0,
+        stale_ttl: float = 604800.0,
+        max_entries: int = 1000
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()  # one connection, used from worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS research_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_research_cache_accessed ON research_cache(accessed_at)")
+        self._conn.commit()
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Stats
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(kind: str, *parts: str) -> str:
+        """SHA-256 over the kind and normalized parts."""
+        h = hashlib.sha256(kind.encode("utf-8"))
+        for part in parts:
+            data = normalize(part).encode("utf-8")
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """(value, fresh) for a servable entry, else None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM research_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl + self.stale_ttl:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE research_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        fresh = now - row[1] <= self.ttl
+        if fresh:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return json.loads(row[0]), fresh
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO research_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM research_cache").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM research_cache WHERE key IN "
+                    "(SELECT key FROM research_cache ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+                self.evictions += count - self.max_entries
+            self._conn.commit()
+
+    def join(self, key: str) -> Optional[asyncio.Future]:
+        """Future of a computation already running for key (await it), or None."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        return future
+
+    def claim(self, key: str) -> asyncio.Future:
+        """Mark key as being computed; callers must release() it when done."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def release(self, key: str, value: Any):
+        """Hand value to everyone who joined key and clear the claim."""
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def revalidate(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        """Refresh an entry in the background (no-op if already refreshing)."""
+        task = self._revalidating.get(key)
+        if task is not None and not task.done():
+            return
+        self._revalidating[key] = asyncio.create_task(self._revalidate(key, compute))
+
+    async def _revalidate(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        try:
+            value = await compute()
+            if value is not None:
+                await asyncio.to_thread(self.set, key, value)
+                self.revalidations += 1
+        except Exception as e:
+            print(f"[ResearchCache] Revalidation failed: {e}")
+        finally:
+            self._revalidating.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM research_cache").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced
+        }
+
+
+# Global cache shared by every WebInsightService instance
+_research_cache: Optional[ResearchCache] = None
+
+
+def get_research_cache() -> ResearchCache:
+    """Get or create the process-wide web research cache."""
+    global _research_cache
+    if _research_cache is None:
+        _research_cache = ResearchCache(
+            settings.WEB_RESEARCH_CACHE_PATH,
+            ttl=settings.WEB_RESEARCH_CACHE_TTL,
+            stale_ttl=settings.WEB_RESEARCH_STALE_TTL,
+            max_entries=settings.WEB_RESEARCH_CACHE_SIZE
+        )
+    return _research_cache
+
+
+if __name__ == "__main__":
+    async def main():
+        cache = ResearchCache(":memory:", ttl=0.05, stale_ttl=0.2, max_entries=2)
+        key = cache.make_key("negative_insights", "  SalesForce ")
+        assert key == cache.make_key("negative_insights", "salesforce")
+        assert cache.get(key) is None
+
+        cache.set(key, [{"type": "fast", "data": {"verdict": "Mixed"}}])
+        start = time.perf_counter()
+        value, fresh = cache.get(key)
+        print(f"Fresh hit in {(time.perf_counter() - start) * 1000:.2f} ms: {value}")
+        assert fresh
+
+        await asyncio.sleep(0.1)
+        value, fresh = cache.get(key)
+        assert not fresh  # stale - serve and refresh
+
+        async def compute():
+            return [{"type": "fast", "data": {"verdict": "Negative"}}]
+
+        cache.revalidate(key, compute)
+        cache.revalidate(key, compute)  # coalesced
+        await asyncio.sleep(0.05)
+        assert cache.get(key) == ([{"type": "fast", "data": {"verdict": "Negative"}}], True)
+
+        # Concurrent misses: one computation, the other caller joins it
+        miss = cache.make_key("negative_insights", "hubspot")
+        runs = []
+
+        async def research():
+            inflight = cache.join(miss)
+            if inflight is not None:
+                return await asyncio.shield(inflight)
+            cache.claim(miss)
+            try:
+                runs.append(1)
+                await asyncio.sleep(0.02)
+                return ["result"]
+            finally:
+                cache.release(miss, ["result"])
+
+        assert await asyncio.gather(research(), research()) == [["result"], ["result"]] and len(runs) == 1
+
+        for name in ("datadog", "new relic"):
+            cache.set(cache.make_key("negative_insights", name), [])
+        assert cache.get(key) is None  # evicted (LRU, max_entries=2)
+
+        await asyncio.sleep(0.3)
+        assert cache.get(cache.make_key("negative_insights", "datadog")) is None  # past stale window
+        print(f"OK {cache.stats()}")
+
+    asyncio.run(main())
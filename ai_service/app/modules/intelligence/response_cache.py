@@ -0,0 +1,204 @@
+"""
+LLM Response Cache - content-addressed, TTL + LRU, with single-flight.
+
+The insight loop re-sent the same transcript window to Gemini every interval
+even when nobody had spoken, and battlecards for one competitor were
+generated separately by /battlecard and the insight loop. Responses are now
+keyed by a hash of (model, prompt or explicit key parts): an identical
+request within the TTL is served from memory, and identical requests that
+arrive while one is in flight await that one call instead of issuing their
+own.
+
+Only successful responses are cached; an exception is raised to every
+waiter of that flight and the next request tries again. If the caller
+running the flight is cancelled (e.g. a stopped session), its waiters are
+not: one of them runs the computation instead.
+
+Usage:
+    cache = get_response_cache()
+    key = cache.make_key(model_name, prompt)
+    text = await cache.get_or_compute(key, lambda: call_api(prompt), ttl=300)
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+class _Abandoned(Exception):
+    """The caller computing a flight was cancelled - waiters recompute."""
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache with per-entry expiry and request coalescing.
+
+    Args:
+        max_entries: entries kept before the least recently used is evicted
+        default_ttl: seconds an entry stays valid when no ttl is given
+    """
+
+    def __init__(self, max_entries: int = 256, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """SHA-256 over the parts (model name, prompt, image bytes, ...)."""
+        h = hashlib.sha256()
+        for part in parts:
+            data = part if isinstance(part, (bytes, bytearray)) else str(part).encode("utf-8")
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """Cached value, the result of an identical in-flight call, or compute()."""
+        while True:
+            value = self.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _Abandoned:
+                continue  # initiator was cancelled - take over the computation
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        except BaseException:
+            # Cancellation belongs to this caller only, not to its waiters
+            future.set_exception(_Abandoned())
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0
+        }
+
+
+# Global cache shared by every GeminiService instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the process-wide LLM response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_entries=settings.LLM_CACHE_SIZE,
+            default_ttl=settings.LLM_CACHE_TTL
+        )
+    return _response_cache
+
+
+if __name__ == "__main__":
+    async def main():
+        cache = ResponseCache(max_entries=2)
+        calls = 0
+
+        async def slow_call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "response"
+
+        key = cache.make_key("model", "prompt")
+        results = await asyncio.gather(*(cache.get_or_compute(key, slow_call) for _ in range(5)))
+        assert results == ["response"] * 5 and calls == 1
+        assert await cache.get_or_compute(key, slow_call) == "response" and calls == 1
+
+        # Cancelling the initiator must not cancel the callers coalesced onto it
+        other = cache.make_key("model", "other prompt")
+        initiator = asyncio.create_task(cache.get_or_compute(other, slow_call))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_compute(other, slow_call))
+        await asyncio.sleep(0.01)
+        initiator.cancel()
+        assert await waiter == "response" and initiator.cancelled() and calls == 3
+
+        async def failing_call():
+            await asyncio.sleep(0.01)
+            raise ValueError("quota")
+
+        failed = await asyncio.gather(*(cache.get_or_compute("bad", failing_call) for _ in range(2)),
+                                      return_exceptions=True)
+        assert all(isinstance(e, ValueError) for e in failed)
+
+        for i in range(3):
+            cache.set(cache.make_key("model", i), i)
+        assert cache.get(key) is None  # evicted (LRU, max_entries=2)
+
+        cache.set("short", "v", ttl=0.01)
+        await asyncio.sleep(0.02)
+        assert cache.get("short") is None  # expired
+        print(f"OK {cache.stats()}")
+
+    asyncio.run(main())
@@ -13,6 +13,10 @@ with warnings.catch_warnings():
     from duckduckgo_search import DDGS
 
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from app.core.config import settings
+from app.modules.intelligence.crawler import get_crawler
+from app.modules.intelligence.research_cache import get_research_cache
+from app.modules.intelligence.result_filters import filter_and_rank, extract_critical_points
 import logging
 import random
 try:
@@ -24,21 +28,91 @@ except ImportError:
 class WebInsightService:
     def __init__(self):
         self.analyzer = SentimentIntensityAnalyzer()
+        self.cache = get_research_cache()  # on-disk, shared across instances
+        self.crawler = get_crawler()  # pooled connections + extraction processes
 
-    async def get_negative_insights_stream(self, entity_text: str):
+    @staticmethod
+    def _negative_queries(entity_text: str) -> list:
+        """3 negative queries (optimized for English)."""
+        return [
+            f'"{entity_text}" problems complaints issues english',
+            f'"{entity_text}" cons downsides limitations english',
+            f'"{entity_text}" worst features reddit' 
+        ]
+
+    async def get_negative_insights_stream(self, entity_text: str, refresh: bool = False):
         """
         Generator that streams insights:
         1. Yields FAST snippets (T+1s)
         2. Yields DEEP crawl data (T+2s+)
+        
+        Research is cached on disk per (normalized entity, queries): a cached
+        result yields both updates at once, and a stale one is refreshed in
+        the background after being served. Concurrent misses for the same
+        entity share one search + crawl: later callers get its updates at
+        the end. refresh=True skips the cached entry and rewrites it.
+        """
+        key = self.cache.make_key("negative_insights", entity_text, *self._negative_queries(entity_text))
+        cached = None if refresh else await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            updates, fresh = cached
+            print(f"[Web] Cached research for: {entity_text}" + ("" if fresh else " (stale, refreshing)"))
+            if not fresh:
+                self.cache.revalidate(key, lambda: self._collect_negative_insights(entity_text))
+            for update in updates:
+                yield update
+            return
+        
+        inflight = self.cache.join(key)
+        if inflight is not None:
+            print(f"[Web] Joining in-flight research for: {entity_text}")
+            for update in await asyncio.shield(inflight):
+                yield update
+            return
+        
+        self.cache.claim(key)
+        updates = []
+        try:
+            async for update in self._negative_insights_live(entity_text):
+                updates.append(update)
+                yield update
+            if any(u.get("data") for u in updates):  # don't cache failed / empty searches
+                await asyncio.to_thread(self.cache.set, key, updates)
+        finally:
+            self.cache.release(key, updates)
+
+    async def get_battlecard_research(self, entity_text: str, refresh: bool = False) -> dict:
+        """
+        Fast + deep negative findings merged into the battlecard "web_research"
+        shape: {negative_findings, sources, verdict, negative_score}.
+        refresh=True runs the research live instead of serving the cache.
         """
+        web_insights = {"negative_findings": [], "sources": [], "verdict": ""}
+        async for update in self.get_negative_insights_stream(entity_text, refresh=refresh):
+            if update.get("type") == "fast" and update.get("data"):
+                data = update["data"]
+                web_insights["negative_findings"].append(data.get("summary", ""))
+                web_insights["sources"] = data.get("sources", [])
+                web_insights["verdict"] = data.get("verdict", "")
+                web_insights["negative_score"] = data.get("negative_score", 0)
+            elif update.get("type") == "deep" and update.get("data"):
+                data = update["data"]
+                if data.get("evidence"):
+                    web_insights["negative_findings"].extend(data["evidence"])
+                web_insights["verdict"] = data.get("verdict", web_insights.get("verdict", ""))
+        return web_insights
+
+    async def _collect_negative_insights(self, entity_text: str):
+        """Run the live research to completion (background revalidation)."""
+        updates = [u async for u in self._negative_insights_live(entity_text)]
+        return updates if any(u.get("data") for u in updates) else None
+
+    async def _negative_insights_live(self, entity_text: str):
+        """Search + crawl without the cache."""
         print(f"[Web] Starting Negative Deep Dive for: {entity_text}")
         
-        # T+0: Fire 3 Parallel Negative Queries (Optimized for English)
-        queries = [
-            f'"{entity_text}" problems complaints issues english',
-            f'"{entity_text}" cons downsides limitations english',
-            f'"{entity_text}" worst features reddit' 
-        ]
+        # T+0: Fire 3 Parallel Negative Queries
+        queries = self._negative_queries(entity_text)
         
         # Run searches in parallel
         tasks = [asyncio.to_thread(self._search_ddg, q) for q in queries]
@@ -56,51 +130,8 @@ class WebInsightService:
 
         # T+1: FAST Analysis (VADER on snippets)
         # ------------------------------------------------
-        # Filter for English-looking content (Latin Character Ratio)
-        def is_mostly_english(item):
-            text = (item.get('title', '') + " " + item.get('body', '')).strip()
-            if not text: return False
-            try:
-                # Count latin letters [a-zA-Z]
-                latin_count = sum(1 for c in text if 'a' <= c.lower() <= 'z')
-                ratio = latin_count / len(text)
-                return ratio >= 0.5
-            except:
-                return True
-
-        # Blacklist unhelpful/non-English domains
-        BLACKLIST_DOMAINS = [
-            "wikipedia.org", "login.", "signin.", "signup.", 
-            "facebook.com", "instagram.com",
-            # Chinese sites
-            "zhidao.baidu.com", "baidu.com", "zhihu.com", 
-            "weibo.com", "tieba.baidu.com", "sogou.com", "163.com",
-            # Other non-English
-            "yandex.", ".ru/", ".cn/", ".jp/"
-        ]
-        
-        # Priority domains (sorted first)
-        PRIORITY_DOMAINS = ["reddit.com", "x.com", "twitter.com", "news.ycombinator.com", "medium.com"]
-        
-        def is_useful_source(url):
-            return not any(b in url.lower() for b in BLACKLIST_DOMAINS)
-        
-        def get_priority(url):
-            """Lower number = higher priority"""
-            url_lower = url.lower()
-            for i, domain in enumerate(PRIORITY_DOMAINS):
-                if domain in url_lower:
-                    return i
-            return 100  # Default low priority
-
-        # Filter and deduplicate
-        unique_results = {r['href']: r for r in all_results 
-            if is_mostly_english(r) and is_useful_source(r['href'])
-        }.values()
-        
-        # Sort by priority (Reddit/X first)
-        sorted_results = sorted(unique_results, key=lambda r: get_priority(r['href']))
-        top_results = sorted_results[:5]
+        # English-looking, non-blacklisted, deduplicated; Reddit/X first
+        top_results = filter_and_rank(all_results, limit=5)
         
         if not top_results:
              print("[Web] No English results found after filter.")
@@ -119,7 +150,7 @@ class WebInsightService:
         
         yield {"type": "fast", "data": fast_insight}
         
-        # T+2: DEEP Crawl (Trafilatura)
+        # T+2: DEEP Crawl (aiohttp + Trafilatura extraction)
         # ------------------------------------------------
         if not trafilatura:
             print("[Web] Trafilatura not installed, skipping deep crawl.")
@@ -127,26 +158,14 @@ class WebInsightService:
 
         print(f"[Web] Deep Crawling top {len(top_results[:2])} URLs...")
         
-        crawl_tasks = [asyncio.to_thread(self._crawl_url, r['href']) for r in top_results[:2]]
-        crawled_texts = await asyncio.gather(*crawl_tasks)
+        crawled = await self.crawler.crawl([r['href'] for r in top_results[:2]], deadline=settings.CRAWL_DEADLINE)
+        crawled_texts = [c.text for c in crawled]
         
         # Filter for purely negative content / facts
         combined_text = "\n\n".join([t for t in crawled_texts if t]) # trafilatura already filtered by lang='en'
         
-        # Simple extraction of "bad" keywords lines
-        negative_keywords = [
-            "slow", "expensive", "crash", "bug", "support", "fail", "hard", 
-            "complex", "limit", "hidden", "money", "cost", "price", "down", 
-            "error", "bad", "fix", "issue", "problem", "suck", "terrible"
-        ]
-        critical_points = []
-        
-        for line in combined_text.split('\n'):
-            if len(line) > 30 and any(k in line.lower() for k in negative_keywords):
-                critical_points.append(line.strip())
-        
-        # Select unique top 3 points
-        critical_points = list(set(critical_points))[:3]
+        # Unique top 3 lines with "bad" keywords
+        critical_points = extract_critical_points(combined_text, limit=3)
         
         if critical_points:
             deep_insight = {
@@ -175,21 +194,26 @@ class WebInsightService:
             logging.error(f"DDG error for '{query}': {e}")
             return []
 
-    def _crawl_url(self, url):
-        """Download and extract text from URL"""
-        try:
-            downloaded = trafilatura.fetch_url(url)
-            if downloaded:
-                # Keep target_language='en' as it happens after fetch
-                return trafilatura.extract(downloaded, include_comments=False, favor_precision=True, target_language='en')
-        except Exception as e:
-            logging.error(f"Crawl error {url}: {e}")
-        return ""
+
+# Singleton instance (one VADER analyzer / cache handle per process)
+_web_insight_service = None
+
+def get_web_insight_service() -> WebInsightService:
+    """Get or create the web insight service."""
+    global _web_insight_service
+    if _web_insight_service is None:
+        _web_insight_service = WebInsightService()
+    return _web_insight_service
 
 if __name__ == "__main__":
     async def test():
         s = WebInsightService()
-        async for update in s.get_negative_insights_stream("Datadog"):
-            print(f"\n--- {update['type'].upper()} UPDATE ---")
-            print(update['data'])
+        for attempt in ("live", "cached"):
+            start = asyncio.get_running_loop().time()
+            async for update in s.get_negative_insights_stream("Datadog"):
+                print(f"\n--- {update['type'].upper()} UPDATE ({attempt}) ---")
+                print(update['data'])
+            print(f"[{attempt}] {asyncio.get_running_loop().time() - start:.3f}s")
+        print(s.cache.stats())
+        await s.crawler.close()
     asyncio.run(test())
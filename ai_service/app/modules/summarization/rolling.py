@@ -0,0 +1,127 @@
+"""
+Rolling Meeting Summary.
+
+Summarizing the whole transcript at /stop-session made stop latency grow with
+meeting length. This keeps a running summary while the session is live:
+transcript text accumulates in a pending window, and every time a window's
+worth of tokens closes it is summarized in the background (map step) and
+appended to the partial summaries. When the partials themselves outgrow one
+window they are compacted, so at stop time only the last open window plus
+at most one window of partials has to be merged.
+
+Usage:
+    rolling = RollingSummary(summarization_service)
+    rolling.update(state.snapshot_segments())    # background, repeatedly
+    summary = rolling.finalize(state.snapshot_segments())
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.modules.summarization.service import SummarizationService, split_by_tokens
+
+
+class RollingSummary:
+    """
+    Incremental map-reduce summary over transcript segments.
+
+    Args:
+        summarizer: the shared SummarizationService
+        window_tokens: tokens per closed window (defaults to the service's
+                       chunk size, so every window fits one model pass)
+    """
+
+    def __init__(self, summarizer: SummarizationService, window_tokens: Optional[int] = None):
+        self.summarizer = summarizer
+        self.window_tokens = window_tokens or summarizer.chunk_tokens
+
+        self.partials: List[str] = []
+        self._partial_tokens = 0
+        self._pending: List[str] = []  # segment texts in the open window
+        self._pending_tokens = 0
+        self._processed: set = set()  # id() of segments already taken in
+        self._lock = threading.Lock()
+
+        # Stats
+        self.windows_closed = 0
+        self.compactions = 0
+        self.update_seconds = 0.0
+        self.finalize_seconds = 0.0
+
+    @staticmethod
+    def _text(seg: Any) -> str:
+        return (seg.get("text", "") if isinstance(seg, dict) else str(seg)).strip()
+
+    def _take_new(self, segments: List[Any]):
+        for seg in segments:
+            if id(seg) in self._processed:
+                continue
+            self._processed.add(id(seg))
+            text = self._text(seg)
+            if text:
+                self._pending.append(text)
+                self._pending_tokens += self.summarizer.count_tokens(text)
+
+    def update(self, segments: List[Any]) -> int:
+        """
+        Take in new segments and summarize any windows that have closed.
+
+        Late (out-of-order) segments simply join the open window. Returns the
+        number of windows closed by this call.
+        """
+        with self._lock:
+            self._take_new(list(segments))
+            if self._pending_tokens < self.window_tokens:
+                return 0
+
+            start = time.perf_counter()
+            chunks = split_by_tokens(" ".join(self._pending), self.summarizer.count_tokens, self.window_tokens)
+            # The last chunk stays open unless it is already full
+            tail = chunks.pop() if chunks and self.summarizer.count_tokens(chunks[-1]) < self.window_tokens else None
+            self._pending = [tail] if tail else []
+            self._pending_tokens = self.summarizer.count_tokens(tail) if tail else 0
+
+            closed = 0
+            if chunks:
+                self._add_partials(self.summarizer.summarize_chunks(chunks))
+                closed = len(chunks)
+                self.windows_closed += closed
+            self.update_seconds += time.perf_counter() - start
+            return closed
+
+    def _add_partials(self, partials: List[str]):
+        self.partials.extend(partials)
+        self._partial_tokens += sum(self.summarizer.count_tokens(p) for p in partials)
+        # Keep the partials within one window so the final merge is one pass
+        while self._partial_tokens > self.window_tokens and len(self.partials) > 1:
+            chunks = split_by_tokens(" ".join(self.partials), self.summarizer.count_tokens, self.window_tokens)
+            self.partials = self.summarizer.summarize_chunks(chunks)
+            self._partial_tokens = sum(self.summarizer.count_tokens(p) for p in self.partials)
+            self.compactions += 1
+
+    def finalize(self, segments: List[Any]) -> str:
+        """
+        Merge the partial summaries with the last open window.
+
+        Cost is bounded by ~two windows regardless of meeting length, as long
+        as update() has kept up during the session.
+        """
+        with self._lock:
+            self._take_new(list(segments))
+            text = " ".join(self.partials + self._pending)
+
+        start = time.perf_counter()
+        summary = self.summarizer.summarize(text) if text else ""
+        self.finalize_seconds = time.perf_counter() - start
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "windows_closed": self.windows_closed,
+            "compactions": self.compactions,
+            "partial_summaries": len(self.partials),
+            "pending_tokens": self._pending_tokens,
+            "update_seconds": round(self.update_seconds, 2),
+            "finalize_seconds": round(self.finalize_seconds, 2)
+        }
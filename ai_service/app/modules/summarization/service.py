@@ -1,33 +1,155 @@
+import asyncio
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
 from transformers import pipeline
 from app.core.config import settings
 import torch
 
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# One worker: the model is not re-entrant and a second concurrent summary
+# would only compete for the same cores / GPU.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+
+
+async def run_in_summarizer_thread(fn: Callable, *args):
+    """Run a summarization call on the dedicated summarizer thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, fn, *args)
+
+
+def split_by_tokens(text: str, count_tokens: Callable[[str], int], max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most ~max_tokens model tokens, breaking between
+    sentences. Unpunctuated runs (raw ASR output) are windowed by words.
+    """
+    pieces: List[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        n = count_tokens(sentence)
+        if n <= max_tokens:
+            pieces.append(sentence)
+            continue
+        words = sentence.split()
+        step = max(1, math.ceil(len(words) / math.ceil(n * 1.1 / max_tokens)))
+        pieces.extend(" ".join(words[i:i + step]) for i in range(0, len(words), step))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        n = count_tokens(piece)
+        if current and current_tokens + n > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += n
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
 class SummarizationService:
     def __init__(self):
         # Use GPU if available, fallback to CPU
         device = 0 if torch.cuda.is_available() else -1
         device_name = "GPU" if device == 0 else "CPU"
-        
+
         print(f"Loading Summarization model: {settings.SUMMARIZATION_MODEL} on {device_name}...")
         self.summarizer = pipeline("summarization", model=settings.SUMMARIZATION_MODEL, device=device)
+        self.tokenizer = self.summarizer.tokenizer
+        self.chunk_tokens = settings.SUMMARIZATION_CHUNK_TOKENS
+        self.batch_size = settings.SUMMARIZATION_BATCH_SIZE
+        self.last_summary_stats: Dict = {}
         print(f"Summarization model loaded on {device_name}.")
 
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
     def summarize(self, text: str) -> str:
-        # BART has a limit of 1024 tokens. We should ideally chunk long text.
-        # For this MVP, we will truncate if too long, or rely on pipeline's truncation.
-        # min_length=50, max_length=150 is typical for a summary
-        
-        # Calculate dynamic max_length based on input? Or fixed?
-        # Let's use a reasonable default for meeting minutes.
+        """
+        Map-reduce summary of arbitrarily long text.
+
+        BART only sees ~1024 tokens, so the text is split on sentence
+        boundaries into token-bounded chunks, the chunks are summarized in
+        batches (map), and the joined partial summaries are summarized again
+        (reduce) - repeatedly, if they still do not fit in one window.
+        """
+        if not text.strip():
+            return text
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
         try:
-            summary_output = self.summarizer(text, max_length=500, min_length=50, do_sample=False, truncation=True)
-            return summary_output[0]['summary_text']
+            t = time.perf_counter()
+            chunks = split_by_tokens(text, self.count_tokens, self.chunk_tokens)
+            timings["split"] = time.perf_counter() - t
+
+            levels = 0
+            t = time.perf_counter()
+            while len(chunks) > 1 and levels < 4:
+                partials = self.summarize_chunks(chunks)
+                levels += 1
+                chunks = split_by_tokens(" ".join(partials), self.count_tokens, self.chunk_tokens)
+            timings["map"] = time.perf_counter() - t
+
+            # min_length=50, max_length=500 is typical for meeting minutes
+            t = time.perf_counter()
+            summary = self._summarize_batch([" ".join(chunks)], max_length=500, min_length=50)[0]
+            timings["reduce"] = time.perf_counter() - t
         except Exception as e:
             print(f"Summarization error: {e}")
             return text # Fallback to original text on failure
 
+        timings["total"] = time.perf_counter() - start
+        self.last_summary_stats = {
+            "input_chars": len(text),
+            "map_levels": levels,
+            **{f"{stage}_seconds": round(v, 3) for stage, v in timings.items()}
+        }
+        print(f"[Summarizer] {len(text)} chars, {levels} map level(s): "
+              + ", ".join(f"{stage}={v:.2f}s" for stage, v in timings.items()))
+        return summary
+
+    def summarize_chunks(self, chunks: List[str]) -> List[str]:
+        """Map step: one short partial summary per chunk, batched."""
+        return self._summarize_batch(chunks, max_length=150, min_length=20)
+
+    def _summarize_batch(self, texts: List[str], max_length: int, min_length: int) -> List[str]:
+        outputs = self.summarizer(
+            texts,
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            truncation=True,
+            batch_size=self.batch_size
+        )
+        return [o["summary_text"] for o in outputs]
+
+    async def summarize_async(self, text: str) -> str:
+        """summarize() on the dedicated summarizer thread, off the event loop."""
+        return await run_in_summarizer_thread(self.summarize, text)
+
 if __name__ == "__main__":
     print("Running Summarization Test...")
     service = SummarizationService()
     text = "Detailed meeting transcript goes here..." * 50
     print(service.summarize(text))
+
+    # Full-length meeting: well past the 1024-token window
+    sentences = [
+        "John from Acme Corp said their Datadog bill doubled this quarter.",
+        "We agreed to send a pricing proposal for the observability bundle by Friday.",
+        "Sarah raised concerns about the migration timeline and data residency in Germany.",
+        "The team wants a pilot with two squads before committing to an annual contract.",
+    ]
+    long_text = " ".join(sentences * 120)
+    print(f"\nLong transcript: {service.count_tokens(long_text)} tokens")
+    print(service.summarize(long_text))
+    print(service.last_summary_stats)
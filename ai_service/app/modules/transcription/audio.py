@@ -0,0 +1,110 @@
+"""
+In-process audio helpers for the transcription pipeline.
+
+Whisper expects mono float32 at 16 kHz; capture devices deliver their native
+rate (usually 44.1/48 kHz), so audio is converted here instead of going
+through a temp file and an ffmpeg subprocess.
+"""
+
+import io
+import wave
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:
+    resample_poly = None
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def to_mono_float32(data: np.ndarray) -> np.ndarray:
+    """Collapse (frames, channels) audio to a contiguous mono float32 vector."""
+    data = np.asarray(data)
+    if data.ndim > 1:
+        data = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+
+def resample_audio(data: np.ndarray, orig_sr: int, target_sr: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Resample mono audio to target_sr.
+
+    Uses a polyphase filter when scipy is available (proper anti-aliasing),
+    otherwise linear interpolation, which is adequate for speech going to ASR.
+    """
+    data = to_mono_float32(data)
+    if orig_sr == target_sr or len(data) == 0:
+        return data
+
+    if resample_poly is not None:
+        from math import gcd
+        g = gcd(int(orig_sr), int(target_sr))
+        return resample_poly(data, target_sr // g, orig_sr // g).astype(np.float32)
+
+    n_out = int(round(len(data) * target_sr / orig_sr))
+    x_old = np.arange(len(data), dtype=np.float64)
+    x_new = np.linspace(0, len(data) - 1, n_out)
+    return np.interp(x_new, x_old, data).astype(np.float32)
+
+
+def pcm_bytes_to_float32(data: bytes, sample_width: int = 2, channels: int = 1) -> np.ndarray:
+    """Decode raw little-endian PCM (8/16/32-bit int) into mono float32 in [-1, 1]."""
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported PCM sample width: {sample_width}")
+
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels].reshape(-1, channels)
+    return to_mono_float32(samples)
+
+
+def decode_wav_bytes(data: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Decode an in-memory WAV file to (mono float32, sample_rate).
+
+    Uses soundfile when installed (handles float WAV and other containers),
+    otherwise the stdlib wave module for integer PCM.
+    """
+    if sf is not None:
+        audio, sample_rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=False)
+        return to_mono_float32(audio), int(sample_rate)
+
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        frames = wf.readframes(wf.getnframes())
+        return pcm_bytes_to_float32(frames, wf.getsampwidth(), wf.getnchannels()), wf.getframerate()
+
+
+def load_audio(
+    audio: Union[np.ndarray, bytes, bytearray],
+    sample_rate: Optional[int] = None
+) -> np.ndarray:
+    """
+    Normalise in-memory audio to what Whisper expects (mono float32, 16 kHz).
+
+    Accepts:
+    - numpy arrays at sample_rate (defaults to 16 kHz)
+    - WAV file bytes (RIFF header, rate read from the header)
+    - raw 16-bit PCM bytes at sample_rate (defaults to 16 kHz)
+    """
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        audio = bytes(audio)
+        if audio[:4] == b"RIFF":
+            audio, sample_rate = decode_wav_bytes(audio)
+        else:
+            audio = pcm_bytes_to_float32(audio)
+
+    return resample_audio(audio, sample_rate or WHISPER_SAMPLE_RATE, WHISPER_SAMPLE_RATE)
@@ -5,13 +5,30 @@ Features:
 - GPU-accelerated transcription (large-v2 model)
 - Speaker diarization via pyannote.audio
 - Word-level timestamps with speaker alignment
+- Alignment models cached (LRU) across chunks
+- Per-stage timing breakdown (ASR, align, diarize)
+- Stable speaker IDs across chunks via a per-session SpeakerRegistry
+- In-memory input (numpy arrays, WAV/PCM bytes) - no temp file or ffmpeg per chunk
+- Batched ASR across chunks from several streams (transcribe_many)
 - Graceful fallback to CPU if CUDA fails
 """
 
 import os
+import threading
+import time
 import torch
-from typing import List, Dict, Optional, Any
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Tuple, Union
+
+import numpy as np
+
 from app.core.config import settings
+from app.modules.transcription.audio import load_audio
+from app.modules.transcription.speakers import SpeakerRegistry
+
+
+# A file path (decoded through ffmpeg), a numpy array, or WAV / raw PCM bytes
+AudioInput = Union[str, np.ndarray, bytes, bytearray]
 
 
 class TranscriptionService:
@@ -22,9 +39,20 @@ class TranscriptionService:
         self.compute_type = settings.COMPUTE_TYPE if self.device == "cuda" else "int8"
         self.model = None
         self.diarize_model = None
+        self._diarize_embeddings = True  # cleared if the pipeline can't return embeddings
+        self._batch_asr = True  # cleared if the pipeline internals don't support batching
+        self._tokenizers: Dict[str, Any] = {}  # faster-whisper tokenizers per language (batched ASR)
+        self.batched_chunks = 0  # chunks decoded through the batched forward pass
         self.hf_token = settings.HF_TOKEN
         
-        self.hf_token = settings.HF_TOKEN
+        # Alignment models keyed by (language, device), least recently used first
+        self._align_cache: "OrderedDict[Tuple[str, str], Tuple[Any, Dict]]" = OrderedDict()
+        self._align_cache_size = max(1, settings.ALIGN_MODEL_CACHE_SIZE)
+        self._align_lock = threading.Lock()
+        
+        # Stage timings: {"asr": {"count": n, "total": s}, ...} plus the last call
+        self.stage_stats: Dict[str, Dict[str, float]] = {}
+        self.last_timings: Dict[str, float] = {}
         
         # Ensure FFmpeg is available
         self._ensure_ffmpeg()
@@ -89,6 +117,13 @@ class TranscriptionService:
             
             print(f"[WhisperX] Model loaded successfully!")
             
+            # Warm the alignment model for the expected language
+            if settings.WHISPER_DEFAULT_LANGUAGE:
+                try:
+                    self._get_align_model(settings.WHISPER_DEFAULT_LANGUAGE)
+                except Exception as e:
+                    print(f"[WhisperX] Alignment warm-up skipped: {e}")
+            
             # Load diarization model if HF token available
             if self.hf_token:
                 try:
@@ -125,12 +160,70 @@ class TranscriptionService:
             else:
                 raise RuntimeError(f"WhisperX failed to load: {e}")
     
-    def transcribe(self, file_path: str) -> str:
+    def _get_align_model(self, language: str) -> Tuple[Any, Dict]:
+        """Return a cached (model, metadata) alignment pair, loading on a miss."""
+        import whisperx
+        
+        key = (language, self.device)
+        with self._align_lock:
+            cached = self._align_cache.get(key)
+            if cached:
+                self._align_cache.move_to_end(key)
+                return cached
+            
+            start = time.perf_counter()
+            model_a, metadata = whisperx.load_align_model(
+                language_code=language,
+                device=self.device
+            )
+            self._align_cache[key] = (model_a, metadata)
+            print(f"[WhisperX] Alignment model for '{language}' loaded in {time.perf_counter() - start:.1f}s")
+            
+            while len(self._align_cache) > self._align_cache_size:
+                evicted, _ = self._align_cache.popitem(last=False)
+                print(f"[WhisperX] Evicted alignment model for '{evicted[0]}'")
+            
+            return model_a, metadata
+    
+    def _record_stage(self, timings: Dict[str, float], stage: str, started: float):
+        """Accumulate the duration of one pipeline stage."""
+        elapsed = time.perf_counter() - started
+        timings[stage] = elapsed
+        stats = self.stage_stats.setdefault(stage, {"count": 0, "total": 0.0})
+        stats["count"] += 1
+        stats["total"] += elapsed
+    
+    def get_timing_stats(self) -> Dict[str, Any]:
+        """Average and last duration per stage (seconds)."""
+        return {
+            "stages": {
+                stage: {
+                    "count": int(s["count"]),
+                    "avg_seconds": round(s["total"] / s["count"], 3) if s["count"] else 0.0
+                }
+                for stage, s in self.stage_stats.items()
+            },
+            "last": {stage: round(v, 3) for stage, v in self.last_timings.items()},
+            "align_models_cached": [lang for lang, _ in self._align_cache.keys()],
+            "batched_asr": {"enabled": self._batch_asr, "chunks": self.batched_chunks}
+        }
+    
+    def _prepare_audio(self, audio: AudioInput, sample_rate: Optional[int] = None) -> Optional[np.ndarray]:
+        """Resolve any supported input to a 16 kHz mono float32 array."""
+        if isinstance(audio, str):
+            if not os.path.exists(audio):
+                print(f"[WhisperX] Warning: File not found: {audio}")
+                return None
+            import whisperx
+            return whisperx.load_audio(audio)
+        return load_audio(audio, sample_rate)
+    
+    def transcribe(self, audio: AudioInput, sample_rate: Optional[int] = None) -> str:
         """
         Basic transcription - returns plain text.
         For backwards compatibility with existing code.
         """
-        result = self.transcribe_with_speakers(file_path)
+        result = self.transcribe_with_speakers(audio, sample_rate)
         
         if not result:
             return ""
@@ -139,10 +232,34 @@ class TranscriptionService:
         texts = [seg.get("text", "") for seg in result]
         return " ".join(texts).strip()
     
-    def transcribe_with_speakers(self, file_path: str) -> List[Dict[str, Any]]:
+    def _diarize(self, audio: np.ndarray, speaker_registry: Optional[SpeakerRegistry]):
+        """Run diarization, returning (segments, {local_label: embedding} or None)."""
+        if speaker_registry is None or not self._diarize_embeddings:
+            return self.diarize_model(audio), None
+        try:
+            return self.diarize_model(audio, return_embeddings=True)
+        except TypeError:
+            # Older whisperx: no embeddings, labels stay chunk-local
+            self._diarize_embeddings = False
+            print("[WhisperX] Diarization pipeline can't return embeddings - speaker IDs are per chunk")
+            return self.diarize_model(audio), None
+    
+    def transcribe_with_speakers(
+        self,
+        audio: AudioInput,
+        sample_rate: Optional[int] = None,
+        speaker_registry: Optional[SpeakerRegistry] = None
+    ) -> List[Dict[str, Any]]:
         """
         Transcribe audio with speaker diarization.
         
+        Args:
+            audio: file path, numpy array, WAV bytes or raw 16-bit PCM bytes
+            sample_rate: rate of array / raw PCM input (default 16 kHz);
+                         ignored for files and WAV bytes
+            speaker_registry: session registry mapping this chunk's speaker
+                              labels to stable session-wide IDs
+        
         Returns:
             List of segments with speaker, text, and timestamp:
             [
@@ -150,69 +267,243 @@ class TranscriptionService:
                 {"speaker": "SPEAKER_01", "text": "Hi, how are you?", "start": 1.8, "end": 3.2},
             ]
         """
-        if not os.path.exists(file_path):
-            print(f"[WhisperX] Warning: File not found: {file_path}")
-            return []
-        
         if not self.model:
             print("[WhisperX] Error: Model not loaded")
             return []
         
         try:
-            import whisperx
+            timings: Dict[str, float] = {}
             
             # Step 1: Transcribe
-            audio = whisperx.load_audio(file_path)
+            t = time.perf_counter()
+            audio = self._prepare_audio(audio, sample_rate)
+            self._record_stage(timings, "load_audio", t)
+            if audio is None or len(audio) == 0:
+                return []
+            
+            t = time.perf_counter()
             result = self.model.transcribe(audio, batch_size=16)
+            self._record_stage(timings, "asr", t)
             
-            language = result.get("language", "en")
-            print(f"[WhisperX] Detected language: {language}")
+            return self._finish_segments(audio, result, speaker_registry, timings)
             
-            # Step 2: Align timestamps (word-level)
+        except Exception as e:
+            print(f"[WhisperX] Transcription error: {e}")
+            import traceback
+            traceback.print_exc()
+            return []
+    
+    def _finish_segments(
+        self,
+        audio: np.ndarray,
+        result: Dict[str, Any],
+        speaker_registry: Optional[SpeakerRegistry],
+        timings: Dict[str, float]
+    ) -> List[Dict[str, Any]]:
+        """Align, diarize and format one ASR result (steps 2-4)."""
+        import whisperx
+        
+        language = result.get("language", "en")
+        print(f"[WhisperX] Detected language: {language}")
+        
+        # Step 2: Align timestamps (word-level) with a cached alignment model
+        try:
+            t = time.perf_counter()
+            model_a, metadata = self._get_align_model(language)
+            result = whisperx.align(
+                result["segments"], 
+                model_a, 
+                metadata, 
+                audio, 
+                self.device,
+                return_char_alignments=False
+            )
+            self._record_stage(timings, "align", t)
+        except Exception as e:
+            print(f"[WhisperX] Alignment warning: {e}")
+        
+        # Step 3: Diarization (if available)
+        if self.diarize_model and audio is not None:
             try:
-                model_a, metadata = whisperx.load_align_model(
-                    language_code=language, 
-                    device=self.device
-                )
-                result = whisperx.align(
-                    result["segments"], 
-                    model_a, 
-                    metadata, 
-                    audio, 
-                    self.device,
-                    return_char_alignments=False
-                )
+                t = time.perf_counter()
+                diarize_segments, embeddings = self._diarize(audio, speaker_registry)
+                result = whisperx.assign_word_speakers(diarize_segments, result)
+                if embeddings:
+                    mapping = speaker_registry.assign(embeddings)
+                    SpeakerRegistry.relabel(result.get("segments", []), mapping)
+                self._record_stage(timings, "diarize", t)
             except Exception as e:
-                print(f"[WhisperX] Alignment warning: {e}")
+                print(f"[WhisperX] Diarization warning: {e}")
+        
+        self.last_timings = timings
+        print("[WhisperX] Timings: " + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items()))
+        
+        # Step 4: Format output
+        segments = result.get("segments", [])
+        output = []
+        
+        for seg in segments:
+            output.append({
+                "speaker": seg.get("speaker", "SPEAKER_00"),
+                "text": seg.get("text", "").strip(),
+                "start": seg.get("start", 0.0),
+                "end": seg.get("end", 0.0)
+            })
+        
+        return output
+    
+    def transcribe_many(
+        self,
+        items: List[Tuple[AudioInput, Optional[int]]],
+        speaker_registry: Optional[SpeakerRegistry] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Transcribe several chunks (e.g. from different remote streams) with
+        one batched ASR pass; alignment and diarization still run per chunk.
+        
+        Args:
+            items: (audio, sample_rate) pairs, as for transcribe_with_speakers
+        
+        Returns:
+            One segment list per item, in input order.
+        """
+        outputs: List[List[Dict[str, Any]]] = [[] for _ in items]
+        if not self.model or not items:
+            return outputs
+        
+        try:
+            timings: Dict[str, float] = {}
             
-            # Step 3: Diarization (if available)
-            if self.diarize_model and audio is not None:
-                try:
-                    diarize_segments = self.diarize_model(audio)
-                    result = whisperx.assign_word_speakers(diarize_segments, result)
-                except Exception as e:
-                    print(f"[WhisperX] Diarization warning: {e}")
+            t = time.perf_counter()
+            audios = [self._prepare_audio(audio, sample_rate) for audio, sample_rate in items]
+            self._record_stage(timings, "load_audio", t)
+            valid = [i for i, audio in enumerate(audios) if audio is not None and len(audio)]
             
-            # Step 4: Format output
-            segments = result.get("segments", [])
-            output = []
+            t = time.perf_counter()
+            results = self._asr_batch([audios[i] for i in valid])
+            self._record_stage(timings, "asr_batch", t)
+            print(f"[WhisperX] Batched ASR: {len(valid)} chunks in {timings['asr_batch']:.2f}s")
+        except Exception as e:
+            print(f"[WhisperX] Batch transcription error: {e}")
+            import traceback
+            traceback.print_exc()
+            return outputs
+        
+        for i, result in zip(valid, results):
+            try:
+                outputs[i] = self._finish_segments(audios[i], result, speaker_registry, dict(timings))
+            except Exception as e:
+                print(f"[WhisperX] Transcription error: {e}")
+        return outputs
+    
+    def _get_tokenizer(self, language: str):
+        """faster-whisper tokenizer for a language (built once, kept)."""
+        tokenizer = self._tokenizers.get(language)
+        if tokenizer is None:
+            from faster_whisper.tokenizer import Tokenizer
             
-            for seg in segments:
-                output.append({
-                    "speaker": seg.get("speaker", "SPEAKER_00"),
-                    "text": seg.get("text", "").strip(),
-                    "start": seg.get("start", 0.0),
-                    "end": seg.get("end", 0.0)
-                })
+            whisper = self.model.model  # faster_whisper WhisperModel behind the pipeline
+            tokenizer = Tokenizer(
+                whisper.hf_tokenizer,
+                whisper.model.is_multilingual,
+                task="transcribe",
+                language=language
+            )
+            self._tokenizers[language] = tokenizer
+        return tokenizer
+    
+    def _asr_batch(self, audios: List[np.ndarray], batch_size: int = 16) -> List[Dict[str, Any]]:
+        """
+        ASR for several 16 kHz arrays in as few model calls as possible.
+        
+        Chunks up to one Whisper window (30 s) are fed to the pipeline's
+        batched forward pass together, skipping whisperx's internal VAD split
+        (capture already cut them at speech boundaries). Each chunk's language
+        is detected (unless the pipeline has a preset language) and chunks are
+        batched per language with that language's tokenizer - transcribe()
+        resets the pipeline tokenizer after every call, so it can't be reused.
+        Longer chunks go through the regular per-chunk transcribe(); whisperx
+        builds whose pipeline internals differ disable batching for good.
+        """
+        if len(audios) <= 1 or not self._batch_asr:
+            return [self.model.transcribe(audio, batch_size=batch_size) for audio in audios]
+        
+        try:
+            from whisperx.audio import SAMPLE_RATE, N_SAMPLES
             
-            return output
+            results: List[Optional[Dict[str, Any]]] = [None] * len(audios)
+            by_language: Dict[str, List[int]] = {}
+            preset = getattr(self.model, "preset_language", None)
+            for i, audio in enumerate(audios):
+                if len(audio) > N_SAMPLES:
+                    results[i] = self.model.transcribe(audio, batch_size=batch_size)
+                else:
+                    language = preset or self.model.detect_language(audio)
+                    by_language.setdefault(language, []).append(i)
             
+            for language, batched in by_language.items():
+                previous = self.model.tokenizer
+                self.model.tokenizer = self._get_tokenizer(language)
+                try:
+                    outputs = list(self.model(
+                        ({"inputs": audios[i]} for i in batched),
+                        batch_size=batch_size,
+                        num_workers=0
+                    ))
+                finally:
+                    self.model.tokenizer = previous
+                
+                for i, out in zip(batched, outputs):
+                    text = out["text"]
+                    if isinstance(text, list):
+                        text = text[0]
+                    results[i] = {
+                        "language": language,
+                        "segments": [{
+                            "text": text,
+                            "start": 0.0,
+                            "end": round(len(audios[i]) / SAMPLE_RATE, 3)
+                        }]
+                    }
+                self.batched_chunks += len(batched)
+            return results
+        except (ImportError, AttributeError, TypeError) as e:
+            self._batch_asr = False
+            print(f"[WhisperX] Batched ASR unavailable ({e}) - transcribing chunks one by one")
         except Exception as e:
-            print(f"[WhisperX] Transcription error: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            print(f"[WhisperX] Batched ASR failed ({e}) - transcribing this batch one by one")
+        return [self.model.transcribe(audio, batch_size=batch_size) for audio in audios]
     
+    def transcribe_segments(self, audio, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        ASR-only pass over an in-memory 16 kHz float32 array.
+
+        Skips alignment and diarization - used by the streaming engine, which
+        re-transcribes a rolling window every second.
+
+        Returns:
+            {"language": "en", "segments": [{"text": ..., "start": ..., "end": ...}]}
+        """
+        if not self.model or audio is None or len(audio) == 0:
+            return {"language": language, "segments": []}
+
+        try:
+            result = self.model.transcribe(audio, batch_size=16, language=language)
+            return {
+                "language": result.get("language", language),
+                "segments": [
+                    {
+                        "text": seg.get("text", "").strip(),
+                        "start": seg.get("start", 0.0),
+                        "end": seg.get("end", 0.0)
+                    }
+                    for seg in result.get("segments", [])
+                ]
+            }
+        except Exception as e:
+            print(f"[WhisperX] Streaming transcription error: {e}")
+            return {"language": language, "segments": []}
+
     def format_transcript_with_speakers(self, segments: List[Dict[str, Any]]) -> str:
         """Format diarized segments into readable transcript."""
         if not segments:
@@ -251,3 +542,12 @@ if __name__ == "__main__":
     # service = TranscriptionService()
     # result = service.transcribe_with_speakers("test.wav")
     # print(service.format_transcript_with_speakers(result))
+    
+    # Batched ASR check: chunks from two streams must go through one forward pass
+    if os.path.exists("test.wav"):
+        service = TranscriptionService()
+        audio = service._prepare_audio("test.wav")
+        half = min(len(audio) // 2, 16000 * 20)
+        outputs = service.transcribe_many([(audio[:half], 16000), (audio[half:2 * half], 16000)])
+        print(f"Batched ASR: {[len(o) for o in outputs]} segments, stats {service.get_timing_stats()['batched_asr']}")
+        assert service.batched_chunks == 2, "batch of 2 did not reach the batched forward pass"
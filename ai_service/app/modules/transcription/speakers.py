@@ -0,0 +1,144 @@
+"""
+Session Speaker Registry - stable speaker IDs across diarized chunks.
+
+pyannote clusters each chunk on its own, so "SPEAKER_00" in one chunk can be a
+different person in the next. The registry keeps one embedding centroid per
+speaker seen in the session and maps every chunk's local labels onto those
+global IDs by cosine similarity. Global IDs are handed out in order of first
+appearance (SPEAKER_00, SPEAKER_01, ...), matching pyannote's own convention.
+
+Usage:
+    registry = SpeakerRegistry()
+    mapping = registry.assign({"SPEAKER_00": emb_a, "SPEAKER_01": emb_b})
+    # -> {"SPEAKER_00": "SPEAKER_01", "SPEAKER_01": "SPEAKER_00"}
+    segments = registry.relabel(segments, mapping)
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class SpeakerProfile:
+    """Running centroid of one session speaker."""
+    speaker_id: str
+    centroid: np.ndarray  # L2-normalised
+    observations: int = 1
+
+
+def _normalise(vec) -> Optional[np.ndarray]:
+    arr = np.asarray(vec, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(arr))
+    if arr.size == 0 or not np.isfinite(norm) or norm == 0.0:
+        return None
+    return arr / norm
+
+
+class SpeakerRegistry:
+    """
+    Per-session map from chunk-local diarization labels to global speaker IDs.
+
+    Args:
+        similarity_threshold: minimum cosine similarity to reuse a known speaker
+        max_speakers: once reached, unmatched labels join the closest speaker
+                      instead of creating a new one (None = unlimited)
+        max_weight: cap on the centroid's history weight, so it can still
+                    follow slow drift in a speaker's voice / channel
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.6,
+        max_speakers: Optional[int] = None,
+        max_weight: int = 20
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.max_speakers = max_speakers
+        self.max_weight = max(1, max_weight)
+
+        self._profiles: List[SpeakerProfile] = []
+        self._lock = threading.Lock()
+
+    def assign(self, embeddings: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Map each local label to a global speaker ID and update the centroids.
+
+        Matching is greedy on the highest similarity first, and two local
+        labels of the same chunk never map to the same global speaker
+        (pyannote already decided they are different people).
+        """
+        local = {label: _normalise(emb) for label, emb in embeddings.items()}
+        local = {label: emb for label, emb in local.items() if emb is not None}
+        if not local:
+            return {}
+
+        with self._lock:
+            mapping: Dict[str, str] = {}
+            labels = list(local.keys())
+
+            if self._profiles:
+                sims = np.stack([local[l] for l in labels]) @ np.stack([p.centroid for p in self._profiles]).T
+                used_profiles = set()
+                for flat in np.argsort(sims, axis=None)[::-1]:
+                    i, j = np.unravel_index(flat, sims.shape)
+                    if sims[i, j] < self.similarity_threshold:
+                        break
+                    if labels[i] in mapping or j in used_profiles:
+                        continue
+                    mapping[labels[i]] = self._profiles[j].speaker_id
+                    used_profiles.add(j)
+                    self._update(self._profiles[j], local[labels[i]])
+
+            for label in labels:
+                if label in mapping:
+                    continue
+                if self.max_speakers and len(self._profiles) >= self.max_speakers:
+                    # Session is full: attach to the closest known speaker
+                    best = max(self._profiles, key=lambda p: float(p.centroid @ local[label]))
+                    mapping[label] = best.speaker_id
+                    self._update(best, local[label])
+                    continue
+                profile = SpeakerProfile(speaker_id=f"SPEAKER_{len(self._profiles):02d}", centroid=local[label])
+                self._profiles.append(profile)
+                mapping[label] = profile.speaker_id
+                print(f"[SpeakerRegistry] New speaker {profile.speaker_id} (chunk label {label})")
+
+            return mapping
+
+    def _update(self, profile: SpeakerProfile, embedding: np.ndarray):
+        weight = min(profile.observations, self.max_weight)
+        merged = _normalise(profile.centroid * weight + embedding)
+        if merged is not None:
+            profile.centroid = merged
+        profile.observations += 1
+
+    @staticmethod
+    def relabel(segments: List[Dict[str, Any]], mapping: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Rewrite segment (and word) speaker labels in place using mapping."""
+        if not mapping:
+            return segments
+        for seg in segments:
+            if seg.get("speaker") in mapping:
+                seg["speaker"] = mapping[seg["speaker"]]
+            for word in seg.get("words", []) or []:
+                if word.get("speaker") in mapping:
+                    word["speaker"] = mapping[word["speaker"]]
+        return segments
+
+    @property
+    def speaker_count(self) -> int:
+        return len(self._profiles)
+
+    def reset(self):
+        with self._lock:
+            self._profiles = []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "speakers": len(self._profiles),
+                "observations": {p.speaker_id: p.observations for p in self._profiles}
+            }
@@ -0,0 +1,216 @@
+"""
+Streaming Incremental Transcription (LocalAgreement-2).
+
+Instead of transcribing fixed 10 s chunks, audio is appended to a rolling
+window that is re-transcribed about once per second. Words on which two
+consecutive hypotheses agree are committed; the rest is shown as tentative
+text. Committed audio is trimmed from the window (keeping a short overlap for
+context), so words spanning a chunk edge are never cut in half.
+
+Flow:
+    capture callback -> insert_audio() -> process_iter() every ~1s
+        -> StreamingUpdate(committed=[...], tentative=[...])
+"""
+
+import itertools
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.modules.transcription.audio import resample_audio, WHISPER_SAMPLE_RATE
+
+
+@dataclass
+class Word:
+    """A single hypothesised word with absolute stream timestamps (seconds)."""
+    text: str
+    start: float
+    end: float
+
+    @property
+    def key(self) -> str:
+        """Normalised form used for agreement checks."""
+        return re.sub(r"[^\w']", "", self.text.lower())
+
+
+@dataclass
+class StreamingUpdate:
+    """Result of one streaming iteration."""
+    committed: List[Word] = field(default_factory=list)  # newly committed this iteration
+    tentative: List[Word] = field(default_factory=list)  # current unconfirmed tail
+
+    @property
+    def committed_text(self) -> str:
+        return " ".join(w.text for w in self.committed).strip()
+
+    @property
+    def tentative_text(self) -> str:
+        return " ".join(w.text for w in self.tentative).strip()
+
+
+class StreamingTranscriber:
+    """
+    Rolling-window streaming transcriber on top of TranscriptionService.
+
+    Thread-safety: insert_audio() may be called from the realtime audio thread
+    while process_iter() runs on a worker thread.
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        window_seconds: float = 15.0,
+        overlap_seconds: float = 1.0,
+        min_new_audio: float = 0.5
+    ):
+        self.transcriber = transcriber
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.min_new_audio = min_new_audio
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[np.ndarray, int]] = []  # raw blocks at native rate
+
+        self._audio = np.zeros(0, dtype=np.float32)  # rolling window at 16 kHz
+        self._audio_offset = 0.0  # stream time of self._audio[0]
+        self._new_samples = 0
+
+        self._language: Optional[str] = None
+        self._committed: List[Word] = []
+        self._last_committed_end = 0.0
+        self._hypothesis: List[Word] = []  # previous uncommitted hypothesis
+
+    # ==================== INPUT ====================
+
+    def insert_audio(self, data: np.ndarray, sample_rate: int):
+        """Queue a block of captured audio (any rate, mono or multi-channel)."""
+        with self._lock:
+            self._pending.append((np.array(data, dtype=np.float32, copy=True), sample_rate))
+
+    def _drain_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        # Resample one contiguous block per run of same-format blocks (rate, channels),
+        # in stream order, to avoid per-block edge artefacts
+        blocks = [(data.reshape(len(data), -1), rate) for data, rate in pending]
+        resampled = [
+            resample_audio(np.concatenate([data for data, _ in run], axis=0), rate, WHISPER_SAMPLE_RATE)
+            for (rate, _), run in itertools.groupby(blocks, key=lambda b: (b[1], b[0].shape[1]))
+        ]
+
+        self._audio = np.concatenate([self._audio] + resampled)
+        self._new_samples += sum(len(audio) for audio in resampled)
+
+    # ==================== PROCESSING ====================
+
+    def process_iter(self) -> StreamingUpdate:
+        """Transcribe the current window and commit words both hypotheses agree on."""
+        self._drain_pending()
+
+        if self._new_samples < self.min_new_audio * WHISPER_SAMPLE_RATE:
+            return StreamingUpdate(tentative=list(self._hypothesis))
+        self._new_samples = 0
+
+        result = self.transcriber.transcribe_segments(self._audio, language=self._language)
+        self._language = self._language or result.get("language")
+
+        words = self._filter_committed(self._segments_to_words(result.get("segments", [])))
+
+        # LocalAgreement-2: commit the longest common prefix with the previous hypothesis
+        committed = []
+        for prev, cur in zip(self._hypothesis, words):
+            if prev.key and prev.key == cur.key:
+                committed.append(cur)
+            else:
+                break
+
+        tentative = words[len(committed):]
+        self._commit(committed)
+        self._hypothesis = tentative
+
+        # Window overflowed without agreement (e.g. continuous noise): force progress
+        if len(self._audio) / WHISPER_SAMPLE_RATE > self.window_seconds and not committed and tentative:
+            self._commit(tentative)
+            committed = committed + tentative
+            tentative = []
+            self._hypothesis = []
+
+        self._trim_window()
+        return StreamingUpdate(committed=committed, tentative=tentative)
+
+    def finish(self) -> StreamingUpdate:
+        """Flush the remaining tentative text as committed (end of stream)."""
+        update = self.process_iter()
+        remaining = update.tentative
+        self._commit(remaining)
+        self._hypothesis = []
+        return StreamingUpdate(committed=update.committed + remaining)
+
+    # ==================== INTERNALS ====================
+
+    def _segments_to_words(self, segments: List[dict]) -> List[Word]:
+        """
+        Split ASR segments into words with absolute timestamps.
+
+        Segment-level timings are interpolated across the words; this is only
+        used for ordering and window trimming, not for display.
+        """
+        words = []
+        for seg in segments:
+            tokens = seg.get("text", "").split()
+            if not tokens:
+                continue
+            start = self._audio_offset + float(seg.get("start", 0.0))
+            end = self._audio_offset + float(seg.get("end", 0.0))
+            step = (end - start) / len(tokens) if end > start else 0.0
+            for i, tok in enumerate(tokens):
+                words.append(Word(text=tok, start=start + i * step, end=start + (i + 1) * step))
+        return words
+
+    def _filter_committed(self, words: List[Word]) -> List[Word]:
+        """Drop words from the overlap region that were already committed."""
+        words = [w for w in words if w.end > self._last_committed_end - 0.1]
+
+        # Remove up to 5 leading words that repeat the committed tail (n-gram overlap)
+        if words and self._committed:
+            tail = [w.key for w in self._committed[-5:]]
+            for n in range(min(5, len(words), len(tail)), 0, -1):
+                if tail[-n:] == [w.key for w in words[:n]]:
+                    return words[n:]
+        return words
+
+    def _commit(self, words: List[Word]):
+        if not words:
+            return
+        self._committed.extend(words)
+        self._last_committed_end = max(self._last_committed_end, words[-1].end)
+        # Keep only a short history for n-gram de-duplication
+        if len(self._committed) > 50:
+            self._committed = self._committed[-50:]
+
+    def _trim_window(self):
+        """Drop committed audio from the window, keeping overlap_seconds of context."""
+        window_len = len(self._audio) / WHISPER_SAMPLE_RATE
+        if window_len <= self.window_seconds / 2:
+            return
+
+        cut_time = self._last_committed_end - self.overlap_seconds
+        if not self._hypothesis and window_len > self.window_seconds:
+            # Nothing pending (silence / non-speech): keep only the overlap tail
+            cut_time = max(cut_time, self._audio_offset + window_len - self.overlap_seconds)
+        cut = int((cut_time - self._audio_offset) * WHISPER_SAMPLE_RATE)
+        if cut <= 0:
+            return
+        cut = min(cut, len(self._audio))
+        self._audio = self._audio[cut:]
+        self._audio_offset += cut / WHISPER_SAMPLE_RATE
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self._audio) / WHISPER_SAMPLE_RATE
@@ -0,0 +1,282 @@
+"""
+Voice Activity Detection and speech-segment chunking.
+
+Replaces fixed 10 s chunks + a single RMS check: capture blocks are split into
+30 ms frames, each frame is classified as speech / non-speech, and chunks are
+cut at pauses so only speech (plus a little context) reaches the ASR queue.
+
+Frame classifier (numpy only, runs inside the audio callback):
+- energy: frame level must clear an adaptive noise floor by margin_db
+- spectral: most of the energy must sit in the voice band (80-4000 Hz) and
+  the spectrum must not be flat (broadband noise, fans, hiss)
+- hangover: speech state is held for a few frames to bridge short gaps
+
+The segmenter keeps samples in a preallocated AudioRingBuffer: each block is
+written once, frames are classified on views of the ring, and a segment is
+copied out only when it closes (no per-frame arrays or list concatenation in
+the audio callback).
+
+Usage:
+    segmenter = SpeechSegmenter(sample_rate=48000, on_segment=handle)
+    segmenter.push(block)          # from the capture callback
+    segmenter.flush()              # on stop
+    segmenter.stats()["skipped_fraction"]
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.modules.workflow.ring_buffer import AudioRingBuffer
+
+
+@dataclass
+class SpeechSegment:
+    """A run of speech cut from the stream."""
+    audio: np.ndarray  # mono float32 at the capture rate
+    sample_rate: int
+    start: float  # seconds since the segmenter started
+    duration: float
+    speech_seconds: float  # frames classified as speech within the segment
+
+
+class EnergySpectralVAD:
+    """
+    Frame-level speech classifier on energy and spectral shape.
+
+    Args:
+        sample_rate: capture rate of the frames
+        frame_ms: analysis frame length
+        margin_db: required level above the tracked noise floor
+        min_level_db: absolute floor (dBFS) below which a frame is never speech
+        band_ratio: minimum share of energy in the 80-4000 Hz voice band
+        max_flatness: maximum spectral flatness (0 = tonal, ~0.56 = white noise)
+        hangover_ms: how long speech state is held after the last speech frame
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = 30,
+        margin_db: float = 9.0,
+        min_level_db: float = -50.0,
+        band_ratio: float = 0.5,
+        max_flatness: float = 0.45,
+        hangover_ms: int = 240
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, int(sample_rate * frame_ms / 1000))
+        self.margin_db = margin_db
+        self.min_level_db = min_level_db
+        self.band_ratio = band_ratio
+        self.max_flatness = max_flatness
+        self.hangover_frames = max(0, int(hangover_ms / frame_ms))
+
+        freqs = np.fft.rfftfreq(self.frame_len, 1.0 / sample_rate)
+        self._band = (freqs >= 80) & (freqs <= 4000)
+        self._window = np.hanning(self.frame_len).astype(np.float32)
+
+        self._noise_floor: Optional[float] = None
+        self._hang = 0
+
+    def classify(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify a (n_frames, frame_len) matrix.
+
+        Returns (raw, smoothed) boolean arrays; smoothed includes hangover.
+        """
+        rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1)) + 1e-10
+        level_db = 20.0 * np.log10(rms)
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2 + 1e-12
+        band_share = power[:, self._band].sum(axis=1) / power.sum(axis=1)
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+        raw = np.zeros(len(frames), dtype=bool)
+        smoothed = np.zeros(len(frames), dtype=bool)
+        for i, db in enumerate(level_db):
+            floor = self._update_floor(db)
+            raw[i] = (
+                db > self.min_level_db
+                and db > floor + self.margin_db
+                and band_share[i] >= self.band_ratio
+                and flatness[i] <= self.max_flatness
+            )
+            if raw[i]:
+                self._hang = self.hangover_frames
+                smoothed[i] = True
+            elif self._hang > 0:
+                self._hang -= 1
+                smoothed[i] = True
+        return raw, smoothed
+
+    def _update_floor(self, db: float) -> float:
+        """Track the noise floor: follow drops at once, rise slowly (~15 s)."""
+        if self._noise_floor is None or db < self._noise_floor:
+            self._noise_floor = float(db)
+        else:
+            self._noise_floor += 0.002 * (db - self._noise_floor)
+        return self._noise_floor
+
+    @property
+    def noise_floor_db(self) -> Optional[float]:
+        return self._noise_floor
+
+
+class SpeechSegmenter:
+    """
+    Cuts a live stream into speech segments at pauses.
+
+    A segment opens on the first speech frame (with pre_roll of context) and
+    closes after silence_close seconds of non-speech. Segments reaching
+    max_segment are split at the next non-speech frame, or forcibly at
+    1.25 x max_segment. Segments with less than min_speech seconds of speech
+    are discarded.
+
+    push() is meant to be called from the realtime audio thread; on_segment
+    runs on that thread too, so it should only enqueue work.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        on_segment: Callable[[SpeechSegment], None],
+        max_segment: float = 10.0,
+        silence_close: float = 0.6,
+        min_speech: float = 0.3,
+        pre_roll: float = 0.2,
+        vad: Optional[EnergySpectralVAD] = None
+    ):
+        self.sample_rate = sample_rate
+        self.on_segment = on_segment
+        self.vad = vad or EnergySpectralVAD(sample_rate)
+
+        frame_seconds = self.vad.frame_len / sample_rate
+        self.frame_seconds = frame_seconds
+        self._max_frames = max(1, int(max_segment / frame_seconds))
+        self._hard_max_frames = int(self._max_frames * 1.25)
+        self._close_frames = max(1, int(silence_close / frame_seconds))
+        self._min_speech_frames = max(1, int(min_speech / frame_seconds))
+
+        self._pre_roll_frames = max(0, int(pre_roll / frame_seconds))
+
+        # Ring holds the open segment (or pre-roll) plus unclassified samples;
+        # its read position is always the first retained frame
+        self._lock = threading.Lock()
+        self._ring = AudioRingBuffer(
+            capacity=(self._hard_max_frames + self._pre_roll_frames + 1) * self.vad.frame_len + 2 * sample_rate
+        )
+        self._in_segment = False
+        self._segment_start = 0  # frame index
+        self._segment_speech = 0
+        self._silence_run = 0
+        self._position = 0  # frames classified
+
+        # Stats
+        self._total_frames = 0
+        self._emitted_frames = 0
+        self._segments_emitted = 0
+        self._segments_discarded = 0
+
+    def push(self, block: np.ndarray):
+        """Feed a block of captured audio (mono or (frames, channels))."""
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim > 1:
+            block = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+
+        frame_len = self.vad.frame_len
+        with self._lock:
+            self._ring.write(block)
+            start = self._position * frame_len
+            n = (self._ring.frames_written - start) // frame_len
+            if n == 0:
+                return
+            offset = start - self._ring.frames_read
+            frames = self._ring.peek(offset + n * frame_len)[offset:, 0].reshape(n, frame_len)
+
+            raw, speech = self.vad.classify(frames)
+            for is_raw, is_speech in zip(raw, speech):
+                self._consume(bool(is_raw), bool(is_speech))
+
+    def _release_until(self, frame: int):
+        """Let the ring reuse everything before frame index `frame`."""
+        self._ring.consume(frame * self.vad.frame_len - self._ring.frames_read)
+
+    def _consume(self, is_raw: bool, is_speech: bool):
+        self._total_frames += 1
+        self._position += 1
+
+        if not self._in_segment:
+            if not is_speech:
+                self._release_until(max(0, self._position - self._pre_roll_frames))
+                return
+            retained = (self._position - 1) - self._ring.frames_read // self.vad.frame_len
+            self._in_segment = True
+            self._segment_start = self._position - 1 - min(retained, self._pre_roll_frames)
+            self._segment_speech = 0
+            self._silence_run = 0
+
+        if is_raw:
+            self._segment_speech += 1
+        self._silence_run = 0 if is_speech else self._silence_run + 1
+
+        length = self._position - self._segment_start
+        if (
+            self._silence_run >= self._close_frames
+            or (length >= self._max_frames and not is_raw)
+            or length >= self._hard_max_frames
+        ):
+            self._close()
+
+    def _close(self):
+        frame_len = self.vad.frame_len
+        length = self._position - self._segment_start
+        # Drop trailing silence beyond the hangover that closed the segment
+        if self._silence_run:
+            length -= max(0, self._silence_run - self.vad.hangover_frames)
+        self._silence_run = 0
+        self._in_segment = False
+
+        if self._segment_speech < self._min_speech_frames or length <= 0:
+            self._segments_discarded += 1
+            self._release_until(self._position)
+            return
+
+        # The segment outlives the callback - copy it out of the ring
+        offset = self._segment_start * frame_len - self._ring.frames_read
+        audio = self._ring.peek(offset + length * frame_len)[offset:, 0].copy()
+        self._release_until(self._position)
+
+        self._emitted_frames += length
+        self._segments_emitted += 1
+        segment = SpeechSegment(
+            audio=audio,
+            sample_rate=self.sample_rate,
+            start=self._segment_start * self.frame_seconds,
+            duration=length * self.frame_seconds,
+            speech_seconds=self._segment_speech * self.frame_seconds
+        )
+        try:
+            self.on_segment(segment)
+        except Exception as e:
+            print(f"[VAD] Segment callback failed: {e}")
+
+    def flush(self):
+        """Emit any open segment (end of stream)."""
+        with self._lock:
+            if self._in_segment:
+                self._close()
+
+    def stats(self) -> Dict[str, float]:
+        """Audio seen vs. sent to ASR."""
+        total = self._total_frames
+        return {
+            "audio_seconds": round(total * self.frame_seconds, 1),
+            "speech_seconds": round(self._emitted_frames * self.frame_seconds, 1),
+            "skipped_fraction": round(1.0 - self._emitted_frames / total, 3) if total else 0.0,
+            "segments": self._segments_emitted,
+            "discarded_segments": self._segments_discarded,
+            "noise_floor_db": round(float(self.vad.noise_floor_db), 1) if self.vad.noise_floor_db is not None else None
+        }
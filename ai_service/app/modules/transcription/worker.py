@@ -0,0 +1,317 @@
+"""
+Transcription Worker - single consumer for all ASR requests.
+
+Replaces the thread-per-chunk model: local capture and /audio-stream submit
+jobs to one bounded priority queue (ordered by chunk timestamp) served by a
+single thread, so the WhisperX model is never called concurrently and
+results are committed in timestamp order.
+
+Overflow policies when the queue is full:
+- "drop_oldest": discard the stalest pending chunk (default - keeps captions live)
+- "drop_newest": reject the incoming chunk
+- "merge": concatenate the two newest pending chunks of the same source into
+  one longer job (one ASR pass instead of two); falls back to drop_oldest
+
+Batching: with a process_batch_fn and max_batch > 1, the worker takes every
+pending job (up to max_batch) in one go and, while more than one stream is
+active, waits up to batch_window seconds for other streams' chunks, so
+concurrent remote clients share one batched ASR call.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "merge")
+
+
+@dataclass(order=True)
+class TranscriptionJob:
+    """One unit of audio waiting for transcription."""
+    timestamp: float  # capture time of the first sample (wall clock)
+    seq: int = field(default=0)  # tie-breaker, assigned on submit
+    audio: Optional[np.ndarray] = field(default=None, compare=False)
+    sample_rate: int = field(default=16000, compare=False)
+    wav_path: Optional[str] = field(default=None, compare=False)  # legacy file input
+    source: str = field(default="local", compare=False)
+    enqueued_at: float = field(default_factory=time.time, compare=False)
+
+    @property
+    def duration(self) -> float:
+        if self.audio is None or not self.sample_rate:
+            return 0.0
+        return len(self.audio) / self.sample_rate
+
+    def cleanup(self):
+        """Remove the temp file backing this job, if any."""
+        if self.wav_path and os.path.exists(self.wav_path):
+            try:
+                os.remove(self.wav_path)
+            except OSError:
+                pass
+
+
+class TranscriptionWorker:
+    """
+    Bounded single-thread transcription queue.
+
+    Args:
+        process_fn: job -> list of segments (runs on the worker thread)
+        commit_fn: (job, segments) -> None, called in timestamp order
+        max_queue: pending jobs allowed before the overflow policy applies
+        overflow_policy: one of OVERFLOW_POLICIES
+        process_batch_fn: jobs -> list of segment lists (same order), optional
+        max_batch: most jobs handed to process_batch_fn at once
+        batch_window: latency budget (s) for gathering a cross-stream batch
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[[TranscriptionJob], List[Dict[str, Any]]],
+        commit_fn: Callable[[TranscriptionJob, List[Dict[str, Any]]], None],
+        max_queue: int = 4,
+        overflow_policy: str = "drop_oldest",
+        name: str = "transcription",
+        process_batch_fn: Optional[Callable[[List[TranscriptionJob]], List[List[Dict[str, Any]]]]] = None,
+        max_batch: int = 1,
+        batch_window: float = 0.15
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}' (expected one of {OVERFLOW_POLICIES})")
+
+        self.process_fn = process_fn
+        self.commit_fn = commit_fn
+        self.max_queue = max(1, max_queue)
+        self.overflow_policy = overflow_policy
+        self.name = name
+        self.process_batch_fn = process_batch_fn
+        self.max_batch = max(1, max_batch)
+        self.batch_window = batch_window
+
+        self._heap: List[TranscriptionJob] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._busy = False
+        self._source_seen: Dict[str, float] = {}  # source -> last submit time
+
+        # Metrics
+        self._submitted = 0
+        self._processed = 0
+        self._dropped = 0
+        self._merged = 0
+        self._errors = 0
+        self._total_process_seconds = 0.0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._last_committed_ts = 0.0
+        self._batches = 0
+        self._batched_jobs = 0
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-worker", daemon=True)
+        self._thread.start()
+        print(f"[TranscriptionWorker] Started (queue={self.max_queue}, policy={self.overflow_policy})")
+
+    def stop(self, drain_timeout: float = 10.0):
+        """
+        Stop the worker, processing what is already queued for up to
+        drain_timeout seconds. Jobs still pending afterwards are discarded.
+        """
+        deadline = time.time() + drain_timeout
+        with self._cond:
+            while (self._heap or self._busy) and time.time() < deadline and self._thread and self._thread.is_alive():
+                self._cond.wait(timeout=0.2)
+            self._running = False
+            leftover, self._heap = self._heap, []
+            self._cond.notify_all()
+
+        for job in leftover:
+            self._dropped += 1
+            job.cleanup()
+
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        print(f"[TranscriptionWorker] Stopped ({self._processed} processed, {self._dropped} dropped, {self._merged} merged)")
+
+    # ==================== SUBMISSION ====================
+
+    def submit(self, job: TranscriptionJob) -> bool:
+        """Queue a job. Returns False if it was rejected by the overflow policy."""
+        with self._cond:
+            if not self._running:
+                job.cleanup()
+                return False
+
+            job.seq = next(self._seq)
+            job.enqueued_at = time.time()
+            self._submitted += 1
+            self._source_seen[job.source] = job.enqueued_at
+
+            if len(self._heap) >= self.max_queue and not self._make_room(job):
+                self._dropped += 1
+                job.cleanup()
+                print(f"[TranscriptionWorker] Queue full - dropped incoming chunk ({self.overflow_policy})")
+                return False
+
+            heapq.heappush(self._heap, job)
+            self._cond.notify_all()
+            return True
+
+    def _make_room(self, incoming: TranscriptionJob) -> bool:
+        """Apply the overflow policy. Caller holds the lock."""
+        if self.overflow_policy == "drop_newest":
+            return False
+
+        if self.overflow_policy == "merge" and self._merge_pending(incoming.source):
+            return True
+
+        # drop_oldest (and merge fallback)
+        oldest = heapq.heappop(self._heap)
+        oldest.cleanup()
+        self._dropped += 1
+        print(f"[TranscriptionWorker] Queue full - dropped stale chunk from {oldest.source} "
+              f"({time.time() - oldest.timestamp:.1f}s old)")
+        return True
+
+    def _merge_pending(self, source: str) -> bool:
+        """Merge the two newest in-memory jobs of one source. Caller holds the lock."""
+        candidates = sorted(
+            (j for j in self._heap if j.source == source and j.audio is not None and j.wav_path is None),
+            key=lambda j: j.timestamp
+        )
+        if len(candidates) < 2:
+            return False
+
+        first, second = candidates[-2], candidates[-1]
+        if first.sample_rate != second.sample_rate:
+            return False
+
+        first.audio = np.concatenate([first.audio, second.audio], axis=0)
+        self._heap.remove(second)
+        heapq.heapify(self._heap)
+        self._merged += 1
+        print(f"[TranscriptionWorker] Queue full - merged two chunks from {source} ({first.duration:.1f}s)")
+        return True
+
+    # ==================== WORKER LOOP ====================
+
+    def _active_sources(self, window: float = 15.0) -> int:
+        """Streams that submitted within the last `window` seconds. Caller holds the lock."""
+        cutoff = time.time() - window
+        return sum(1 for seen in self._source_seen.values() if seen >= cutoff)
+
+    def _take_batch(self) -> List[TranscriptionJob]:
+        """Pop the next job plus batchable followers. Caller holds the lock."""
+        batch = [heapq.heappop(self._heap)]
+        if not self.process_batch_fn or self.max_batch <= 1:
+            return batch
+
+        # Only wait for more when other streams are likely to deliver soon
+        deadline = time.time() + (self.batch_window if self._active_sources() > 1 else 0.0)
+        while len(batch) < self.max_batch and self._running:
+            if self._heap:
+                batch.append(heapq.heappop(self._heap))
+                continue
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self._cond.wait(timeout=remaining)
+        return batch
+
+    def _process(self, batch: List[TranscriptionJob]) -> List[List[Dict[str, Any]]]:
+        if len(batch) > 1:
+            try:
+                results = self.process_batch_fn(batch)
+                self._batches += 1
+                self._batched_jobs += len(batch)
+                return [r or [] for r in results]
+            except Exception as e:
+                self._errors += 1
+                print(f"[TranscriptionWorker] Batch of {len(batch)} failed ({e}) - retrying one by one")
+
+        results = []
+        for job in batch:
+            try:
+                results.append(self.process_fn(job) or [])
+            except Exception as e:
+                self._errors += 1
+                print(f"[TranscriptionWorker] Job failed: {e}")
+                results.append([])
+        return results
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._heap:
+                    self._cond.wait(timeout=0.5)
+                if not self._running:
+                    break
+                batch = self._take_batch()
+                self._busy = True
+
+            started = time.time()
+            try:
+                results = self._process(batch)
+            finally:
+                for job in batch:
+                    job.cleanup()
+
+            elapsed = time.time() - started
+            self._total_process_seconds += elapsed
+            for job, segments in zip(batch, results):
+                self._processed += 1
+                self._last_lag = time.time() - (job.timestamp + job.duration)
+                self._max_lag = max(self._max_lag, self._last_lag)
+                self._last_committed_ts = max(self._last_committed_ts, job.timestamp)
+
+                try:
+                    self.commit_fn(job, segments)
+                except Exception as e:
+                    self._errors += 1
+                    print(f"[TranscriptionWorker] Commit failed: {e}")
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    # ==================== METRICS ====================
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, lag and throughput counters."""
+        with self._cond:
+            depth = len(self._heap)
+            oldest_wait = time.time() - min(j.enqueued_at for j in self._heap) if self._heap else 0.0
+            active_sources = self._active_sources()
+
+        return {
+            "queue_depth": depth,
+            "max_queue": self.max_queue,
+            "overflow_policy": self.overflow_policy,
+            "busy": self._busy,
+            "oldest_pending_seconds": round(oldest_wait, 2),
+            "lag_seconds": round(self._last_lag, 2),  # end of audio -> commit, last job
+            "max_lag_seconds": round(self._max_lag, 2),
+            "submitted": self._submitted,
+            "processed": self._processed,
+            "dropped": self._dropped,
+            "merged": self._merged,
+            "errors": self._errors,
+            "avg_process_seconds": round(self._total_process_seconds / self._processed, 2) if self._processed else 0.0,
+            "batches": self._batches,
+            "avg_batch_size": round(self._batched_jobs / self._batches, 2) if self._batches else 0.0,
+            "active_sources": active_sources
+        }
@@ -0,0 +1,124 @@
+"""
+Insight Trigger - transcript-driven wake-ups for the insight loop.
+
+The insight loop used to poll every insight_interval seconds and run GLiNER +
+Gemini whether or not anyone had spoken. Instead, transcript commits (from
+the transcription worker thread or the streaming loop) notify this trigger;
+the loop wakes on the first new segment, waits for speech to settle
+(debounce, bounded by max_debounce so a monologue still gets hints), and
+never fires more often than the caller's minimum interval.
+
+Usage:
+    trigger = InsightTrigger(debounce=1.5)
+    trigger.notify(segments)                         # any thread
+    activity = await trigger.wait(min_interval=10)   # insight loop
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class InsightActivity:
+    """Transcript activity accumulated since the last wake-up."""
+    new_segments: int = 0
+    new_chars: int = 0
+    speaker_turn: bool = False  # a different speaker started talking
+
+
+class InsightTrigger:
+    """
+    Debounced, rate-limited wake-up signal fed by transcript commits.
+
+    Args:
+        debounce: quiet period (s) after the last new segment before firing
+        max_debounce: fire at most this long (s) after the first new segment,
+                      even if segments keep arriving
+    """
+
+    def __init__(self, debounce: float = 1.5, max_debounce: float = 5.0):
+        self.debounce = debounce
+        self.max_debounce = max_debounce
+
+        self._pending = InsightActivity()
+        self._last_speaker: Optional[str] = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+        self._last_fired = 0.0
+
+        # Stats
+        self.notifications = 0
+        self.wakeups = 0
+
+    def notify(self, segments: List[Dict[str, Any]]):
+        """Record newly committed segments and wake the loop (thread-safe)."""
+        if not segments:
+            return
+        with self._lock:
+            for seg in segments:
+                text = seg.get("text", "") if isinstance(seg, dict) else str(seg)
+                self._pending.new_segments += 1
+                self._pending.new_chars += len(text.strip())
+                speaker = seg.get("speaker") if isinstance(seg, dict) else None
+                if speaker:
+                    if self._last_speaker and speaker != self._last_speaker:
+                        self._pending.speaker_turn = True
+                    self._last_speaker = speaker
+            self.notifications += 1
+            loop, event = self._loop, self._event
+        if loop is not None and event is not None:
+            loop.call_soon_threadsafe(event.set)
+
+    def _drain(self) -> InsightActivity:
+        with self._lock:
+            activity, self._pending = self._pending, InsightActivity()
+        return activity
+
+    async def wait(self, min_interval: float = 0.0) -> InsightActivity:
+        """
+        Wait for new transcript activity, debounced and at least min_interval
+        seconds after the previous wake-up.
+        """
+        if self._event is None:
+            with self._lock:
+                self._loop = asyncio.get_running_loop()
+                self._event = asyncio.Event()
+                if self._pending.new_segments:
+                    self._event.set()
+
+        while True:
+            await self._event.wait()
+
+            # Debounce: wait for a pause in new segments
+            first = time.monotonic()
+            while True:
+                self._event.clear()
+                remaining = min(self.debounce, first + self.max_debounce - time.monotonic())
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            # Minimum spacing between runs
+            gap = self._last_fired + min_interval - time.monotonic()
+            if gap > 0:
+                await asyncio.sleep(gap)
+
+            activity = self._drain()
+            self._event.clear()
+            if activity.new_segments:
+                self._last_fired = time.monotonic()
+                self.wakeups += 1
+                return activity
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "notifications": self.notifications,
+            "wakeups": self.wakeups
+        }
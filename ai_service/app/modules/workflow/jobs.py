@@ -0,0 +1,172 @@
+"""
+Background Jobs - long-running work tracked by ID.
+
+/stop-session used to await summarization, extraction, DB persistence and the
+Odoo sync before responding, stalling the server (and every WebSocket) for
+the duration. Such work is now submitted here as an asyncio task; the request
+returns the job ID immediately, clients poll GET /jobs/{id} or listen for the
+"job" event on /session-stream.
+
+Usage:
+    jobs = get_job_manager()
+    job = jobs.submit("stop_session", lambda job: finalize(job, session))
+    jobs.get(job.id).to_dict()
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class Job:
+    """One background job and its outcome."""
+    id: str
+    kind: str
+    status: JobStatus = JobStatus.PENDING
+    stage: Optional[str] = None  # current step, for progress display
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    _manager: Optional["JobManager"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    async def set_stage(self, stage: str):
+        """Record progress and notify listeners."""
+        self.stage = stage
+        print(f"[Jobs] {self.kind} {self.id}: {stage}")
+        if self._manager:
+            await self._manager._notify(self)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "stage": self.stage,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": round((self.finished_at or time.time()) - self.started_at, 2) if self.started_at else None,
+            "error": self.error
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+JobListener = Callable[[Job], Awaitable[None]]
+
+
+class JobManager:
+    """
+    Runs job coroutines as event-loop tasks and keeps their outcomes.
+
+    Args:
+        max_jobs: finished jobs retained for status queries (oldest evicted)
+    """
+
+    def __init__(self, max_jobs: int = 50):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._listeners: List[JobListener] = []
+
+    def add_listener(self, listener: JobListener):
+        """Register an async callback invoked on every status / stage change."""
+        self._listeners.append(listener)
+
+    async def _notify(self, job: Job):
+        for listener in self._listeners:
+            try:
+                await listener(job)
+            except Exception as e:
+                print(f"[Jobs] Listener error: {e}")
+
+    def submit(self, kind: str, fn: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Start fn(job) in the background and return the job immediately."""
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, _manager=self)
+        self._jobs[job.id] = job
+        self._evict()
+        self._tasks[job.id] = asyncio.create_task(self._run(job, fn))
+        print(f"[Jobs] Submitted {kind} {job.id}")
+        return job
+
+    async def _run(self, job: Job, fn: Callable[[Job], Awaitable[Any]]):
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        await self._notify(job)
+        try:
+            job.result = await fn(job)
+            job.status = JobStatus.COMPLETED
+        except asyncio.CancelledError:
+            job.status = JobStatus.CANCELLED  # cancel() - the task ends here
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = time.time()
+            self._tasks.pop(job.id, None)
+        print(f"[Jobs] {job.kind} {job.id} {job.status.value} in {job.finished_at - job.started_at:.1f}s")
+        await self._notify(job)
+
+    def _evict(self):
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((jid for jid, j in self._jobs.items() if j.done), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def active(self, kind: Optional[str] = None) -> List[Job]:
+        """Jobs that have not finished yet (optionally of one kind)."""
+        return [j for j in self._jobs.values() if not j.done and (kind is None or j.kind == kind)]
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Wait for a job to finish (used on shutdown and in tests)."""
+        task = self._tasks.get(job_id)
+        if task:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        return self.get(job_id)
+
+
+    async def cancel(self, job_id: str, timeout: Optional[float] = 10.0) -> Optional[Job]:
+        """Cancel a running job and wait for its task to unwind."""
+        task = self._tasks.get(job_id)
+        if task:
+            task.cancel()
+            await asyncio.wait([task], timeout=timeout)
+        return self.get(job_id)
+
+
+# Global job manager
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the process-wide job manager."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
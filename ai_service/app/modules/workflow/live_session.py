@@ -10,26 +10,84 @@ Orchestrates:
 """
 
 import asyncio
+import bisect
+import re
+import threading
 import time
-import os
 from dataclasses import dataclass, field
 from typing import Optional, Callable, List, Dict, Any
 from enum import Enum
 
+import numpy as np
+
+from app.modules.workflow.insight_trigger import InsightTrigger
 from app.modules.workflow.local_capture import (
     LocalCaptureService, 
     CaptureConfig, 
     Screenshot, 
     AudioChunk
 )
-from app.modules.transcription.service import TranscriptionService
-from app.modules.summarization.service import SummarizationService
-from app.modules.extraction.gliner_service import GLiNERService
-from app.modules.intelligence.gemini_service import GeminiService
+from app.core.model_registry import (
+    get_model_registry,
+    TRANSCRIPTION,
+    SUMMARIZATION,
+    EXTRACTION,
+    GEMINI
+)
+from app.modules.core.domain import ExtractedEntity
+from app.modules.extraction.competitors import get_competitor_catalog
+from app.modules.extraction.incremental import IncrementalEntityExtractor
+from app.modules.intelligence.response_cache import get_response_cache
+from app.modules.intelligence.rate_limiter import PRIORITY_PERIODIC
+from app.modules.intelligence.battlecard_prewarm import get_battlecard_prewarmer
+from app.modules.intelligence.crawler import get_crawler
+from app.modules.intelligence.research_cache import get_research_cache
+from app.modules.summarization.rolling import RollingSummary
+from app.modules.summarization.service import run_in_summarizer_thread
+from app.modules.transcription.speakers import SpeakerRegistry
+from app.modules.transcription.streaming import StreamingTranscriber, StreamingUpdate
+from app.modules.transcription.worker import TranscriptionWorker, TranscriptionJob
 from app.modules.odoo_client.client import OdooClient
 from app.modules.vision.face_sentiment import face_sentiment_loop
 
 
+def is_hallucination(text: str) -> bool:
+    """Detect Whisper hallucinations from silent audio."""
+    text = text.strip()
+    if not text:
+        return True
+        
+    # Allow short "Yes", "No", "Ok"
+    if len(text) < 2:
+        print(f"[Filter] Text too short (<2): '{text}'")
+        return True
+    
+    # Check for repeated single characters (!!!!!!, ......, etc.)
+    if re.match(r'^(.)\1{4,}$', text):
+        print(f"[Filter] Repeated characters: '{text}'")
+        return True
+    
+    # Check for common hallucination phrases
+    hallucination_phrases = [
+        "thank you for watching", "thanks for watching",
+        "please subscribe", "like and subscribe",
+        "see you next time", "[music]", "(music)",
+        "subtitle by", "copyright", "all rights reserved"
+    ]
+    text_lower = text.lower()
+    if any(phrase in text_lower for phrase in hallucination_phrases):
+        print(f"[Filter] Hallucination phrase detected: '{text}'")
+        return True
+    
+    return False
+
+
+def is_silent_audio(audio_data: np.ndarray) -> bool:
+    """Check if audio is mostly silent."""
+    rms = np.sqrt(np.mean(audio_data ** 2))
+    return rms < 0.01  # Very low amplitude threshold
+
+
 class SessionStatus(Enum):
     IDLE = "idle"
     STARTING = "starting"
@@ -42,14 +100,32 @@ class SessionStatus(Enum):
 @dataclass
 class SessionConfig:
     """Configuration for live assistant session."""
-    # Analysis intervals
-    insight_interval: float = 30.0  # seconds between Gemini analysis
+    # Analysis (event-driven: runs after new transcript, not on a timer)
+    insight_interval: float = 10.0  # minimum seconds between Gemini analyses
+    insight_debounce: float = 1.5  # wait for this pause in speech before analyzing
+    insight_max_debounce: float = 5.0  # ...but never longer than this after new speech
+    insight_min_new_chars: int = 200  # new text that warrants Gemini without a new entity / speaker turn
+    max_tracked_entities: int = 20  # most recent session entities used for hints
+    competitor_scan_chars: int = 2000  # recent transcript scanned for competitor names each analysis
+    summary_interval: float = 20.0  # seconds between rolling summary updates
     transcript_chunk_interval: float = 10.0  # seconds of audio per transcription
     
     # Capture settings
     screen_interval: float = 2.0
     capture_mode: str = "local"  # "local" or "remote" (remote = client streams audio)
     
+    # Streaming transcription (rolling window instead of fixed chunks)
+    streaming_transcription: bool = False
+    stream_update_interval: float = 1.0  # seconds between partial transcripts
+    stream_window: float = 15.0  # max seconds of audio re-transcribed per update
+    
+    # Transcription queue (single worker, bounded)
+    transcription_queue_size: int = 4
+    transcription_batch_size: int = 4  # chunks sharing one ASR call (remote streams)
+    transcription_batch_window: float = 0.15  # seconds to wait for other streams' chunks
+    transcription_overflow: str = "drop_oldest"  # "drop_oldest", "drop_newest" or "merge"
+    speaker_similarity_threshold: float = 0.6  # cosine similarity to reuse a known speaker
+    
     # Processing
     enable_vision: bool = True
     enable_transcription: bool = True
@@ -76,6 +152,30 @@ class SessionState:
     audio_chunks_processed: int = 0
     gemini_calls: int = 0
     
+    _segments_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    
+    def add_segments(self, segments: List[Dict]):
+        """
+        Insert segments in capture-time order.
+        
+        Segments carry an absolute "timestamp"; a late chunk is slotted in
+        before any later audio that was committed first.
+        """
+        with self._segments_lock:
+            for seg in segments:
+                ts = seg.get("timestamp")
+                last = self.transcript_segments[-1] if self.transcript_segments else None
+                if ts is None or not isinstance(last, dict) or last.get("timestamp", 0) <= ts:
+                    self.transcript_segments.append(seg)
+                    continue
+                keys = [s.get("timestamp", 0) if isinstance(s, dict) else 0 for s in self.transcript_segments]
+                self.transcript_segments.insert(bisect.bisect_right(keys, ts), seg)
+    
+    def snapshot_segments(self) -> List[Dict]:
+        """Consistent copy of the segment list for background readers."""
+        with self._segments_lock:
+            return list(self.transcript_segments)
+    
     @property
     def full_transcript(self) -> str:
         """Get plain text transcript."""
@@ -132,18 +232,39 @@ class LiveAssistantSession:
         self.config = config or SessionConfig()
         self.state = SessionState()
         
-        # Services
+        # Services (shared model handles - loaded once per process)
         self.capture_service: Optional[LocalCaptureService] = None
-        self.transcriber = TranscriptionService()
-        self.summarizer = SummarizationService()
-        self.extractor = GLiNERService()
-        self.gemini = GeminiService()
+        registry = get_model_registry()
+        self.transcriber = registry.acquire(TRANSCRIPTION)
+        self.summarizer = registry.acquire(SUMMARIZATION)
+        self.extractor = registry.acquire(EXTRACTION)
+        self.gemini = registry.acquire(GEMINI)
+        self._model_handles = [TRANSCRIPTION, SUMMARIZATION, EXTRACTION, GEMINI]
         self.odoo = OdooClient()
         
+        # Entities are extracted once per new transcript segment
+        self.entity_tracker = IncrementalEntityExtractor(self.extractor)
+        
+        # Wakes the insight loop when transcript segments are committed
+        self.insight_trigger = InsightTrigger(
+            debounce=self.config.insight_debounce,
+            max_debounce=self.config.insight_max_debounce
+        )
+        
+        # Summary is built window by window, so stop only merges the tail
+        self.rolling_summary = RollingSummary(self.summarizer)
+        
         # Tasks
         self._insight_task: Optional[asyncio.Task] = None
         self._transcription_task: Optional[asyncio.Task] = None
         self._face_sentiment_task: Optional[asyncio.Task] = None
+        self._streaming_task: Optional[asyncio.Task] = None
+        self._summary_task: Optional[asyncio.Task] = None
+        self.streamer: Optional[StreamingTranscriber] = None
+        self.transcription_worker: Optional[TranscriptionWorker] = None
+        
+        # Session-wide speaker identities (stable labels across chunks)
+        self.speaker_registry = SpeakerRegistry(similarity_threshold=self.config.speaker_similarity_threshold)
         
         # Callbacks
         self._on_hints_update: Optional[Callable[[List[str]], None]] = None
@@ -152,6 +273,9 @@ class LiveAssistantSession:
         self._on_entities_update: Optional[Callable[[List[str]], None]] = None
         self._on_battlecard: Optional[Callable[[Dict], None]] = None
         self._on_face_sentiment: Optional[Callable[[Dict], None]] = None
+        self._on_partial_transcript: Optional[Callable[[Dict], None]] = None
+        self._on_hint_partial: Optional[Callable[[Dict], None]] = None
+        self._on_battlecard_partial: Optional[Callable[[Dict], None]] = None
         
         print("[LiveSession] Session initialized")
     
@@ -162,15 +286,65 @@ class LiveAssistantSession:
         on_status_change: Optional[Callable[[SessionStatus], None]] = None,
         on_entities_update: Optional[Callable[[List[str]], None]] = None,
         on_battlecard: Optional[Callable[[Dict], None]] = None,
-        on_face_sentiment: Optional[Callable[[Dict], None]] = None
+        on_face_sentiment: Optional[Callable[[Dict], None]] = None,
+        on_partial_transcript: Optional[Callable[[Dict], None]] = None,
+        on_hint_partial: Optional[Callable[[Dict], None]] = None,
+        on_battlecard_partial: Optional[Callable[[Dict], None]] = None
     ):
-        """Set callbacks for real-time updates."""
+        """
+        Set callbacks for real-time updates.
+        
+        on_hint_partial / on_battlecard_partial receive single hints and
+        counter-points while Gemini is still streaming the answer.
+        """
         self._on_hints_update = on_hints_update
         self._on_transcript_update = on_transcript_update
         self._on_status_change = on_status_change
         self._on_entities_update = on_entities_update
         self._on_battlecard = on_battlecard
         self._on_face_sentiment = on_face_sentiment
+        self._on_partial_transcript = on_partial_transcript
+        self._on_hint_partial = on_hint_partial
+        self._on_battlecard_partial = on_battlecard_partial
+    
+    async def _generate_battlecard(self, target: str, transcript_context: str) -> Dict[str, Any]:
+        """Smart Battlecard: Gemini counter-points + web research."""
+        from app.modules.intelligence.web_insight_service import get_web_insight_service
+        
+        # Generate base card with Gemini
+        battlecard = await self.gemini.get_battlecard(
+            competitor_name=target,
+            context=transcript_context[-500:],
+            priority=PRIORITY_PERIODIC,
+            on_point=self._point_streamer(target)
+        )
+        
+        # Enhance with Web Insights
+        try:
+            web_insights = await get_web_insight_service().get_battlecard_research(target)
+            
+            battlecard["web_research"] = web_insights
+            print(f"[LiveSession] Web insight: {web_insights.get('verdict', 'N/A')} for {target}")
+            
+        except Exception as e:
+            print(f"[LiveSession] Web insight error for {target}: {e}")
+            battlecard["web_research"] = {"negative_findings": [], "sources": []}
+        return battlecard
+    
+    def _stream_hint(self, index: int, hint: str):
+        """Push one hint as soon as it has streamed in."""
+        if self._on_hint_partial:
+            self._on_hint_partial({"index": index, "hint": hint})
+    
+    def _point_streamer(self, competitor: str) -> Optional[Callable[[int, str], None]]:
+        """on_point callback pushing one battlecard counter-point as it streams in."""
+        if not self._on_battlecard_partial:
+            return None
+        
+        def on_point(index: int, point: str):
+            self._on_battlecard_partial({"competitor": competitor, "index": index, "point": point})
+        
+        return on_point
     
     async def _broadcast_face_sentiment(self, payload: Dict[str, Any]):
         """Broadcast face sentiment data to connected clients."""
@@ -201,8 +375,29 @@ class LiveAssistantSession:
             )
             self.capture_service = LocalCaptureService(capture_config)
             
+            # Single transcription worker shared by local capture and /audio-stream
+            self.transcription_worker = TranscriptionWorker(
+                process_fn=self._transcribe_job,
+                commit_fn=self._commit_transcription,
+                max_queue=self.config.transcription_queue_size,
+                overflow_policy=self.config.transcription_overflow,
+                process_batch_fn=self._transcribe_batch,
+                max_batch=self.config.transcription_batch_size,
+                batch_window=self.config.transcription_batch_window
+            )
+            self.transcription_worker.start()
+            
             # Set capture callbacks - ONLY register audio callback if NOT remote mode
-            if self.config.capture_mode == "local":
+            if self.config.capture_mode == "local" and self.config.streaming_transcription:
+                print("[LiveSession] Mode: LOCAL STREAMING (rolling-window transcription)")
+                self.streamer = StreamingTranscriber(
+                    self.transcriber,
+                    window_seconds=self.config.stream_window
+                )
+                self.capture_service.set_callbacks(
+                    on_audio_frames=self._handle_audio_frames
+                )
+            elif self.config.capture_mode == "local":
                 print("[LiveSession] Mode: LOCAL (capturing audio from this machine)")
                 self.capture_service.set_callbacks(
                     on_audio_chunk=self._handle_audio_chunk
@@ -214,10 +409,18 @@ class LiveAssistantSession:
             # Start capture
             await self.capture_service.start()
             
+            # Start streaming transcription loop
+            if self.streamer:
+                self._streaming_task = asyncio.create_task(self._streaming_loop())
+            
             # Start insight loop
             if self.config.enable_vision:
                 self._insight_task = asyncio.create_task(self._insight_loop())
             
+            # Start rolling summary loop (only needed for final sync)
+            if self.config.enable_final_sync:
+                self._summary_task = asyncio.create_task(self._summary_loop())
+            
             # Start face sentiment loop (30-second cadence)
             # Only in LOCAL mode - face sentiment captures THIS machine's screen
             if self.config.enable_face_sentiment and self.config.capture_mode == "local":
@@ -276,6 +479,17 @@ class LiveAssistantSession:
             except (asyncio.CancelledError, asyncio.TimeoutError):
                 pass
         
+        # Stop rolling summary loop (an in-flight window finishes in its thread)
+        if self._summary_task:
+            self._summary_task.cancel()
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(self._summary_task),
+                    timeout=2.0
+                )
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+        
         # Stop capture with timeout
         if self.capture_service:
             try:
@@ -287,6 +501,27 @@ class LiveAssistantSession:
                 print("[LiveSession] Capture stop timed out, forcing...")
                 self.capture_service._running = False
         
+        # Finish queued chunks before finalizing
+        if self.transcription_worker:
+            await asyncio.to_thread(self.transcription_worker.stop)
+        
+        # Stop streaming loop and flush the tentative tail
+        if self._streaming_task:
+            self._streaming_task.cancel()
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(self._streaming_task),
+                    timeout=2.0
+                )
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+        if self.streamer:
+            try:
+                update = await asyncio.to_thread(self.streamer.finish)
+                self._apply_streaming_update(update)
+            except Exception as e:
+                print(f"[LiveSession] Streaming flush error: {e}")
+        
         # Finalize
         result = {
             "duration": self.state.duration,
@@ -295,7 +530,15 @@ class LiveAssistantSession:
             "stats": {
                 "screenshots_processed": self.state.screenshots_processed,
                 "audio_chunks_processed": self.state.audio_chunks_processed,
-                "gemini_calls": self.state.gemini_calls
+                "gemini_calls": self.state.gemini_calls,
+                "transcription": self.transcription_metrics(),
+                "entity_extraction": self.entity_tracker.stats(),
+                "summarization": self.rolling_summary.stats(),
+                "llm_cache": get_response_cache().stats(),
+                "llm_rate_limit": self.gemini.limiter.stats(),
+                "web_research_cache": get_research_cache().stats(),
+                "web_crawler": get_crawler().stats(),
+                "insight_trigger": self.insight_trigger.stats()
             }
         }
         
@@ -311,150 +554,229 @@ class LiveAssistantSession:
         self._set_status(SessionStatus.COMPLETED)
         print(f"[LiveSession] Session completed. Duration: {self.state.duration:.1f}s")
         
+        self.release_models()
         return result
     
+    def release_models(self):
+        """Return shared model handles to the registry (idempotent)."""
+        registry = get_model_registry()
+        while self._model_handles:
+            registry.release(self._model_handles.pop())
+    
     def _handle_audio_chunk(self, chunk: AudioChunk):
         """Handle incoming audio chunk - queue it for transcription."""
-        if not self.config.enable_transcription:
+        if not self.config.enable_transcription or not self.transcription_worker:
             return
         
-        # Run transcription in a separate thread to avoid blocking audio capture
-        import threading
-        import re
-        import numpy as np
+        self.transcription_worker.submit(TranscriptionJob(
+            timestamp=chunk.timestamp,
+            audio=chunk.data,
+            sample_rate=chunk.sample_rate,
+            source="local"
+        ))
+    
+    def _transcribe_job(self, job: TranscriptionJob) -> List[Dict[str, Any]]:
+        """Transcribe one queued job (runs on the transcription worker thread)."""
+        if job.audio is not None:
+            # Check for silence before transcribing
+            if is_silent_audio(job.audio):
+                print("[LiveSession] Skipping silent audio chunk")
+                return []
+            audio, sample_rate = job.audio, job.sample_rate
+        else:
+            audio, sample_rate = job.wav_path, None
         
-        def is_hallucination(text: str) -> bool:
-            """Detect Whisper hallucinations from silent audio."""
-            text = text.strip()
-            if not text:
-                return True
-                
-            # Allow short "Yes", "No", "Ok"
-            if len(text) < 2:
-                print(f"[Filter] Text too short (<2): '{text}'")
-                return True
-            
-            # Check for repeated single characters (!!!!!!, ......, etc.)
-            if re.match(r'^(.)\1{4,}$', text):
-                print(f"[Filter] Repeated characters: '{text}'")
-                return True
-            
-            # Check for common hallucination phrases
-            hallucination_phrases = [
-                "thank you for watching", "thanks for watching",
-                "please subscribe", "like and subscribe",
-                "see you next time", "[music]", "(music)",
-                "subtitle by", "copyright", "all rights reserved"
-            ]
-            text_lower = text.lower()
-            if any(phrase in text_lower for phrase in hallucination_phrases):
-                print(f"[Filter] Hallucination phrase detected: '{text}'")
-                return True
+        # Transcribe with speaker diarization (arrays are resampled in-process)
+        segments = self.transcriber.transcribe_with_speakers(audio, sample_rate, self.speaker_registry)
+        
+        # Fallback to plain text if diarization returns empty
+        if not segments:
+            text = self.transcriber.transcribe(audio, sample_rate)
+            if text and text.strip():
+                segments = [{"speaker": "SPEAKER_00", "text": text.strip(), "start": 0, "end": 0}]
+        
+        # Filter out hallucinations
+        return [seg for seg in segments if seg.get("text", "").strip() and not is_hallucination(seg["text"])]
+    
+    def _transcribe_batch(self, jobs: List[TranscriptionJob]) -> List[List[Dict[str, Any]]]:
+        """Transcribe several queued jobs with one batched ASR call (worker thread)."""
+        results: List[List[Dict[str, Any]]] = [[] for _ in jobs]
+        
+        pending = []
+        for i, job in enumerate(jobs):
+            if job.audio is not None and is_silent_audio(job.audio):
+                print(f"[LiveSession] Skipping silent audio chunk from {job.source}")
+                continue
+            pending.append(i)
+        
+        items = [
+            (jobs[i].audio, jobs[i].sample_rate) if jobs[i].audio is not None else (jobs[i].wav_path, None)
+            for i in pending
+        ]
+        for i, (audio, sample_rate), segments in zip(
+            pending, items, self.transcriber.transcribe_many(items, self.speaker_registry)
+        ):
+            # Fallback to plain text if diarization returns empty
+            if not segments:
+                text = self.transcriber.transcribe(audio, sample_rate)
+                if text and text.strip():
+                    segments = [{"speaker": "SPEAKER_00", "text": text.strip(), "start": 0, "end": 0}]
             
-            return False
+            # Filter out hallucinations
+            results[i] = [seg for seg in segments if seg.get("text", "").strip() and not is_hallucination(seg["text"])]
+        return results
+    
+    def _commit_transcription(self, job: TranscriptionJob, segments: List[Dict[str, Any]]):
+        """Append a finished job's segments in timestamp order and notify the UI."""
+        if not segments:
+            print(f"[LiveSession] No usable speech in {job.source} chunk")
+            return
         
-        def is_silent_audio(audio_data: np.ndarray) -> bool:
-            """Check if audio is mostly silent."""
-            rms = np.sqrt(np.mean(audio_data ** 2))
-            return rms < 0.01  # Very low amplitude threshold
+        for seg in segments:
+            seg["timestamp"] = job.timestamp + float(seg.get("start", 0.0) or 0.0)
+        self.state.add_segments(segments)
+        self.state.audio_chunks_processed += 1
+        self.insight_trigger.notify(segments)
         
-        def transcribe_in_background():
+        # Format for display (with speaker labels)
+        display_text = " | ".join([
+            f"[{s.get('speaker', 'SPK')}] {s.get('text', '')[:30]}" 
+            for s in segments[:2]  # Show first 2 segments
+        ])
+        print(f"[LiveSession] Transcript: {display_text}...")
+        
+        # Send formatted text to UI
+        if self._on_transcript_update:
+            formatted_text = self.transcriber.format_transcript_with_speakers(segments)
+            self._on_transcript_update(formatted_text)
+        
+        # Re-broadcasting hints to keep UI fresh (if needed, though usually done in insight loop)
+        if self._on_hints_update:
+            self._on_hints_update(self.state.quick_hints)
+    
+    def transcription_metrics(self) -> Dict[str, Any]:
+        """Queue depth / lag metrics of the transcription worker, stage timings and VAD savings."""
+        if not self.transcription_worker:
+            return {}
+        metrics = self.transcription_worker.metrics()
+        metrics["timings"] = self.transcriber.get_timing_stats()
+        metrics["speakers"] = self.speaker_registry.stats()
+        vad = self.capture_service.vad_stats() if self.capture_service else None
+        if vad:
+            metrics["vad"] = vad
+        return metrics
+    
+    def _handle_audio_frames(self, frames, sample_rate: int):
+        """Feed raw capture blocks to the streaming transcriber (audio thread)."""
+        if self.streamer and self.config.enable_transcription:
+            self.streamer.insert_audio(frames, sample_rate)
+    
+    async def _streaming_loop(self):
+        """Emit partial transcripts every stream_update_interval seconds."""
+        print(f"[LiveSession] Streaming loop started (interval: {self.config.stream_update_interval}s)")
+        
+        while self.state.status in (SessionStatus.STARTING, SessionStatus.RUNNING):
             try:
-                # Check for silence before transcribing
-                if is_silent_audio(chunk.data):
-                    print("[LiveSession] Skipping silent audio chunk")
-                    return
-                
-                # Save chunk to temp file
-                wav_path = LocalCaptureService.audio_chunk_to_wav_file(chunk)
-                
-                segments = []
-                try:
-                    # Transcribe with speaker diarization
-                    segments = self.transcriber.transcribe_with_speakers(wav_path)
-                    
-                    # Fallback to plain text if diarization returns empty
-                    if not segments:
-                        text = self.transcriber.transcribe(wav_path)
-                        if text and text.strip():
-                            segments = [{"speaker": "SPEAKER_00", "text": text.strip(), "start": 0, "end": 0}]
-                finally:
-                    # Clean up temp file
-                    if os.path.exists(wav_path):
-                        try:
-                            os.remove(wav_path)
-                        except:
-                            pass
-                
-                # Process valid segments
-                if segments:
-                    valid_segments = []
-                    for seg in segments:
-                        text = seg.get("text", "").strip()
-                        
-                        # Filter out hallucinations
-                        if text and not is_hallucination(text):
-                            valid_segments.append(seg)
-                    
-                    if valid_segments:
-                        # Add to transcript
-                        self.state.transcript_segments.extend(valid_segments)
-                        self.state.audio_chunks_processed += 1
-                        
-                        # Format for display (with speaker labels)
-                        display_text = " | ".join([
-                            f"[{s.get('speaker', 'SPK')}] {s.get('text', '')[:30]}" 
-                            for s in valid_segments[:2]  # Show first 2 segments
-                        ])
-                        print(f"[LiveSession] Transcript: {display_text}...")
-                        
-                        # Send formatted text to UI
-                        if self._on_transcript_update:
-                            formatted_text = self.transcriber.format_transcript_with_speakers(valid_segments)
-                            self._on_transcript_update(formatted_text)
-                        
-                        # Placeholder for battlecard generation (assuming it happens here)
-                        # If a battlecard is generated based on the valid_segments,
-                        # it would be appended to self.state.battlecards and the callback triggered.
-                        # For example:
-                        # battlecard = self._generate_battlecard_from_segments(valid_segments)
-                        # if battlecard:
-                        #     self.state.battlecards.append(battlecard)
-                        #     if self._on_battlecard:
-                        #         self._on_battlecard(battlecard)
-                        
-                        # Re-broadcasting hints to keep UI fresh (if needed, though usually done in insight loop)
-                        if self._on_hints_update:
-                            self._on_hints_update(self.state.quick_hints)
-                    else:
-                        print("[LiveSession] All segments filtered as hallucinations")
-                
+                await asyncio.sleep(self.config.stream_update_interval)
+                update = await asyncio.to_thread(self.streamer.process_iter)
+                self._apply_streaming_update(update)
+            except asyncio.CancelledError:
+                break
             except Exception as e:
-                print(f"[LiveSession] Transcription error: {e}")
+                print(f"[LiveSession] Streaming error: {e}")
                 import traceback
                 traceback.print_exc()
+                await asyncio.sleep(1.0)
+        
+        print("[LiveSession] Streaming loop ended")
+    
+    def _apply_streaming_update(self, update: StreamingUpdate):
+        """Commit agreed words to the transcript and push partial text to the UI."""
+        committed_text = update.committed_text
+        
+        if committed_text:
+            segment = {
+                "speaker": "SPEAKER_00",  # Streaming mode skips per-window diarization
+                "text": committed_text,
+                "start": update.committed[0].start,
+                "end": update.committed[-1].end
+            }
+            self.state.add_segments([segment])
+            self.state.audio_chunks_processed += 1
+            self.insight_trigger.notify([segment])
+            
+            if self._on_transcript_update:
+                self._on_transcript_update(self.transcriber.format_transcript_with_speakers([segment]))
+        
+        if self._on_partial_transcript and (committed_text or update.tentative):
+            self._on_partial_transcript({
+                "committed": committed_text,
+                "tentative": update.tentative_text
+            })
+    
+    async def _summary_loop(self):
+        """Fold closed transcript windows into the rolling summary."""
+        print(f"[LiveSession] Summary loop started (interval: {self.config.summary_interval}s)")
+        
+        while self.state.status == SessionStatus.RUNNING:
+            try:
+                await asyncio.sleep(self.config.summary_interval)
+                closed = await run_in_summarizer_thread(
+                    self.rolling_summary.update,
+                    self.state.snapshot_segments()
+                )
+                if closed:
+                    print(f"[LiveSession] Rolling summary: {closed} window(s) closed, "
+                          f"{len(self.rolling_summary.partials)} partial(s)")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"[LiveSession] Summary loop error: {e}")
         
-        # Start transcription in background thread
-        thread = threading.Thread(target=transcribe_in_background, daemon=True)
-        thread.start()
+        print("[LiveSession] Summary loop ended")
     
     async def _insight_loop(self):
-        """Periodic loop for Gemini vision analysis."""
-        print(f"[LiveSession] Insight loop started (interval: {self.config.insight_interval}s)")
+        """
+        Transcript-driven analysis loop.
+        
+        Wakes when new segments are committed (debounced, at most once per
+        insight_interval), runs incremental GLiNER on them, and only calls
+        Gemini when something meaningful changed: a new entity, a speaker
+        turn, or insight_min_new_chars of new text.
+        """
+        print(f"[LiveSession] Insight loop started (event-driven, min interval: {self.config.insight_interval}s)")
+        interval = self.config.insight_interval
+        pending_chars = 0
+        pending_turn = False
         
         while self.state.status == SessionStatus.RUNNING:
             try:
-                await asyncio.sleep(self.config.insight_interval)
+                activity = await self.insight_trigger.wait(min_interval=interval)
+                pending_chars += activity.new_chars
+                pending_turn = pending_turn or activity.speaker_turn
                 
                 # Get current transcript context
                 transcript_context = self.state.full_transcript
-                if not transcript_context or len(transcript_context) < 20:
-                    continue  # Not enough transcript to analyze
+                if not transcript_context:
+                    continue
                 
                 # ========== GEMINI-POWERED ANALYSIS ==========
                 
-                # 1. Extract entities from transcript using GLiNER (fast, local)
-                entities = self.extractor.extract(transcript_context[-3000:])  # Last 3000 chars
+                # 1. Extract entities from new transcript segments using GLiNER (fast, local)
+                known_entities = len(self.entity_tracker.index)
+                await asyncio.to_thread(self.entity_tracker.update, self.state.snapshot_segments())
+                entities = self.entity_tracker.index.as_extracted(limit=self.config.max_tracked_entities)
+                new_entity = len(self.entity_tracker.index) > known_entities
+                
+                if not (new_entity or pending_turn or pending_chars >= self.config.insight_min_new_chars):
+                    # Nothing worth a Gemini call yet - keep accumulating
+                    self.state.detected_entities = [
+                        e.to_dict() for e in self.entity_tracker.index.entities(limit=self.config.max_tracked_entities)
+                    ]
+                    continue
+                
+                reason = "new entity" if new_entity else "speaker turn" if pending_turn else f"{pending_chars} new chars"
+                print(f"[LiveSession] Insight trigger: {reason}")
                 
                 # 2. Generate smart hints using Gemini AI
                 # Use pre-initialized Gemini service (self.gemini) instead of creating new one
@@ -465,62 +787,58 @@ class LiveAssistantSession:
                 result = await self.gemini.generate_sales_hints(
                     transcript=transcript_context,
                     entities=entity_texts,
-                    max_hints=3
+                    max_hints=3,
+                    on_hint=self._stream_hint
                 )
                 
-                # 3. Update state
-                self.state.quick_hints = result.get("quick_hints", [])
-                self.state.detected_entities = [{"text": e.text, "label": e.label} for e in entities] if entities else []
+                # 3. Update state (a deferred call keeps the previous hints and retries next wake-up)
+                if not result.get("deferred"):
+                    self.state.quick_hints = result.get("quick_hints", [])
+                    pending_chars, pending_turn = 0, False
+                    # Final hint list now - battlecards and web research below can take a while
+                    if self._on_hints_update:
+                        self._on_hints_update(self.state.quick_hints)
+                
+                # Stretch the minimum interval to stay under the shared Gemini quota
+                next_interval = self.gemini.limiter.adaptive_interval(self.config.insight_interval, interval)
+                if abs(next_interval - interval) >= 1.0:
+                    print(f"[LiveSession] Insight interval {interval:.0f}s -> {next_interval:.0f}s "
+                          f"(quota utilization {self.gemini.limiter.utilization():.0%})")
+                interval = next_interval
+                self.state.detected_entities = [
+                    e.to_dict() for e in self.entity_tracker.index.entities(limit=self.config.max_tracked_entities)
+                ]
                 self.state.gemini_calls += 1
                 
                 print(f"[LiveSession] Gemini Insights: {len(self.state.quick_hints)} hints, {len(entities)} entities")
                 
                 # 4. Deep Research: Check for competitors AND broader research topics
-                competitors = self.extractor.detect_competitors(entities)
+                recent = transcript_context[-self.config.competitor_scan_chars:]
+                if len(transcript_context) > len(recent):
+                    recent = recent.split(" ", 1)[-1]  # drop the cut-off first word
+                competitors = self.extractor.detect_competitors(entities, recent)
                 research_topics = result.get("research_topics", [])
                 
-                # Combine targets (max 2 per cycle to avoid overload)
-                targets = list(set(competitors + research_topics))[:2]
+                # Combine targets, one per competitor (max 2 per cycle to avoid overload)
+                catalog = get_competitor_catalog()
+                unique_targets: Dict[str, str] = {}
+                for target in competitors + research_topics:
+                    unique_targets.setdefault(catalog.key_of(target), target)
+                targets = list(unique_targets.values())[:2]
+                carded = {catalog.key_of(bc.get("competitor", "")) for bc in self.state.battlecards}
                 
                 for target in targets:
-                    # Skip if we already have a battlecard for this target
-                    if target in [bc.get("competitor") for bc in self.state.battlecards]:
+                    # Skip if we already have a battlecard for this target ("salesforce" == "Salesforce")
+                    if catalog.key_of(target) in carded:
                         continue
                         
                     try:
-                        # Generate Smart Battlecard (Gemini + Web Insight)
-                        from app.modules.intelligence.gemini_service import GeminiService
-                        from app.modules.intelligence.web_insight_service import WebInsightService
-                        
-                        # Generate base card with Gemini
-                        battlecard = await self.gemini.get_battlecard(
-                            competitor_name=target,
-                            context=transcript_context[-500:]
-                        )
-                        
-                        # Enhance with Web Insights
-                        try:
-                            web_service = WebInsightService()
-                            web_insights = {"negative_findings": [], "sources": [], "verdict": ""}
-                            
-                            async for update in web_service.get_negative_insights_stream(target):
-                                if update.get("type") == "fast" and update.get("data"):
-                                    data = update["data"]
-                                    web_insights["negative_findings"].append(data.get("summary", ""))
-                                    web_insights["sources"] = data.get("sources", [])
-                                    web_insights["verdict"] = data.get("verdict", "")
-                                elif update.get("type") == "deep" and update.get("data"):
-                                    data = update["data"]
-                                    if data.get("evidence"):
-                                        web_insights["negative_findings"].extend(data["evidence"])
-                                    web_insights["verdict"] = data.get("verdict", web_insights.get("verdict", ""))
-                            
-                            battlecard["web_research"] = web_insights
-                            print(f"[LiveSession] Web insight: {web_insights.get('verdict', 'N/A')} for {target}")
-                            
-                        except Exception as e:
-                            print(f"[LiveSession] Web insight error for {target}: {e}")
-                            battlecard["web_research"] = {"negative_findings": [], "sources": []}
+                        # Known competitors are served from the pre-warmed store instantly
+                        battlecard = get_battlecard_prewarmer().get(target)
+                        if battlecard is not None:
+                            print(f"[LiveSession] Pre-warmed card v{battlecard['prewarmed']['version']} for: {target}")
+                        else:
+                            battlecard = await self._generate_battlecard(target, transcript_context)
                         
                         self.state.battlecards.append(battlecard)
                         print(f"[LiveSession] Smart Card generated for: {target}")
@@ -533,9 +851,6 @@ class LiveAssistantSession:
                         print(f"[LiveSession] Smart Card error for {target}: {e}")
 
                 # 5. Notify UI
-                if self._on_hints_update:
-                    self._on_hints_update(self.state.quick_hints)
-                
                 if self._on_entities_update:
                     self._on_entities_update(self.state.detected_entities)
                 
@@ -561,12 +876,17 @@ class LiveAssistantSession:
         
         print("[LiveSession] Finalizing lead...")
         
-        # 1. Summarize
-        summary = self.summarizer.summarize(transcript)
+        # 1. Summarize (rolling summary: only the last window is new work)
+        segments = self.state.snapshot_segments()
+        summary = await run_in_summarizer_thread(self.rolling_summary.finalize, segments)
         print(f"[LiveSession] Summary: {summary[:100]}...")
         
-        # 2. Extract entities
-        entities = self.extractor.extract(transcript)
+        # 2. Extract entities (incremental: only segments the insight loop has not seen)
+        await asyncio.to_thread(self.entity_tracker.update, segments)
+        entities = [
+            ExtractedEntity(text=e.text, label=e.label, score=e.best_score)
+            for e in sorted(self.entity_tracker.index.entities(), key=lambda e: e.first_seen)
+        ]
         print(f"[LiveSession] Extracted {len(entities)} entities")
         
         # 3. Build lead candidate
@@ -602,7 +922,8 @@ class LiveAssistantSession:
             "stats": {
                 "screenshots_processed": self.state.screenshots_processed,
                 "audio_chunks_processed": self.state.audio_chunks_processed,
-                "gliner_calls": self.state.gemini_calls
+                "gliner_calls": self.state.gemini_calls,
+                "summarization": self.rolling_summary.stats()
             },
             "lead": {
                 "name": lead_name,
@@ -686,6 +1007,7 @@ async def start_new_session(config: Optional[SessionConfig] = None) -> LiveAssis
                 await _active_session.stop()
             except Exception as e:
                 print(f"[LiveSession] Error stopping previous session: {e}")
+        _active_session.release_models()
         # Always reset the session reference
         _active_session = None
     
@@ -696,18 +1018,29 @@ async def start_new_session(config: Optional[SessionConfig] = None) -> LiveAssis
     return _active_session
 
 
-async def stop_current_session() -> Optional[Dict[str, Any]]:
-    """Stop the current session and return results."""
-    global _active_session
-    
-    if not _active_session:
-        return None
+def detach_active_session() -> Optional[LiveAssistantSession]:
+    """
+    Take the current session out of the global slot without stopping it.
     
+    Lets a new session start while this one is finalized in the background.
+    """
+    global _active_session
     session = _active_session
-    
-    # Clear global reference immediately (allows new sessions to start)
     _active_session = None
-    
+    return session
+
+
+async def stop_current_session() -> Optional[Dict[str, Any]]:
+    """Stop the current session and return results."""
+    # Clear global reference immediately (allows new sessions to start)
+    session = detach_active_session()
+    if not session:
+        return None
+    return await stop_session(session)
+
+
+async def stop_session(session: LiveAssistantSession) -> Dict[str, Any]:
+    """Stop and finalize a (detached) session and return results."""
     if session.is_running or session.state.status == SessionStatus.STARTING:
         try:
             result = await session.stop()
@@ -715,7 +1048,10 @@ async def stop_current_session() -> Optional[Dict[str, Any]]:
         except Exception as e:
             print(f"[LiveSession] Error stopping session: {e}")
             return {"error": str(e)}
+        finally:
+            session.release_models()
     
+    session.release_models()
     return {"status": "not_running"}
 
 
@@ -726,7 +1062,10 @@ def force_reset_session():
         try:
             if _active_session.capture_service:
                 _active_session.capture_service._running = False
+            if _active_session.transcription_worker:
+                _active_session.transcription_worker.stop(drain_timeout=0)
         except:
             pass
+        _active_session.release_models()
     _active_session = None
     print("[LiveSession] Session force reset")
@@ -15,7 +15,7 @@ import wave
 import tempfile
 import os
 from dataclasses import dataclass, field
-from typing import Optional, Callable, List
+from typing import Optional, Callable
 from PIL import Image
 import numpy as np
 import base64
@@ -28,6 +28,9 @@ import mss.tools
 import sounddevice as sd
 import soundfile as sf
 
+from app.modules.transcription.vad import SpeechSegmenter, SpeechSegment
+from app.modules.workflow.ring_buffer import AudioRingBuffer
+
 
 @dataclass
 class CaptureConfig:
@@ -41,6 +44,11 @@ class CaptureConfig:
     audio_sample_rate: int = 16000  # Whisper prefers 16kHz
     audio_channels: int = 1  # Mono for transcription
     
+    # Voice activity detection - cut chunks at pauses, drop non-speech
+    vad_enabled: bool = True
+    vad_silence_close: float = 0.6  # seconds of silence that end a chunk
+    vad_min_speech: float = 0.3  # chunks with less speech are dropped
+    
     # Processing settings
     max_queue_size: int = 10
 
@@ -86,22 +94,31 @@ class LocalCaptureService:
         # Callbacks
         self._on_screenshot: Optional[Callable[[Screenshot], None]] = None
         self._on_audio_chunk: Optional[Callable[[AudioChunk], None]] = None
+        self._on_audio_frames: Optional[Callable[[np.ndarray, int], None]] = None
         
         # Audio stream
         self._audio_stream = None
-        self._audio_buffer: List[np.ndarray] = []
-        self._audio_buffer_start_time: float = 0
+        self._audio_ring: Optional[AudioRingBuffer] = None
+        self._segmenter: Optional[SpeechSegmenter] = None
+        self._stream_start_time: float = 0
         
         print("[LocalCapture] Service initialized")
     
     def set_callbacks(
         self,
         on_screenshot: Optional[Callable[[Screenshot], None]] = None,
-        on_audio_chunk: Optional[Callable[[AudioChunk], None]] = None
+        on_audio_chunk: Optional[Callable[[AudioChunk], None]] = None,
+        on_audio_frames: Optional[Callable[[np.ndarray, int], None]] = None
     ):
-        """Set callbacks for real-time data."""
+        """
+        Set callbacks for real-time data.
+        
+        on_audio_frames receives every raw capture block (frames, sample_rate)
+        straight from the audio thread - used by streaming transcription.
+        """
         self._on_screenshot = on_screenshot
         self._on_audio_chunk = on_audio_chunk
+        self._on_audio_frames = on_audio_frames
     
     async def start(self):
         """Start all capture loops."""
@@ -292,23 +309,47 @@ class LocalCaptureService:
                 # Store the actual sample rate we're using
                 self._actual_sample_rate = native_rate
                 
-                # Reset buffer on start
-                self._audio_buffer = []
-                self._audio_buffer_start_time = time.time()
+                # Reset buffer on start (one chunk plus 2s of callback headroom)
+                self._audio_ring = AudioRingBuffer(
+                    capacity=int((self.config.audio_chunk_duration + 2.0) * native_rate),
+                    channels=self.config.audio_channels
+                )
+                self._stream_start_time = time.time()
+                if self.config.vad_enabled:
+                    self._flush_segmenter()
+                    self._segmenter = SpeechSegmenter(
+                        sample_rate=native_rate,
+                        on_segment=self._on_speech_segment,
+                        max_segment=self.config.audio_chunk_duration,
+                        silence_close=self.config.vad_silence_close,
+                        min_speech=self.config.vad_min_speech
+                    )
                 
                 def audio_callback(indata, frames, time_info, status):
                     """Called by sounddevice for each audio block."""
                     if status:
                         print(f"[LocalCapture] Audio status: {status}")
                     
-                    # Copy data to buffer
-                    self._audio_buffer.append(indata.copy())
+                    # Streaming consumers get every block immediately
+                    if self._on_audio_frames:
+                        self._on_audio_frames(indata, self._actual_sample_rate)
+                    
+                    # Chunked consumers only need the buffer
+                    if not self._on_audio_chunk:
+                        return
+                    
+                    # VAD path: chunks are cut at speech boundaries (segmenter buffers in its own ring)
+                    if self._segmenter:
+                        self._segmenter.push(indata)
+                        return
+                    
+                    # Copy data into the preallocated ring (O(1) sample count)
+                    self._audio_ring.write(indata)
                     
                     # Check if we have enough for a chunk (using actual sample rate)
-                    total_samples = sum(len(chunk) for chunk in self._audio_buffer)
                     chunk_samples = int(self.config.audio_chunk_duration * self._actual_sample_rate)
                     
-                    if total_samples >= chunk_samples:
+                    if len(self._audio_ring) >= chunk_samples:
                         self._process_audio_buffer()
                 
                 # Open stream with DEVICE'S native sample rate (not forced 16kHz)
@@ -343,28 +384,56 @@ class LocalCaptureService:
                         pass
                     self._audio_stream = None
 
+        self._flush_segmenter()
         print("[LocalCapture] Audio capture loop ended")
     
     def _process_audio_buffer(self):
         """Process accumulated audio buffer into a chunk."""
-        if not self._audio_buffer:
+        if not self._audio_ring or not len(self._audio_ring):
             return
         
         # Get actual sample rate (may differ from config if device doesn't support it)
         sample_rate = getattr(self, '_actual_sample_rate', self.config.audio_sample_rate)
         
-        # Concatenate all audio data
-        audio_data = np.concatenate(self._audio_buffer, axis=0)
+        # Chunk start time from the stream position, then take (copy) the samples -
+        # the chunk outlives this callback, so it must not alias the ring
+        timestamp = self._stream_start_time + self._audio_ring.frames_read / sample_rate
+        audio_data = self._audio_ring.read()
         
         # Create AudioChunk
         duration = len(audio_data) / sample_rate
         chunk = AudioChunk(
             data=audio_data,
             sample_rate=sample_rate,
-            timestamp=self._audio_buffer_start_time,
+            timestamp=timestamp,
             duration=duration
         )
-        
+        self._emit_audio_chunk(chunk)
+    
+    def _on_speech_segment(self, segment: SpeechSegment):
+        """Turn a VAD speech segment into an AudioChunk."""
+        self._emit_audio_chunk(AudioChunk(
+            data=segment.audio,
+            sample_rate=segment.sample_rate,
+            timestamp=self._stream_start_time + segment.start,
+            duration=segment.duration
+        ))
+    
+    def _flush_segmenter(self):
+        """Emit the open speech segment and report how much audio VAD skipped."""
+        if not self._segmenter:
+            return
+        self._segmenter.flush()
+        stats = self._segmenter.stats()
+        print(f"[LocalCapture] VAD: {stats['speech_seconds']}s of {stats['audio_seconds']}s sent to ASR "
+              f"({stats['skipped_fraction']:.0%} skipped)")
+    
+    def vad_stats(self) -> Optional[dict]:
+        """Speech vs. skipped audio for the current stream (None if VAD is off)."""
+        return self._segmenter.stats() if self._segmenter else None
+    
+    def _emit_audio_chunk(self, chunk: AudioChunk):
+        """Publish a finished chunk to the queue and the chunk callback."""
         # Update latest
         self._latest_audio_chunk = chunk
         
@@ -381,10 +450,6 @@ class LocalCaptureService:
         # Call callback
         if self._on_audio_chunk:
             self._on_audio_chunk(chunk)
-        
-        # Reset buffer
-        self._audio_buffer = []
-        self._audio_buffer_start_time = time.time()
     
     # ==================== DATA ACCESS ====================
     
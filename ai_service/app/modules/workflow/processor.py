@@ -1,10 +1,7 @@
 from typing import Dict, Any, List, Optional, AsyncGenerator, Callable
 from app.modules.core.domain import SalesSummary, LeadCandidate, ExtractedEntity
-from app.modules.extraction.gliner_service import GLiNERService
+from app.core.model_registry import get_model_registry, TRANSCRIPTION, SUMMARIZATION, EXTRACTION
 from app.modules.odoo_client.client import OdooClient
-from app.modules.transcription.service import TranscriptionService
-from app.modules.summarization.service import SummarizationService
-from app.modules.intelligence.gemini_service import GeminiService
 from app.modules.intelligence.web_insight_service import WebInsightService
 # Note: Vexa bot service removed - now using local capture (live_session.py)
 import shutil
@@ -17,12 +14,13 @@ nest_asyncio.apply()
 
 class LeadWorkflowProcessor:
     def __init__(self):
-        # In a real app, these would be injected
-        self.extractor = GLiNERService()
+        # Shared model handles - live sessions reuse the same loaded copies
+        registry = get_model_registry()
+        self.extractor = registry.acquire(EXTRACTION)
         self.odoo = OdooClient()
         # Initialize Audio Services
-        self.transcriber = TranscriptionService()
-        self.summarizer = SummarizationService()
+        self.transcriber = registry.acquire(TRANSCRIPTION)
+        self.summarizer = registry.acquire(SUMMARIZATION)
         # Use Web Insight Service (DuckDuckGo + VADER) - No API Key needed
         self.insights_service = WebInsightService()
         # Note: Live meeting monitoring now handled by live_session.py
@@ -120,7 +118,7 @@ class LeadWorkflowProcessor:
         print("Transcription complete.")
         
         # 2. Summarize
-        summary_text = self.summarizer.summarize(transcript)
+        summary_text = await self.summarizer.summarize_async(transcript)
         print("Summarization complete.")
         
         # 3. Process the Summary (Reuse existing logic)
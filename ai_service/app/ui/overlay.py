@@ -13,7 +13,7 @@ Features:
 
 import sys
 import ctypes
-from typing import List, Optional
+from typing import Dict, List, Optional
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QTextEdit, QFrame, QScrollArea, QProgressBar,
@@ -30,25 +30,45 @@ WDA_EXCLUDEFROMCAPTURE = 0x00000011  # Windows 10 2004+ (Build 19041+)
 # Audio capture imports for distributed deployment
 import threading
 import time
-import io
-import wave
 import numpy as np
 import sounddevice as sd
 
+from app.modules.transcription.vad import SpeechSegmenter, SpeechSegment
+from app.modules.workflow.ring_buffer import AudioRingBuffer
+from app.modules.api.audio_protocol import encode_frame, FLAG_END_OF_SEGMENT, FLAG_START_OF_STREAM
+from app.modules.transcription.audio import resample_audio, WHISPER_SAMPLE_RATE
+
 
 class ClientAudioCapture:
     """
     Client-side audio capture for distributed deployment.
     Captures audio from local Stereo Mix and streams to backend.
+    With use_vad, only speech segments (cut at pauses) are sent.
+    
+    Audio is downsampled to 16 kHz and sent as small framed messages
+    (audio_protocol) compressed with `codec` ("flac", "opus" or "pcm16").
     """
     
-    def __init__(self, api_base_url: str, chunk_duration: float = 10.0):
+    def __init__(
+        self,
+        api_base_url: str,
+        chunk_duration: float = 10.0,
+        use_vad: bool = True,
+        codec: str = "flac",
+        frame_seconds: float = 1.0
+    ):
         self.api_base_url = api_base_url
         self.chunk_duration = chunk_duration
+        self.use_vad = use_vad
+        self.codec = codec
+        self.frame_seconds = frame_seconds
+        self._seq = 0
+        self._stream_start_time = 0.0
+        self._bytes_sent = 0
+        self._segmenter: Optional[SpeechSegmenter] = None
         self._running = False
         self._audio_thread = None
-        self._audio_buffer = []
-        self._buffer_start_time = 0
+        self._audio_ring: Optional[AudioRingBuffer] = None
         self._sample_rate = 16000
         self._ws = None
         
@@ -88,6 +108,11 @@ class ClientAudioCapture:
     def stop(self):
         """Stop audio capture."""
         self._running = False
+        print(f"[ClientAudio] Sent {self._bytes_sent / 1024:.0f} KB ({self.codec})")
+        if self._segmenter:
+            stats = self._segmenter.stats()
+            print(f"[ClientAudio] VAD: {stats['speech_seconds']}s of {stats['audio_seconds']}s sent "
+                  f"({stats['skipped_fraction']:.0%} skipped)")
         if self._ws:
             try:
                 self._ws.close()
@@ -122,20 +147,21 @@ class ClientAudioCapture:
                 # Get audio device
                 device_id, native_rate = self._get_loopback_device()
                 self._sample_rate = native_rate
-                self._audio_buffer = []
-                self._buffer_start_time = time.time()
                 
                 def audio_callback(indata, frames, time_info, status):
                     if status:
                         print(f"[ClientAudio] Status: {status}")
                     
-                    self._audio_buffer.append(indata.copy())
+                    if self._segmenter:
+                        self._segmenter.push(indata)
+                        return
                     
-                    # Check if we have enough for a chunk
-                    total_samples = sum(len(chunk) for chunk in self._audio_buffer)
-                    chunk_samples = int(self.chunk_duration * self._sample_rate)
+                    self._audio_ring.write(indata)
                     
-                    if total_samples >= chunk_samples:
+                    # Stream a frame as soon as one is buffered (server assembles chunks)
+                    frame_samples = int(self.frame_seconds * self._sample_rate)
+                    
+                    if len(self._audio_ring) >= frame_samples:
                         self._send_chunk()
                 
                 # Open audio stream with fallback
@@ -169,6 +195,17 @@ class ClientAudioCapture:
                     else:
                         raise e  # Already on default, just fail
                 
+                # Buffers sized for the rate actually opened (fallback may differ)
+                self._audio_ring = AudioRingBuffer(capacity=int((self.chunk_duration + 2.0) * self._sample_rate))
+                self._seq = 0
+                self._stream_start_time = time.time()
+                if self.use_vad:
+                    self._segmenter = SpeechSegmenter(
+                        sample_rate=self._sample_rate,
+                        on_segment=self._send_segment,
+                        max_segment=self.chunk_duration
+                    )
+                
                 stream.start()
                 print("[ClientAudio] Audio stream active")
                 
@@ -195,6 +232,15 @@ class ClientAudioCapture:
                     finally:
                         self._ws.settimeout(60)
                     
+                    # With VAD, silence means nothing is sent - keep the socket alive
+                    if self._segmenter and time.time() - self._last_send_time > 30:
+                        try:
+                            self._ws.ping()
+                            self._last_send_time = time.time()
+                        except Exception:
+                            print("[ClientAudio] Keepalive ping failed, reconnecting...")
+                            break
+                    
                     # Check if we haven't sent anything in 90s (increased from 30s)
                     if time.time() - self._last_send_time > 90:
                         print(f"[ClientAudio] Connection idle for 90s, reconnecting...")
@@ -222,39 +268,56 @@ class ClientAudioCapture:
                     self._ws = None
     
     def _send_chunk(self):
-        """Send accumulated audio to backend."""
-        if not self._audio_buffer or not self._ws:
+        """Send one frame of buffered audio to backend."""
+        if not self._audio_ring or not len(self._audio_ring) or not self._ws:
             return
         
+        # Encoded synchronously, so a zero-copy view of the ring is safe;
+        # the buffer is consumed regardless of success/failure
+        timestamp = self._stream_start_time + self._audio_ring.frames_read / self._sample_rate
+        frame_samples = int(self.frame_seconds * self._sample_rate)
+        self._send_audio(self._audio_ring.read(frame_samples, copy=False), timestamp)
+    
+    def _send_segment(self, segment: SpeechSegment):
+        """Send one VAD speech segment (called from the audio thread)."""
+        if self._ws:
+            sent_before = self._bytes_sent
+            self._send_audio(segment.audio, self._stream_start_time + segment.start, end_of_segment=True)
+            print(f"[ClientAudio] Sent {segment.duration:.1f}s segment "
+                  f"({(self._bytes_sent - sent_before) / 1024:.1f} KB {self.codec})")
+    
+    def _send_audio(self, audio_data: np.ndarray, timestamp: float, end_of_segment: bool = False):
+        """Downsample to 16 kHz and send as protocol frames of frame_seconds."""
         try:
-            # Concatenate audio
-            audio_data = np.concatenate(self._audio_buffer, axis=0)
-            
-            # Convert to WAV bytes
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)  # 16-bit
-                wf.setframerate(self._sample_rate)
-                # Convert float32 to int16
-                audio_int16 = (audio_data * 32767).astype(np.int16)
-                wf.writeframes(audio_int16.tobytes())
+            audio = resample_audio(audio_data, self._sample_rate, WHISPER_SAMPLE_RATE)
+            step = max(1, int(self.frame_seconds * WHISPER_SAMPLE_RATE))
             
-            # Send binary data
-            self._ws.send_binary(wav_buffer.getvalue())
+            for offset in range(0, len(audio), step):
+                flags = 0
+                if self._seq == 0:
+                    flags |= FLAG_START_OF_STREAM
+                if end_of_segment and offset + step >= len(audio):
+                    flags |= FLAG_END_OF_SEGMENT
+                
+                frame = encode_frame(
+                    audio[offset:offset + step],
+                    seq=self._seq,
+                    timestamp=timestamp + offset / WHISPER_SAMPLE_RATE,
+                    sample_rate=WHISPER_SAMPLE_RATE,
+                    codec=self.codec,
+                    flags=flags
+                )
+                self._ws.send_binary(frame)
+                self._seq += 1
+                self._bytes_sent += len(frame)
             
             # Update tracking on success
             self._last_send_time = time.time()
             self._send_error_count = 0  # Reset on success
-            print(f"[ClientAudio] Sent {len(audio_data)/self._sample_rate:.1f}s chunk")
             
         except Exception as e:
             self._send_error_count = getattr(self, '_send_error_count', 0) + 1
             print(f"[ClientAudio] Send error ({self._send_error_count}/3): {e}")
-        
-        # Reset buffer regardless of success/failure
-        self._audio_buffer = []
-        self._buffer_start_time = time.time()
 
 
 
@@ -2856,6 +2919,10 @@ class StealthOverlay(QMainWindow):
                 reconnect_count = 0
                 max_reconnects = 5
                 
+                # Hints / battlecard points received while Gemini is still streaming
+                streaming_hints: List[str] = []
+                streaming_points: Dict[str, List[str]] = {}
+                
                 while self._is_recording and reconnect_count < max_reconnects:
                     print(f"[Overlay] Connecting to WebSocket: {ws_url}")
                     self.signals.connection_updated.emit("connecting")
@@ -2870,6 +2937,12 @@ class StealthOverlay(QMainWindow):
                             if msg_type == "hints":
                                 print(f"[Overlay DEBUG] Received hints: {data.get('hints')}")
                                 self.update_hints(data.get("hints", []))
+                            elif msg_type == "hint_partial":
+                                # Index 0 starts a new answer - replace the old hints as they stream in
+                                if data.get("index", 0) == 0:
+                                    streaming_hints.clear()
+                                streaming_hints.append(data.get("hint", ""))
+                                self.update_hints(list(streaming_hints))
                             elif msg_type == "transcript":
                                 print(f"[Overlay DEBUG] Received transcript: {len(data.get('text', ''))} chars")
                                 self.update_transcript(data.get("text", ""))
@@ -2887,7 +2960,18 @@ class StealthOverlay(QMainWindow):
                                 # Extract the battlecard data before emitting
                                 battlecard_data = data.get("battlecard", data)
                                 print(f"[Overlay DEBUG] Received battlecard for: {battlecard_data.get('competitor', 'Unknown')}")
+                                streaming_points.pop(battlecard_data.get("competitor"), None)
                                 self.signals.battlecard_updated.emit(battlecard_data)
+                            elif msg_type == "battlecard_partial":
+                                competitor = data.get("competitor", "Competitor")
+                                points = streaming_points.setdefault(competitor, [])
+                                if data.get("index", 0) == 0:
+                                    points.clear()
+                                points.append(data.get("point", ""))
+                                self.signals.battlecard_updated.emit({
+                                    "competitor": competitor,
+                                    "counter_points": list(points)
+                                })
                             elif msg_type == "ping":
                                 # Server keep-alive, ignore
                                 pass